@@ -21,6 +21,10 @@ from models import (
     BulkUploadError,
     UpgradeRequest,
     utilty_files,
+    campaigns,
+    voucher_codes,
+    coupon_pool,
+    reference_data_versions,
 )
 
 load_dotenv()
@@ -0,0 +1,49 @@
+"""voucher codes
+
+Revision ID: c4a8e1f0d2b6
+Revises: b7d2e4f1a9c3
+Create Date: 2026-10-19 16:05:12.418730
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4a8e1f0d2b6'
+down_revision: Union[str, Sequence[str], None] = 'b7d2e4f1a9c3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The app's startup create_all may have created the table already
+    if not sa.inspect(op.get_bind()).has_table('voucher_codes'):
+        op.create_table('voucher_codes',
+        sa.Column('candidate_id', sa.String(length=40), nullable=False),
+        sa.Column('code_type', sa.String(length=20), nullable=False),
+        sa.Column('code', sa.String(length=30), nullable=False),
+        sa.ForeignKeyConstraint(['candidate_id'], ['candidates.id'], onupdate='cascade', ondelete='cascade'),
+        sa.PrimaryKeyConstraint('candidate_id', 'code_type')
+        )
+        op.create_index('ix_voucher_codes_code_candidate', 'voucher_codes', ['code', 'candidate_id'], unique=False)
+
+    # Backfill from the candidate columns, skipping rows already there; later
+    # writes go through the ORM events
+    for code_type, column in (('coupon', 'coupon_code'), ('gift_card', 'gift_card_code')):
+        op.execute(
+            "INSERT INTO voucher_codes (candidate_id, code_type, code) "
+            f"SELECT c.id, '{code_type}', c.{column} FROM candidates c "
+            f"WHERE c.{column} IS NOT NULL AND c.{column} <> '' "
+            "AND NOT EXISTS (SELECT 1 FROM voucher_codes v "
+            f"WHERE v.candidate_id = c.id AND v.code_type = '{code_type}')"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_voucher_codes_code_candidate', table_name='voucher_codes')
+    op.drop_table('voucher_codes')
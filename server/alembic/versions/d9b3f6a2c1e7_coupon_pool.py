@@ -0,0 +1,50 @@
+"""coupon pool
+
+Revision ID: d9b3f6a2c1e7
+Revises: c4a8e1f0d2b6
+Create Date: 2026-10-19 17:20:41.902114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd9b3f6a2c1e7'
+down_revision: Union[str, Sequence[str], None] = 'c4a8e1f0d2b6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The app's startup create_all may have created the table already
+    if not sa.inspect(op.get_bind()).has_table('coupon_pool'):
+        op.create_table('coupon_pool',
+        sa.Column('code', sa.String(length=15), nullable=False),
+        sa.Column('reserved_by', sa.String(length=64), nullable=True),
+        sa.Column('reserved_at', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('code')
+        )
+        op.create_index('ix_coupon_pool_reserved_by', 'coupon_pool', ['reserved_by'], unique=False)
+
+    # Codes already on candidates are taken, so the pool never hands them out
+    op.execute(
+        "UPDATE coupon_pool SET reserved_by = 'candidates', reserved_at = CURRENT_TIMESTAMP "
+        "WHERE code IN (SELECT coupon_code FROM candidates)"
+    )
+    op.execute(
+        "INSERT INTO coupon_pool (code, reserved_by, reserved_at, created_at) "
+        "SELECT DISTINCT c.coupon_code, 'candidates', CURRENT_TIMESTAMP, CURRENT_TIMESTAMP "
+        "FROM candidates c WHERE c.coupon_code IS NOT NULL AND c.coupon_code <> '' "
+        "AND NOT EXISTS (SELECT 1 FROM coupon_pool p WHERE p.code = c.coupon_code)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_coupon_pool_reserved_by', table_name='coupon_pool')
+    op.drop_table('coupon_pool')
@@ -0,0 +1,40 @@
+"""reference data versions
+
+Revision ID: e1c7a4b9d3f5
+Revises: d9b3f6a2c1e7
+Create Date: 2026-10-19 18:02:16.550381
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1c7a4b9d3f5'
+down_revision: Union[str, Sequence[str], None] = 'd9b3f6a2c1e7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    table = op.create_table('reference_data_versions',
+    sa.Column('name', sa.String(length=40), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+    op.bulk_insert(
+        table,
+        [
+            {'name': name, 'version': 0, 'updated_at': sa.func.now()}
+            for name in ('stores', 'cities', 'regions', 'vendors', 'utility_files')
+        ],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('reference_data_versions')
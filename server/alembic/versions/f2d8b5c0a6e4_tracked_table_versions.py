@@ -0,0 +1,49 @@
+"""tracked table versions
+
+Revision ID: f2d8b5c0a6e4
+Revises: e1c7a4b9d3f5
+Create Date: 2026-10-19 19:24:51.118203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2d8b5c0a6e4'
+down_revision: Union[str, Sequence[str], None] = 'e1c7a4b9d3f5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TRACKED_TABLES = (
+    'candidates',
+    'issued_statuses',
+    'verification_statuses',
+    'upgrade_requests',
+    'users',
+)
+
+versions = sa.table(
+    'reference_data_versions',
+    sa.column('name', sa.String),
+    sa.column('version', sa.Integer),
+    sa.column('updated_at', sa.DateTime),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.bulk_insert(
+        versions,
+        [
+            {'name': name, 'version': 0, 'updated_at': sa.func.now()}
+            for name in TRACKED_TABLES
+        ],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(versions.delete().where(versions.c.name.in_(TRACKED_TABLES)))
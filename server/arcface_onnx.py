@@ -0,0 +1,182 @@
+"""
+ArcFace ONNX export, parity check and benchmark.
+
+    python arcface_onnx.py export [--quantize]
+    python arcface_onnx.py parity pairs.csv [--backend onnx-int8]
+    python arcface_onnx.py bench [--batch 2]
+"""
+
+import argparse
+import csv
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+
+from services.verification_service.face_embeddings import (
+    ARCFACE_INPUT_SIZE,
+    EMBEDDING_BACKENDS,
+    face_pair_distance,
+    get_embedding_backend,
+    onnx_model_path,
+)
+from services.verification_service.face_runtime import (
+    FACE_DETECTOR_BACKEND,
+    FACE_MATCH_THRESHOLD,
+    FACE_MODEL_NAME,
+    get_deepface,
+    get_face_model,
+)
+
+
+def export(quantize: bool, opset: int) -> int:
+    # DeepFace selects tf-keras when imported; TensorFlow must not be imported first
+    keras_model = get_face_model().model
+    import tensorflow as tf
+    import tf2onnx
+
+    fp32_path = onnx_model_path("onnx")
+    spec = (tf.TensorSpec((None, *ARCFACE_INPUT_SIZE, 3), tf.float32, name="input"),)
+    # tf2onnx's own graph optimizers need several GB for ArcFace; ONNX Runtime
+    # optimizes the graph at load time (and quant_pre_process before quantizing)
+    tf2onnx.convert.from_keras(
+        keras_model,
+        input_signature=spec,
+        opset=opset,
+        optimizers={},
+        output_path=fp32_path,
+    )
+    print(f"Wrote {fp32_path} ({os.path.getsize(fp32_path) / 1e6:.1f} MB)")
+
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+        from onnxruntime.quantization.shape_inference import quant_pre_process
+
+        int8_path = onnx_model_path("onnx-int8")
+        # Shape inference + graph folding first, as ONNX Runtime recommends
+        prepared_path = fp32_path.replace(".onnx", ".prep.onnx")
+        quant_pre_process(fp32_path, prepared_path)
+        quantize_dynamic(prepared_path, int8_path, weight_type=QuantType.QInt8)
+        os.remove(prepared_path)
+        print(f"Wrote {int8_path} ({os.path.getsize(int8_path) / 1e6:.1f} MB)")
+    return 0
+
+
+def available_backends(requested: list[str] | None) -> list[str]:
+    names = []
+    for name in requested or EMBEDDING_BACKENDS:
+        if name != "deepface" and not os.path.exists(onnx_model_path(name)):
+            print(f"Skipping {name}: {onnx_model_path(name)} not exported")
+            continue
+        names.append(name)
+    return names
+
+
+def parity(pairs_file: str, backends: list[str], tolerance: float) -> int:
+    with open(pairs_file, newline="") as f:
+        pairs = [(row[0], row[1]) for row in csv.reader(f) if len(row) >= 2]
+    if pairs and not os.path.exists(pairs[0][0]):
+        pairs = pairs[1:]  # header row
+
+    DeepFace = get_deepface()
+    diffs: dict[str, list[float]] = {name: [] for name in backends}
+    flips: dict[str, int] = {name: 0 for name in backends}
+    skipped = 0
+
+    for img1, img2 in pairs:
+        try:
+            reference = DeepFace.verify(
+                img1_path=img1,
+                img2_path=img2,
+                model_name=FACE_MODEL_NAME,
+                detector_backend=FACE_DETECTOR_BACKEND,
+                enforce_detection=True,
+            )["distance"]
+        except ValueError:
+            skipped += 1
+            continue
+        for name in backends:
+            # Same single detector as the reference, so only embeddings differ
+            distance = face_pair_distance(
+                img1, img2, backend_name=name, cascade=(FACE_DETECTOR_BACKEND,)
+            )
+            diffs[name].append(abs(distance - reference))
+            if (distance <= FACE_MATCH_THRESHOLD) != (
+                reference <= FACE_MATCH_THRESHOLD
+            ):
+                flips[name] += 1
+                print(
+                    f"{name}: verdict flip {img1} / {img2} "
+                    f"(reference {reference:.4f}, {name} {distance:.4f})"
+                )
+
+    compared = len(pairs) - skipped
+    print(
+        f"{compared} pairs compared, {skipped} skipped (no face), "
+        f"threshold {FACE_MATCH_THRESHOLD}"
+    )
+    print(f"{'backend':<12}{'mean |d|':>10}{'max |d|':>10}{'flips':>7}")
+    failed = False
+    for name in backends:
+        mean_diff = statistics.fmean(diffs[name]) if diffs[name] else 0.0
+        max_diff = max(diffs[name], default=0.0)
+        print(f"{name:<12}{mean_diff:>10.4f}{max_diff:>10.4f}{flips[name]:>7}")
+        if flips[name] or max_diff > tolerance:
+            failed = True
+    print("FAIL" if failed else "OK")
+    return 1 if failed else 0
+
+
+def bench(backends: list[str], batch: int, runs: int) -> int:
+    rng = np.random.default_rng(0)
+    faces = rng.random((batch, *ARCFACE_INPUT_SIZE, 3), dtype=np.float32)
+    print(f"{'backend':<12}{'p50 ms':>10}{'p95 ms':>10}{'per face ms':>13}")
+    for name in backends:
+        backend = get_embedding_backend(name)
+        backend.embed(faces)  # first call builds kernels / thread pools
+        timings = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            backend.embed(faces)
+            timings.append((time.perf_counter() - start) * 1000)
+        timings.sort()
+        p50 = timings[len(timings) // 2]
+        p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+        print(f"{name:<12}{p50:>10.2f}{p95:>10.2f}{p50 / batch:>13.2f}")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = sub.add_parser("export")
+    export_parser.add_argument("--quantize", action="store_true")
+    export_parser.add_argument("--opset", type=int, default=13)
+
+    parity_parser = sub.add_parser("parity")
+    parity_parser.add_argument("pairs", help="CSV of img1,img2 paths")
+    parity_parser.add_argument(
+        "--backend", action="append", choices=EMBEDDING_BACKENDS, dest="backends"
+    )
+    parity_parser.add_argument("--tolerance", type=float, default=0.02)
+
+    bench_parser = sub.add_parser("bench")
+    bench_parser.add_argument(
+        "--backend", action="append", choices=EMBEDDING_BACKENDS, dest="backends"
+    )
+    bench_parser.add_argument("--batch", type=int, default=2)
+    bench_parser.add_argument("--runs", type=int, default=50)
+
+    args = parser.parse_args()
+    if args.command == "export":
+        return export(args.quantize, args.opset)
+    if args.command == "parity":
+        return parity(args.pairs, available_backends(args.backends), args.tolerance)
+    return bench(available_backends(args.backends), args.batch, args.runs)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
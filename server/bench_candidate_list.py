@@ -0,0 +1,238 @@
+"""
+Candidate list serialization: ORM -> pydantic -> json.dumps versus orjson.
+
+    python bench_candidate_list.py [--seed 5000] [--page-size 5000] [--runs 5]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+
+def use_seeded_sqlite() -> None:
+    path = os.path.join(tempfile.mkdtemp(prefix="candidate_list_"), "list.db")
+    os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+    os.environ["ASYNC_DATABASE_URL"] = f"sqlite+aiosqlite:///{path}"
+    for name, value in (
+        ("POOL_SIZE", "5"),
+        ("MAX_OVERFLOW", "0"),
+        ("POOL_TIMEOUT", "5"),
+        ("POOL_RECYCLE", "1800"),
+    ):
+        os.environ.setdefault(name, value)
+
+
+def seed(db, candidates: int) -> None:
+    from datetime import date, datetime
+
+    from db.base import Base
+    from models import Candidate, City, IssuedStatus, Region, Store, User
+
+    Base.metadata.create_all(db.get_bind())
+    regions = [Region(name=f"Region {i}") for i in range(5)]
+    cities = [City(name=f"City {i}") for i in range(20)]
+    db.add_all([*regions, *cities])
+    stores = []
+    for i in range(max(1, candidates // 25)):
+        store = Store(
+            id=f"S{i:05d}",
+            name=f"Store {i}",
+            count=25,
+            address=f"{i} Market Road",
+            mobile_number=f"90000{i:05d}",
+            email=f"store{i}@example.com",
+        )
+        store.city = [cities[i % len(cities)]]
+        stores.append(store)
+    admin = User(full_name="Bench Admin", role="admin", password_hash="x")
+    verifiers = [
+        User(full_name=f"Agent {i}", role="store_agent", password_hash="x")
+        for i in range(len(stores))
+    ]
+    for i, verifier in enumerate(verifiers):
+        verifier.store_id = stores[i].id
+        verifier.regions = [regions[i % len(regions)]]
+    db.add_all([*stores, admin, *verifiers])
+    db.flush()
+    for i in range(candidates):
+        verified = i % 3 == 0
+        candidate = Candidate(
+            id=f"C{i:07d}",
+            coupon_code=f"CPN{i:08d}",
+            full_name=f"Beneficiary Number {i}",
+            mobile_number=f"8{i:09d}",
+            dob=date(1970 + i % 30, 1 + i % 12, 1 + i % 28),
+            state="Karnataka",
+            city=f"City {i % 20}",
+            division=f"Division {i % 7}",
+            region_id=regions[i % len(regions)].id,
+            store_id=stores[i % len(stores)].id,
+            aadhar_number_masked=f"XXXX-XXXX-{i % 10000:04d}",
+            photo=f"uploads/candidates/C{i:07d}/photo.jpg",
+            gift_card_code=f"GC{i:010d}" if verified else None,
+            is_candidate_verified=verified,
+            verified_by=verifiers[i % len(verifiers)].id if verified else None,
+            voucher_issued_at=datetime(2025, 1, 1 + i % 28) if verified else None,
+        )
+        db.add(candidate)
+        if i % 4 == 0:
+            db.add(IssuedStatus(candidate_id=candidate.id, issued_status="issued"))
+    db.commit()
+
+
+def legacy_candidate_list(db, params, current_user) -> dict:
+    """The list as built before the projection: one model per ORM row."""
+    from sqlalchemy import desc, func, select
+
+    from models import Candidate, User
+    from models.schemas.auth_schemas import UserOut
+    from models.schemas.candidate_schemas import CandidateItemWithStore
+    from services.reference_data.reference_cache import reference_cache
+
+    stmt = select(Candidate)
+    filtered_count = db.execute(
+        select(func.count()).select_from(stmt.subquery())
+    ).scalar()
+    candidates = db.scalars(
+        stmt.order_by(desc(getattr(Candidate, params.sort_by)))
+        .limit(params.page_size)
+        .offset(params.page * params.page_size - params.page_size)
+    ).all()
+    result = []
+    for candidate in candidates:
+        verified_by = (
+            db.get(User, candidate.verified_by) if candidate.verified_by else None
+        )
+        result.append(
+            CandidateItemWithStore(
+                id=candidate.id,
+                full_name=candidate.full_name,
+                mobile_number=candidate.mobile_number,
+                dob=candidate.dob,
+                state=candidate.state,
+                city=candidate.city,
+                division=candidate.division,
+                store_id=candidate.store_id,
+                photo=candidate.photo if candidate.photo else None,
+                issued_status=candidate.issued_status.issued_status
+                if candidate.issued_status
+                else "not_issued",
+                vendor_spoc_id=candidate.vendor_spoc_id,
+                aadhar_number=candidate.aadhar_number_masked,
+                aadhar_photo=candidate.aadhar_photo if candidate.aadhar_photo else None,
+                is_candidate_verified=candidate.is_candidate_verified,
+                coupon_code=candidate.coupon_code,
+                verified_by=UserOut.model_validate(verified_by)
+                if verified_by
+                else None,
+                gift_card_code=candidate.gift_card_code
+                if current_user.role in ["super_admin", "admin"]
+                else None,
+                store=reference_cache.store(candidate.store_id),
+                region=reference_cache.region(candidate.region_id),
+                voucher_issued_at=candidate.voucher_issued_at,
+            )
+        )
+    return {"candidates": result, "filtered_count": filtered_count}
+
+
+def cpu_ms(fn, *args):
+    start = time.process_time()
+    out = fn(*args)
+    return out, (time.process_time() - start) * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--seed",
+        type=int,
+        metavar="N",
+        help="Use a temporary sqlite DB with N candidates",
+    )
+    parser.add_argument("--page-size", type=int, default=5000)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.seed:
+        use_seeded_sqlite()
+
+    # Imported late: the database URL comes from the environment set above
+    from fastapi.encoders import jsonable_encoder
+    from fastapi.responses import JSONResponse
+    from sqlalchemy import select
+
+    from controllers.candidates_controller import get_all_candidates
+    from db.connection import create_session_factory
+    from models import User
+    from models.schemas.auth_schemas import UserOut
+    from models.schemas.candidate_schemas import CandidatesSearchParams
+    from services.reference_data.reference_cache import reference_cache
+    from utils.compression import compress
+    from utils.responses import FastJSONResponse
+
+    db = create_session_factory()()
+    try:
+        if args.seed:
+            seed(db, args.seed)
+        admin = db.scalars(select(User).where(User.role == "admin")).first()
+        if admin is None:
+            print("no admin user to list candidates as")
+            return 1
+        current_user = UserOut.model_validate(admin)
+        params = CandidatesSearchParams(page=1, page_size=args.page_size)
+        for kind in ("stores", "regions"):
+            reference_cache.get(kind)
+
+        timings = {
+            name: [] for name in ("old build", "old render", "new build", "new render")
+        }
+        for _ in range(args.runs):
+            # Fresh identity map, so nothing is served from an earlier run
+            db.expunge_all()
+            old, ms = cpu_ms(legacy_candidate_list, db, params, current_user)
+            timings["old build"].append(ms)
+            old_body, ms = cpu_ms(lambda: JSONResponse(jsonable_encoder(old)).body)
+            timings["old render"].append(ms)
+
+            db.expunge_all()
+            new, ms = cpu_ms(get_all_candidates, db, params, current_user)
+            timings["new build"].append(ms)
+            new_body, ms = cpu_ms(lambda: FastJSONResponse(new).body)
+            timings["new render"].append(ms)
+    finally:
+        db.close()
+
+    rows = len(new["data"]["candidates"])
+    print(f"\n{rows} candidates x {args.runs} runs (CPU ms, median)")
+    for name, values in timings.items():
+        print(f"{name:<12}{statistics.median(values):>10.1f}")
+    old_total = statistics.median(timings["old build"]) + statistics.median(
+        timings["old render"]
+    )
+    new_total = statistics.median(timings["new build"]) + statistics.median(
+        timings["new render"]
+    )
+    print(f"{'old total':<12}{old_total:>10.1f}")
+    print(f"{'new total':<12}{new_total:>10.1f}")
+
+    print("\nbytes on the wire")
+    print(f"{'json':<12}{len(old_body):>10}  (old renderer)")
+    print(f"{'json':<12}{len(new_body):>10}")
+    for encoding in ("gzip", "br"):
+        compressed, ms = cpu_ms(compress, new_body, encoding)
+        print(f"{encoding:<12}{len(compressed):>10}  {ms:.1f} CPU ms")
+
+    same = (
+        json.loads(old_body)["candidates"] == json.loads(new_body)["data"]["candidates"]
+    )
+    print(f"\nsame candidates: {same}")
+    return 0 if same else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
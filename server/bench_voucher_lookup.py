@@ -0,0 +1,104 @@
+"""
+Counter code lookup on candidates versus the voucher_codes table.
+
+    python bench_voucher_lookup.py [--sample 200] [--runs 5] [--explain-only]
+"""
+
+import argparse
+import statistics
+import sys
+import time
+import uuid
+
+from sqlalchemy import or_, select, text
+
+from controllers.candidates_controller import voucher_code_lookup
+from db.connection import create_session_factory
+from models import Candidate, VoucherCode
+
+
+def or_lookup(code: str):
+    return select(Candidate).where(
+        or_(Candidate.coupon_code == code, Candidate.gift_card_code == code)
+    )
+
+
+def explain(db, stmt) -> list:
+    compiled = stmt.compile(db.get_bind(), compile_kwargs={"literal_binds": True})
+    return db.execute(text(f"EXPLAIN {compiled}")).all()
+
+
+def time_lookup(db, build, codes: list[str], runs: int) -> tuple[list[float], dict]:
+    timings, found = [], {}
+    for code in codes:
+        for _ in range(runs):
+            start = time.perf_counter()
+            candidate_id = db.execute(
+                build(code).with_only_columns(Candidate.id)
+            ).first()
+            timings.append((time.perf_counter() - start) * 1000)
+        found[code] = candidate_id[0] if candidate_id else None
+    return timings, found
+
+
+def summary(name: str, timings: list[float]) -> str:
+    ordered = sorted(timings)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    return (
+        f"{name:<16}{statistics.median(ordered):>10.3f}{p95:>10.3f}"
+        f"{statistics.fmean(ordered):>10.3f}"
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sample", type=int, default=200)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--explain-only", action="store_true")
+    args = parser.parse_args()
+
+    db = create_session_factory()()
+    try:
+        codes = list(
+            db.scalars(
+                select(VoucherCode.code)
+                .order_by(VoucherCode.candidate_id)
+                .limit(args.sample)
+            )
+        )
+        if not codes:
+            print("voucher_codes is empty - run the migration backfill first")
+            return 1
+        # Misses are what a typo at the counter costs
+        codes += [uuid.uuid4().hex[:12] for _ in range(max(1, len(codes) // 10))]
+
+        if db.get_bind().dialect.name == "mysql":
+            for name, build in (
+                ("OR", or_lookup),
+                ("voucher_codes", voucher_code_lookup),
+            ):
+                print(f"\nEXPLAIN {name}")
+                for row in explain(db, build(codes[0])):
+                    print("  ", tuple(row))
+        if args.explain_only:
+            return 0
+
+        or_timings, or_found = time_lookup(db, or_lookup, codes, args.runs)
+        new_timings, new_found = time_lookup(db, voucher_code_lookup, codes, args.runs)
+    finally:
+        db.close()
+
+    print(f"\n{len(codes)} codes x {args.runs} runs (ms)")
+    print(f"{'lookup':<16}{'p50':>10}{'p95':>10}{'mean':>10}")
+    print(summary("OR", or_timings))
+    print(summary("voucher_codes", new_timings))
+
+    mismatches = [code for code in codes if or_found[code] != new_found[code]]
+    for code in mismatches[:10]:
+        print(f"mismatch {code}: OR -> {or_found[code]}, index -> {new_found[code]}")
+    print(f"{len(mismatches)} mismatches")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
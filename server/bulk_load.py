@@ -0,0 +1,775 @@
+"""
+Bulk loader for beneficiary, store, region and vendor sheets.
+
+    python bulk_load.py regions       locations.csv
+    python bulk_load.py stores        stores.xlsx
+    python bulk_load.py vendors       beneficiaries.csv
+    python bulk_load.py candidates    beneficiaries.csv [--chunk-size 1000] [--dry-run]
+    python bulk_load.py candidate-links beneficiaries.csv
+    python bulk_load.py region-users  hrs_with_regions.csv
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+import uuid
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any
+
+import pandas as pd
+from sqlalchemy import String, Table, and_, bindparam, func, select, update
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.engine import Connection
+
+from db.connection import get_db_engine
+from models import (
+    Candidate,
+    City,
+    Region,
+    RegionUserAssociation,
+    Store,
+    StoreCityAssociation,
+    User,
+    Vendor,
+    VendorSpoc,
+)
+from models.voucher_codes import resync_voucher_codes
+from services.aadhar.utils import hash_aadhar_number
+from services.coupons.coupon_pool import codes_in_use, coupon_pool
+from services.reference_data.data_versions import increment_versions
+
+BULK_LOAD_CHUNK_SIZE = int(os.getenv("BULK_LOAD_CHUNK_SIZE", "1000"))
+# bcrypt releases the GIL, so Aadhaar hashing scales with threads
+BULK_LOAD_HASH_WORKERS = int(
+    os.getenv("BULK_LOAD_HASH_WORKERS", str(os.cpu_count() or 4))
+)
+BULK_LOAD_DIR = os.getenv("BULK_LOAD_DIR", os.path.join("logs", "bulk_load"))
+
+DIALECT_INSERTS = {
+    "mysql": mysql.insert,
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+@dataclass(frozen=True)
+class Field:
+    column: str
+    # Sheet headers for this column; the first one with a value wins
+    headers: tuple[str, ...]
+    kind: str = "text"  # text | mobile | date | int | aadhar
+    required: bool = False
+    # Written for a blank cell, or when the sheet has no such column
+    default: Any = None
+
+
+@dataclass(frozen=True)
+class Profile:
+    name: str
+    table: Table
+    fields: tuple[Field, ...]
+    # Conflict target of the upsert
+    key: tuple[str, ...]
+    # upsert: insert or update | insert: keep existing rows | update: existing only
+    mode: str = "upsert"
+    # Sheet columns identifying a row, when the key is resolved later
+    sheet_key: tuple[str, ...] | None = None
+    # reject: later repeats of a sheet key are rejected | first: silently dropped
+    duplicates: str = "reject"
+    # Never changed on rows that already exist
+    keep_existing: tuple[str, ...] = ()
+    # Sheet-level checks after the generic validation (no database)
+    check: Callable[[pd.DataFrame], None] | None = None
+    # CPU work per chunk, before its transaction opens
+    transform: Callable[[pd.DataFrame], pd.DataFrame] | None = None
+    # Lookups per chunk inside its transaction; sets _reason to reject rows
+    prepare: Callable[[Connection, pd.DataFrame], pd.DataFrame] | None = None
+    after_write: Callable[[Connection, pd.DataFrame], None] | None = None
+    # Data versions bumped with each chunk (see data_versions)
+    versions: tuple[str, ...] = ()
+
+
+# ---------- validation ----------
+
+
+def _text(values: pd.Series) -> pd.Series:
+    values = values.astype(str).str.strip().where(values.notna())
+    return values.mask(values == "")
+
+
+def _clean_text(values: pd.Series):
+    return values, pd.Series(False, index=values.index)
+
+
+def _clean_mobile(values: pd.Series):
+    digits = values.str.replace(r"\.0$", "", regex=True).str.replace(
+        r"\D", "", regex=True
+    )
+    prefixed = digits.str.startswith("91") & (digits.str.len() > 10)
+    digits = digits.mask(prefixed, digits.str[2:])
+    # Unusable numbers are dropped, not the beneficiary
+    return digits.where(digits.str.len() == 10), pd.Series(False, index=values.index)
+
+
+def _clean_date(values: pd.Series):
+    parsed = pd.to_datetime(values, errors="coerce", dayfirst=True, format="mixed")
+    dates = pd.Series(parsed.dt.date, index=values.index, dtype=object)
+    return dates.where(parsed.notna()), values.notna() & parsed.isna()
+
+
+def _clean_int(values: pd.Series):
+    numbers = pd.to_numeric(values, errors="coerce")
+    bad = values.notna() & (numbers.isna() | (numbers % 1 != 0))
+    return numbers.where(~bad).astype("Int64"), bad
+
+
+def _clean_aadhar(values: pd.Series):
+    digits = values.str.replace(r"\D", "", regex=True)
+    bad = values.notna() & (digits.str.len() != 12)
+    return digits.where(~bad), bad
+
+
+CLEANERS = {
+    "text": _clean_text,
+    "mobile": _clean_mobile,
+    "date": _clean_date,
+    "int": _clean_int,
+    "aadhar": _clean_aadhar,
+}
+
+
+def _max_length(table: Table, column: str) -> int | None:
+    if column in table.c and isinstance(table.c[column].type, String):
+        return table.c[column].type.length
+    return None
+
+
+def reject(frame: pd.DataFrame, mask: pd.Series, reason: str) -> None:
+    """Reject the masked rows that have no reason yet."""
+    frame.loc[mask & (frame["_reason"] == ""), "_reason"] = reason
+
+
+def read_sheet(path: str) -> pd.DataFrame:
+    # Everything as text: mobile numbers must not turn into floats
+    if path.lower().endswith((".xlsx", ".xls")):
+        raw = pd.read_excel(path, dtype=str)
+    else:
+        raw = pd.read_csv(path, dtype=str)
+    raw.columns = [str(column).strip() for column in raw.columns]
+    return raw.reset_index(drop=True)
+
+
+def validate(profile: Profile, raw: pd.DataFrame) -> pd.DataFrame:
+    """Sheet -> one column per field plus _row (sheet row) and _reason."""
+    missing = [
+        field.headers[0]
+        for field in profile.fields
+        if field.required and not any(header in raw for header in field.headers)
+    ]
+    if missing:
+        raise SystemExit(f"{profile.name}: missing columns {', '.join(missing)}")
+
+    frame = pd.DataFrame({"_row": raw.index + 2, "_reason": ""}, index=raw.index)
+    for field in profile.fields:
+        present = [header for header in field.headers if header in raw]
+        if not present:
+            if field.default is not None:
+                frame[field.column] = field.default
+            continue
+        values = _text(raw[present[0]])
+        for header in present[1:]:
+            values = values.fillna(_text(raw[header]))
+        label = present[0]
+        values, bad = CLEANERS[field.kind](values)
+        if field.default is not None:
+            values = values.where(bad | values.notna(), field.default)
+        frame[field.column] = values
+        reject(frame, bad, f"invalid {label}")
+        if field.required:
+            reject(frame, values.isna(), f"missing {label}")
+        length = _max_length(profile.table, field.column)
+        if length and field.kind == "text":
+            reject(frame, values.str.len() > length, f"{label} longer than {length}")
+
+    if profile.check:
+        profile.check(frame)
+
+    sheet_key = [c for c in profile.sheet_key or profile.key if c in frame]
+    # MySQL compares these case-insensitively, so the sheet must too
+    keys = frame[sheet_key].apply(
+        lambda s: s.str.lower() if pd.api.types.is_string_dtype(s) else s
+    )
+    valid = frame["_reason"] == ""
+    repeated = valid & keys[valid].duplicated(keep="first").reindex(
+        frame.index, fill_value=False
+    )
+    if profile.duplicates == "first":
+        frame = frame[~repeated]
+    else:
+        reject(frame, repeated, f"duplicate {', '.join(sheet_key)} in sheet")
+    return frame
+
+
+# ---------- writes ----------
+
+
+def _records(frame: pd.DataFrame) -> list[dict]:
+    return frame.astype(object).where(frame.notna(), None).to_dict("records")
+
+
+def _update_set(table: Table, incoming, columns: list[str]) -> dict:
+    values = {
+        column: func.coalesce(incoming[column], table.c[column]) for column in columns
+    }
+    if "updated_at" in table.c:
+        # Python-side onupdate does not run for ON DUPLICATE KEY UPDATE
+        values["updated_at"] = datetime.now(timezone.utc)
+    return values
+
+
+def _insert_statement(conn: Connection, table: Table, key, update_columns):
+    dialect = conn.dialect.name
+    if dialect not in DIALECT_INSERTS:
+        raise SystemExit(f"bulk_load does not support {dialect}")
+    stmt = DIALECT_INSERTS[dialect](table)
+    if dialect == "mysql":
+        if not update_columns:
+            return stmt.prefix_with("IGNORE")
+        return stmt.on_duplicate_key_update(
+            _update_set(table, stmt.inserted, update_columns)
+        )
+    if not update_columns:
+        return stmt.on_conflict_do_nothing(index_elements=list(key))
+    return stmt.on_conflict_do_update(
+        index_elements=list(key),
+        set_=_update_set(table, stmt.excluded, update_columns),
+    )
+
+
+def write_rows(
+    conn: Connection,
+    table: Table,
+    key: tuple[str, ...],
+    rows: pd.DataFrame,
+    mode: str = "upsert",
+    keep_existing: tuple[str, ...] = (),
+) -> int:
+    """One executemany for all rows; returns the driver's rowcount."""
+    columns = [column for column in rows.columns if column in table.c]
+    rows = rows.drop_duplicates(subset=list(key), keep="last")
+    if rows.empty:
+        return 0
+
+    if mode == "update":
+        values = {
+            column: func.coalesce(bindparam(f"v_{column}"), table.c[column])
+            for column in columns
+            if column not in key
+        }
+        stmt = (
+            update(table)
+            .where(
+                and_(*(table.c[column] == bindparam(f"k_{column}") for column in key))
+            )
+            .values(values)
+        )
+        params = [
+            {(f"k_{c}" if c in key else f"v_{c}"): value for c, value in row.items()}
+            for row in _records(rows[columns])
+        ]
+    else:
+        update_columns = []
+        if mode == "upsert":
+            update_columns = [
+                column
+                for column in columns
+                if column not in key and column not in keep_existing
+            ]
+        stmt = _insert_statement(conn, table, key, update_columns)
+        params = _records(rows[columns])
+
+    return max(conn.execute(stmt, params).rowcount, 0)
+
+
+def lookup(conn: Connection, key_column, value_column, keys, lower: bool = False):
+    """{key: value} for the given keys in one IN query."""
+    keys = pd.Series(keys).dropna().unique().tolist()
+    if not keys:
+        return {}
+    column = func.lower(key_column) if lower else key_column
+    if lower:
+        keys = list({key.lower() for key in keys})
+    rows = conn.execute(select(column, value_column).where(column.in_(keys)))
+    return {key: value for key, value in rows}
+
+
+def _resolve_by_name(conn, frame, name_column, table_column, id_column, target, label):
+    if name_column not in frame:
+        return
+    ids = lookup(conn, table_column, id_column, frame[name_column], lower=True)
+    frame[target] = frame[name_column].str.lower().map(ids)
+    reject(
+        frame, frame[name_column].notna() & frame[target].isna(), f"{label} not found"
+    )
+
+
+# ---------- profiles ----------
+
+
+def _prepare_store_cities(conn: Connection, chunk: pd.DataFrame) -> pd.DataFrame:
+    if "city_name" in chunk:
+        names = chunk["city_name"].dropna().drop_duplicates()
+        write_rows(
+            conn, City.__table__, ("name",), names.rename("name").to_frame(), "insert"
+        )
+        _resolve_by_name(
+            conn, chunk, "city_name", City.name, City.id, "city_id", "City"
+        )
+    return chunk
+
+
+def _store_cities(conn: Connection, chunk: pd.DataFrame) -> None:
+    if "city_id" not in chunk:
+        return
+    links = chunk.loc[chunk["city_id"].notna(), ["id", "city_id"]]
+    write_rows(
+        conn,
+        StoreCityAssociation.__table__,
+        ("store_id", "city_id"),
+        links.rename(columns={"id": "store_id"}),
+        "insert",
+    )
+
+
+def _prepare_vendors(conn: Connection, chunk: pd.DataFrame) -> pd.DataFrame:
+    # Vendor names aren't unique in the schema; reuse the first match
+    names = chunk["vendor_name"].str.lower()
+    ids = lookup(conn, Vendor.vendor_name, Vendor.id, chunk["vendor_name"], lower=True)
+    ids |= {name: str(uuid.uuid4()) for name in names.unique() if name not in ids}
+    chunk["id"] = names.map(ids)
+    return chunk
+
+
+def _vendor_spocs(conn: Connection, chunk: pd.DataFrame) -> None:
+    if "spoc_name" not in chunk:
+        return
+    spocs = chunk[chunk["spoc_name"].notna()]
+    if spocs.empty:
+        return
+    table = VendorSpoc.__table__
+    existing = conn.execute(
+        select(table.c.vendor_id, func.lower(table.c.full_name), table.c.id).where(
+            table.c.vendor_id.in_(spocs["id"].unique().tolist())
+        )
+    )
+    ids = {(vendor_id, name): spoc_id for vendor_id, name, spoc_id in existing}
+    keys = list(zip(spocs["id"], spocs["spoc_name"].str.lower()))
+    ids |= {k: str(uuid.uuid4()) for k in keys if k not in ids}
+    rows = pd.DataFrame(
+        {
+            "id": [ids[k] for k in keys],
+            "vendor_id": spocs["id"].to_numpy(),
+            "full_name": spocs["spoc_name"].to_numpy(),
+            "mobile_number": (
+                spocs["spoc_mobile"].to_numpy() if "spoc_mobile" in spocs else None
+            ),
+        }
+    )
+    write_rows(conn, table, ("id",), rows)
+
+
+def _check_candidates(frame: pd.DataFrame) -> None:
+    if "mobile_number" in frame:
+        # mobile_number is unique; a repeat keeps the beneficiary, drops the number
+        shared = frame["mobile_number"].notna() & frame["mobile_number"].duplicated()
+        frame.loc[shared, "mobile_number"] = None
+
+
+def _hash_aadhar_numbers(chunk: pd.DataFrame) -> pd.DataFrame:
+    if "aadhar_number" not in chunk:
+        return chunk
+    plain = chunk["aadhar_number"].dropna()
+    with ThreadPoolExecutor(max_workers=max(1, BULK_LOAD_HASH_WORKERS)) as pool:
+        hashed = list(pool.map(hash_aadhar_number, plain))
+    chunk["aadhar_number_hashed"] = pd.Series(hashed, index=plain.index, dtype=object)
+    # Same format as Candidate.set_mask_aadhar_number
+    chunk["aadhar_number_masked"] = "XXXX-XXXX-" + chunk["aadhar_number"].str[-4:]
+    return chunk
+
+
+def _resolve_candidate_links(conn: Connection, chunk: pd.DataFrame) -> pd.DataFrame:
+    if "store_id" in chunk:
+        known = lookup(conn, Store.id, Store.id, chunk["store_id"])
+        stores = {store_id.lower() for store_id in known}
+        unknown = chunk["store_id"].notna() & ~chunk["store_id"].str.lower().isin(
+            stores
+        )
+        reject(chunk, unknown, "Store not found")
+    _resolve_by_name(
+        conn, chunk, "region_name", Region.name, Region.id, "region_id", "Region"
+    )
+    _resolve_by_name(
+        conn,
+        chunk,
+        "vendor_spoc_name",
+        VendorSpoc.full_name,
+        VendorSpoc.id,
+        "vendor_spoc_id",
+        "Vendor SPOC",
+    )
+    return chunk
+
+
+def _prepare_candidates(conn: Connection, chunk: pd.DataFrame) -> pd.DataFrame:
+    chunk = _resolve_candidate_links(conn, chunk)
+    # Existing beneficiaries keep their coupon (coupon_code is keep_existing);
+    # sending it back unchanged keeps their row the only one the insert hits
+    coupons = lookup(conn, Candidate.id, Candidate.coupon_code, chunk["id"])
+    chunk["coupon_code"] = chunk["id"].map(coupons).astype(object)
+    new = chunk["coupon_code"].isna()
+    chunk.loc[new, "coupon_code"] = coupon_pool.take_many(int(new.sum()))
+    # A code another beneficiary holds would make ON DUPLICATE KEY overwrite
+    # that beneficiary; the pool avoids them, this makes sure of it
+    while True:
+        clash = new & chunk["coupon_code"].isin(
+            codes_in_use(conn, chunk.loc[new, "coupon_code"])
+        )
+        if not clash.any():
+            break
+        chunk.loc[clash, "coupon_code"] = coupon_pool.take_many(int(clash.sum()))
+
+    if "mobile_number" in chunk:
+        # A number owned by another beneficiary would make ON DUPLICATE KEY
+        # update that beneficiary instead; leave this one without it
+        owners = lookup(
+            conn, Candidate.mobile_number, Candidate.id, chunk["mobile_number"]
+        )
+        owner = chunk["mobile_number"].map(owners)
+        chunk.loc[owner.notna() & (owner != chunk["id"]), "mobile_number"] = None
+    return chunk
+
+
+def _candidate_voucher_codes(conn: Connection, chunk: pd.DataFrame) -> None:
+    resync_voucher_codes(conn, chunk["id"].tolist())
+
+
+def _prepare_candidate_links(conn: Connection, chunk: pd.DataFrame) -> pd.DataFrame:
+    known = lookup(conn, Candidate.id, Candidate.id, chunk["id"])
+    ids = {candidate_id.lower() for candidate_id in known}
+    reject(chunk, ~chunk["id"].str.lower().isin(ids), "Candidate not found")
+    return _resolve_candidate_links(conn, chunk)
+
+
+def _prepare_region_users(conn: Connection, chunk: pd.DataFrame) -> pd.DataFrame:
+    _resolve_by_name(
+        conn, chunk, "user_name", User.full_name, User.id, "user_id", "User"
+    )
+    _resolve_by_name(
+        conn, chunk, "region_name", Region.name, Region.id, "region_id", "Region"
+    )
+    return chunk
+
+
+REGION_NAME = Field("region_name", ("Distrubution location", "Region"))
+CANDIDATE_LINK_FIELDS = (
+    Field("store_id", ("Store Code 2", "Store Code")),
+    REGION_NAME,
+    Field("vendor_spoc_name", ("Vendor SPOC Name",)),
+)
+
+PROFILES = {
+    profile.name: profile
+    for profile in (
+        Profile(
+            name="regions",
+            table=Region.__table__,
+            fields=(Field("name", REGION_NAME.headers, required=True),),
+            key=("name",),
+            mode="insert",
+            duplicates="first",
+            versions=("regions",),
+        ),
+        Profile(
+            name="stores",
+            table=Store.__table__,
+            fields=(
+                Field("id", ("Store Code",), required=True),
+                Field("name", ("Store Name",), required=True),
+                Field("address", ("Address",)),
+                Field("mobile_number", ("Mobile No", "Mobile no"), "mobile"),
+                Field("email", ("Email",)),
+                # The listing and the reference cache expect a number
+                Field("count", ("Count",), "int", default=0),
+                Field("city_name", ("City",)),
+            ),
+            key=("id",),
+            prepare=_prepare_store_cities,
+            after_write=_store_cities,
+            versions=("stores", "cities"),
+        ),
+        Profile(
+            name="vendors",
+            table=Vendor.__table__,
+            fields=(
+                Field("vendor_name", ("Vendor Name",), required=True),
+                Field("vendor_owner", ("Vendor Owner / Resp Person Name",)),
+                Field("mobile_number", ("Vendor Owner / Resp Person Mobile No",)),
+                Field("spoc_name", ("Vendor SPOC Name",)),
+                Field("spoc_mobile", ("Vendor SPOC Mobile",)),
+            ),
+            key=("id",),
+            sheet_key=("vendor_name", "spoc_name"),
+            duplicates="first",
+            prepare=_prepare_vendors,
+            after_write=_vendor_spocs,
+            versions=("vendors",),
+        ),
+        Profile(
+            name="candidates",
+            table=Candidate.__table__,
+            fields=(
+                Field("id", ("E.No",), required=True),
+                Field("full_name", ("Name",), required=True),
+                Field("mobile_number", ("Mobile Number",), "mobile"),
+                Field("dob", ("DOB",), "date"),
+                Field("state", ("State",)),
+                Field("city", ("City",)),
+                Field("division", ("Division Name",)),
+                Field("aadhar_number", ("Aadhaar Number", "Aadhar Number"), "aadhar"),
+                Field("gift_card_code", ("CROMA Gift Card",)),
+                *CANDIDATE_LINK_FIELDS,
+            ),
+            key=("id",),
+            keep_existing=("coupon_code",),
+            check=_check_candidates,
+            transform=_hash_aadhar_numbers,
+            prepare=_prepare_candidates,
+            after_write=_candidate_voucher_codes,
+            versions=("candidates",),
+        ),
+        Profile(
+            name="candidate-links",
+            table=Candidate.__table__,
+            fields=(Field("id", ("E.No",), required=True), *CANDIDATE_LINK_FIELDS),
+            key=("id",),
+            mode="update",
+            prepare=_prepare_candidate_links,
+            versions=("candidates",),
+        ),
+        Profile(
+            name="region-users",
+            table=RegionUserAssociation.__table__,
+            fields=(
+                Field("user_name", ("ADMIN /HR SPOC",), required=True),
+                Field("region_name", REGION_NAME.headers, required=True),
+            ),
+            key=("user_id", "region_id"),
+            mode="insert",
+            sheet_key=("user_name", "region_name"),
+            duplicates="first",
+            prepare=_prepare_region_users,
+            versions=("users",),
+        ),
+    )
+}
+
+
+# ---------- checkpoint and report ----------
+
+
+class Checkpoint:
+    def __init__(self, directory: str, profile: str, source: str):
+        with open(source, "rb") as f:
+            self.digest = hashlib.file_digest(f, "sha256").hexdigest()
+        stem = os.path.join(directory, f"{profile}-{self.digest[:16]}")
+        self.path = f"{stem}.checkpoint.json"
+        self.rejects_path = f"{stem}.rejects.csv"
+        self.profile = profile
+        self.source = source
+        os.makedirs(directory, exist_ok=True)
+
+    def load(self) -> dict:
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {"last_row": 0, "completed": False}
+
+    def save(self, last_row: int, completed: bool = False) -> None:
+        state = {
+            "profile": self.profile,
+            "source": os.path.abspath(self.source),
+            "sha256": self.digest,
+            "last_row": last_row,
+            "completed": completed,
+            "updated_at": datetime.now(timezone.utc).isoformat(),
+        }
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.path)
+
+    def clear(self) -> None:
+        for path in (self.path, self.rejects_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+
+class Report:
+    def __init__(self):
+        self.timings: dict[str, float] = {}
+        self.counts = {"rows": 0, "skipped": 0, "rejected": 0, "written": 0}
+        self.counts |= {"rowcount": 0, "chunks": 0}
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = (
+                self.timings.get(name, 0.0) + time.perf_counter() - start
+            )
+
+    def print(self, profile: str, source: str, rejects_path: str) -> None:
+        counts = self.counts
+        total = sum(self.timings.values())
+        print(f"\n{profile} <- {source}")
+        print(f"  {'rows':<14}{counts['rows']}")
+        if counts["skipped"]:
+            print(f"  {'resumed':<14}{counts['skipped']} rows before the checkpoint")
+        rejected = f"{counts['rejected']}"
+        if counts["rejected"]:
+            rejected += f"  -> {rejects_path}"
+        print(f"  {'rejected':<14}{rejected}")
+        print(
+            f"  {'written':<14}{counts['written']} in {counts['chunks']} chunks"
+            f" (rowcount {counts['rowcount']})"
+        )
+        print(
+            "  "
+            + "  ".join(
+                f"{name} {seconds:.2f}s" for name, seconds in self.timings.items()
+            )
+            + f"  total {total:.2f}s"
+        )
+        if total:
+            print(f"  {'throughput':<14}{counts['written'] / total:,.0f} rows/s")
+
+
+def write_rejects(path: str, profile: Profile, rejects: pd.DataFrame) -> None:
+    if rejects.empty:
+        return
+    append = os.path.exists(path)
+    # The sheet's fields only; plain Aadhaar numbers don't belong in a log file
+    columns = ["_row", "_reason"] + [
+        field.column
+        for field in profile.fields
+        if field.column in rejects and field.kind != "aadhar"
+    ]
+    rejects[columns].rename(columns={"_row": "row", "_reason": "reason"}).to_csv(
+        path, mode="a" if append else "w", header=not append, index=False
+    )
+
+
+def load(profile: Profile, frame: pd.DataFrame, args, checkpoint, report) -> None:
+    engine = get_db_engine()
+    last_row = int(frame["_row"].max()) if len(frame) else 0
+    for start in range(0, len(frame), args.chunk_size):
+        chunk = frame.iloc[start : start + args.chunk_size].copy()
+        if profile.transform:
+            with report.stage("transform"):
+                chunk = profile.transform(chunk)
+        with engine.begin() as conn:
+            if profile.prepare:
+                with report.stage("prepare"):
+                    chunk = profile.prepare(conn, chunk)
+            rejected = chunk["_reason"] != ""
+            rows = chunk[~rejected]
+            with report.stage("write"):
+                report.counts["rowcount"] += write_rows(
+                    conn,
+                    profile.table,
+                    profile.key,
+                    rows,
+                    profile.mode,
+                    profile.keep_existing,
+                )
+                if profile.after_write and not rows.empty:
+                    profile.after_write(conn, rows)
+                if profile.versions and not rows.empty:
+                    increment_versions(conn, profile.versions)
+        # Committed: only now may the checkpoint move past this chunk
+        write_rejects(checkpoint.rejects_path, profile, chunk[rejected])
+        report.counts["rejected"] += int(rejected.sum())
+        report.counts["written"] += len(rows)
+        report.counts["chunks"] += 1
+        chunk_end = int(chunk["_row"].max())
+        checkpoint.save(chunk_end, completed=chunk_end == last_row)
+        print(f"  chunk {report.counts['chunks']}: rows up to {chunk_end} committed")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("profile", choices=sorted(PROFILES))
+    parser.add_argument("source", help="CSV or Excel sheet")
+    parser.add_argument("--chunk-size", type=int, default=BULK_LOAD_CHUNK_SIZE)
+    parser.add_argument("--checkpoint-dir", default=BULK_LOAD_DIR)
+    parser.add_argument("--restart", action="store_true", help="ignore the checkpoint")
+    parser.add_argument(
+        "--dry-run", action="store_true", help="validate only; nothing is written"
+    )
+    args = parser.parse_args()
+    profile = PROFILES[args.profile]
+
+    report = Report()
+    checkpoint = Checkpoint(args.checkpoint_dir, profile.name, args.source)
+    if args.restart:
+        checkpoint.clear()
+    state = checkpoint.load()
+    if state["completed"] and not args.dry_run:
+        print(f"{args.source} was already loaded ({checkpoint.path}); use --restart")
+        return 0
+
+    with report.stage("read"):
+        raw = read_sheet(args.source)
+    with report.stage("validate"):
+        frame = validate(profile, raw)
+    report.counts["rows"] = len(raw)
+
+    # Sheet rows before the checkpoint were committed by an earlier run
+    done = frame["_row"] <= state["last_row"]
+    report.counts["skipped"] = int(done.sum())
+    frame = frame[~done]
+    invalid = frame["_reason"] != ""
+
+    if args.dry_run:
+        report.counts["rejected"] = int(invalid.sum())
+        for _, row in frame[invalid].head(20).iterrows():
+            print(f"  row {row['_row']}: {row['_reason']}")
+        report.print(profile.name, args.source, "(dry run, not written)")
+        return 0
+
+    if not state["last_row"]:
+        # A resumed run wrote its sheet-level rejects the first time round
+        if os.path.exists(checkpoint.rejects_path):
+            os.remove(checkpoint.rejects_path)
+        write_rejects(checkpoint.rejects_path, profile, frame[invalid])
+    report.counts["rejected"] = int(invalid.sum())
+    valid = frame[~invalid]
+    load(profile, valid, args, checkpoint, report)
+    if valid.empty:
+        checkpoint.save(state["last_row"], completed=True)
+    report.print(profile.name, args.source, checkpoint.rejects_path)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+"""
+Cold-start import budget for the API.
+
+    python check_import_time.py [--budget 4.0] [--top 15]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+PROBE = """
+import sys, time
+start = time.perf_counter()
+import main
+elapsed = time.perf_counter() - start
+from services.verification_service.face_runtime import HEAVY_MODULES
+loaded = sorted({m.split(".")[0] for m in sys.modules} & set(HEAVY_MODULES))
+print(f"__IMPORT_RESULT__ {elapsed:.3f} {','.join(loaded)}")
+"""
+
+
+def slowest_imports(importtime_log: str, top: int) -> list[tuple[int, str]]:
+    """Modules imported directly by main, by cumulative import time (microseconds)."""
+    rows = []
+    for line in importtime_log.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        try:
+            _, cumulative, name = line.split("|")
+            cumulative_us = int(cumulative.strip())
+        except ValueError:
+            continue
+        # -X importtime indents nested imports by two spaces per level
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth == 1:
+            rows.append((cumulative_us, name.strip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--budget",
+        type=float,
+        default=float(os.getenv("IMPORT_BUDGET_SECONDS", "4.0")),
+        help="Max seconds allowed for `import main`",
+    )
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True,
+        text=True,
+    )
+    result_line = next(
+        (l for l in proc.stdout.splitlines() if l.startswith("__IMPORT_RESULT__")),
+        None,
+    )
+    if proc.returncode != 0 or result_line is None:
+        errors = [
+            l for l in proc.stderr.splitlines() if not l.startswith("import time:")
+        ]
+        print("Importing main failed:")
+        print("\n".join(errors[-40:]))
+        return 2
+
+    parts = result_line.split(" ")
+    elapsed = float(parts[1])
+    heavy = [m for m in (parts[2] if len(parts) > 2 else "").split(",") if m]
+
+    print(f"import main: {elapsed:.2f}s (budget {args.budget:.2f}s)")
+    print("Slowest imports from main:")
+    for cumulative_us, name in slowest_imports(proc.stderr, args.top):
+        print(f"  {cumulative_us / 1e6:7.3f}s  {name}")
+
+    failed = False
+    if heavy:
+        print(f"FAIL: heavy modules imported at startup: {', '.join(heavy)}")
+        failed = True
+    if elapsed > args.budget:
+        print(f"FAIL: import took {elapsed:.2f}s, over the {args.budget:.2f}s budget")
+        failed = True
+    if not failed:
+        print("OK")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
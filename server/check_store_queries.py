@@ -0,0 +1,129 @@
+"""
+Query budget for the store listing (GET /stores).
+
+    python check_store_queries.py [--seed 300] [--budget 6]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+
+SCENARIOS = [
+    {"page_size": 1},
+    {"page_size": 15},
+    {"page_size": 100},
+    {"page_size": 15, "sort_by": "city", "sort_order": "asc"},
+    {"page_size": 15, "sort_by": "name", "search_by": "name", "search_term": "1"},
+    {"page_size": 15, "search_by": "city", "search_term": "city"},
+]
+
+
+def use_seeded_sqlite() -> None:
+    path = os.path.join(tempfile.mkdtemp(prefix="store_queries_"), "stores.db")
+    os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+    os.environ["ASYNC_DATABASE_URL"] = f"sqlite+aiosqlite:///{path}"
+    for name, value in (
+        ("POOL_SIZE", "2"),
+        ("MAX_OVERFLOW", "0"),
+        ("POOL_TIMEOUT", "5"),
+        ("POOL_RECYCLE", "1800"),
+    ):
+        os.environ.setdefault(name, value)
+
+
+def seed(db, stores: int) -> None:
+    from db.base import Base
+    from models import Candidate, City, IssuedStatus, Region, Store, User
+
+    Base.metadata.create_all(db.get_bind())
+    cities = [City(name=f"city {i}") for i in range(max(1, stores // 10))]
+    region = Region(name="seed region")
+    db.add_all([*cities, region])
+    for i in range(stores):
+        store = Store(id=f"S{i:05d}", name=f"Store {i}", count=10)
+        store.city = [cities[i % len(cities)], cities[(i + 1) % len(cities)]]
+        agent = User(
+            full_name=f"Agent {i}",
+            role="store_agent",
+            password_hash="x",
+            store_id=store.id,
+        )
+        agent.regions = [region]
+        db.add_all([store, agent])
+        for j in range(4):
+            candidate = Candidate(id=f"C{i:05d}{j}", full_name="B", store_id=store.id)
+            db.add(candidate)
+            if j < 2:
+                db.add(IssuedStatus(candidate_id=candidate.id, issued_status="issued"))
+    db.commit()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--budget",
+        type=int,
+        default=int(os.getenv("STORE_LISTING_QUERY_BUDGET", "6")),
+        help="Max SQL statements per listing call",
+    )
+    parser.add_argument(
+        "--seed", type=int, metavar="N", help="Use a temporary sqlite DB with N stores"
+    )
+    args = parser.parse_args()
+
+    if args.seed:
+        use_seeded_sqlite()
+
+    # Imported late: the database URL comes from the environment set above
+    from sqlalchemy import event
+
+    from controllers.store_controller import get_all_stores
+    from db.connection import create_session_factory, get_db_engine
+    from models.schemas.store_schemas import StoreSearchParams
+    from services.reference_data.reference_cache import reference_cache
+
+    db = create_session_factory()()
+    if args.seed:
+        seed(db, args.seed)
+    # Cities come from the reference cache, reloaded a few times a day at most
+    reference_cache.get("cities")
+
+    statements: list[str] = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = get_db_engine()
+    event.listen(engine, "before_cursor_execute", count)
+    failures, by_shape = [], {}
+    try:
+        for scenario in SCENARIOS:
+            params = StoreSearchParams(**scenario)
+            # Fresh identity map, so nothing is served from an earlier call
+            db.expunge_all()
+            statements.clear()
+            result = asyncio.run(get_all_stores(db, params))
+            used = len(statements)
+            shape = {k: v for k, v in scenario.items() if k != "page_size"}
+            by_shape.setdefault(str(shape), set()).add(used)
+            print(f"{used:>3} queries  {len(result['stores']):>4} stores  {scenario}")
+            if used > args.budget:
+                failures.append(f"{scenario}: {used} queries > budget {args.budget}")
+                for statement in statements:
+                    print("     ", " ".join(statement.split())[:140])
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+        db.close()
+
+    for shape, counts in by_shape.items():
+        if len(counts) > 1:
+            failures.append(f"{shape}: query count depends on page size {counts}")
+    for failure in failures:
+        print("FAIL", failure)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,6 +9,7 @@ from datetime import datetime, timezone
 from typing import Any
 import io
 from utils.helpers import save_offline_uploaded_file
+from controllers.candidates_controller import get_candidate_by_voucher_code
 
 
 async def process_bulk_issuance_upload(
@@ -85,9 +86,7 @@ async def process_bulk_issuance_upload(
                 laptop_serial = row["Laptop Serial"]
 
                 # Get candidate
-                candidate = db.scalar(
-                    select(Candidate).where(Candidate.coupon_code == coupon_code)
-                )
+                candidate = get_candidate_by_voucher_code(coupon_code, db, "coupon")
 
                 if not candidate:
                     error = BulkUploadError(
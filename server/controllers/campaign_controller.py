@@ -0,0 +1,151 @@
+from datetime import datetime, timedelta, timezone
+
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+from sqlalchemy import select, func, or_, update
+from models import Campaign, CampaignRecipient
+from models.schemas.campaign_schemas import (
+    NewCampaignPayload,
+    CampaignOut,
+    CampaignRecipientOut,
+)
+from models.schemas.auth_schemas import UserOut
+from services.campaigns.engine import (
+    add_campaign_recipients,
+    CAMPAIGN_PLACEHOLDERS,
+    CAMPAIGN_STALE_SECONDS,
+)
+from services.verification_service.email_templates import CompiledTemplate
+from utils.log_config import logger
+
+
+def create_campaign(payload: NewCampaignPayload, db: Session, current_user: UserOut):
+    # Fail fast on a broken template instead of in the background run
+    try:
+        template = CompiledTemplate(
+            payload.name, payload.message_template, autoescape=False
+        )
+    except KeyError as e:
+        # {{ asset.* }} placeholders only exist in email templates
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid message template: {e.args[0]}",
+        )
+    unknown = set(template.fields) - CAMPAIGN_PLACEHOLDERS
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown placeholders in message template: {', '.join(sorted(unknown))}",
+        )
+
+    try:
+        campaign = Campaign(
+            name=payload.name,
+            channel=payload.channel,
+            message_template=payload.message_template,
+            filters=payload.filters.model_dump_json(exclude_none=True),
+            status="draft",
+            created_by=current_user.id,
+        )
+        db.add(campaign)
+        db.flush()
+
+        campaign.total_recipients = add_campaign_recipients(
+            db=db, campaign_id=campaign.id, filters=payload.filters
+        )
+        db.commit()
+        db.refresh(campaign)
+        return CampaignOut.model_validate(campaign)
+
+    except Exception as e:
+        logger.error(f"Error in creating campaign - {e}")
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error creating campaign. Try again",
+        )
+
+
+def get_campaign_for_start(campaign_id: str, db: Session) -> Campaign:
+    campaign = db.get(Campaign, campaign_id)
+    if not campaign:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Campaign not found"
+        )
+    # Claimed in one conditional UPDATE, so two starts can't both win. A
+    # "running" campaign whose run stopped checkpointing is resumed.
+    now = datetime.now(timezone.utc)
+    was_running = campaign.status == "running"
+    claimed = db.execute(
+        update(Campaign)
+        .where(
+            Campaign.id == campaign_id,
+            or_(
+                Campaign.status != "running",
+                Campaign.updated_at < now - timedelta(seconds=CAMPAIGN_STALE_SECONDS),
+            ),
+        )
+        .values(status="running", updated_at=now)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if not claimed:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Campaign is already running",
+        )
+    if was_running:
+        logger.warning(f"Campaign {campaign_id} run went stale; resuming it")
+    db.commit()
+    return campaign
+
+
+def get_all_campaigns(db: Session):
+    try:
+        campaigns = db.scalars(
+            select(Campaign).order_by(Campaign.created_at.desc())
+        ).all()
+        return [CampaignOut.model_validate(c) for c in campaigns]
+    except Exception as e:
+        logger.error(f"Error in getting campaigns - {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error fetching campaigns",
+        )
+
+
+def get_campaign_details(campaign_id: str, db: Session, failed_limit: int = 200):
+    campaign = db.get(Campaign, campaign_id)
+    if not campaign:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Campaign not found"
+        )
+    try:
+        status_counts = db.execute(
+            select(CampaignRecipient.status, func.count(CampaignRecipient.id))
+            .where(CampaignRecipient.campaign_id == campaign_id)
+            .group_by(CampaignRecipient.status)
+        ).all()
+
+        failed = db.scalars(
+            select(CampaignRecipient)
+            .where(
+                CampaignRecipient.campaign_id == campaign_id,
+                CampaignRecipient.status == "failed",
+            )
+            .limit(failed_limit)
+        ).all()
+
+        return {
+            "campaign": CampaignOut.model_validate(campaign),
+            "status_counts": {row[0]: row[1] for row in status_counts},
+            "failed_recipients": [
+                CampaignRecipientOut.model_validate(r) for r in failed
+            ],
+        }
+    except Exception as e:
+        logger.error(f"Error in getting campaign details - {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error fetching campaign details",
+        )
@@ -1,5 +1,6 @@
 from sqlalchemy import select, and_, func, desc, asc, or_, case, not_
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, aliased, selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
 from models.schemas.candidate_schemas import (
     NewCandidatePayload,
     CandidatesSearchParams,
@@ -15,21 +16,24 @@ from models.verification_statuses import VerificationStatus
 from models import IssuedStatus
 from fastapi import HTTPException, status, UploadFile
 from models.schemas.auth_schemas import UserOut
-from models import UpgradeRequest, User, Candidate, Store
+from models import UpgradeRequest, User, Candidate, Store, VoucherCode
 import time
+import asyncio
 from models.schemas.store_schemas import StoreItemOut
 import os
 from utils.helpers import (
     save_image_file,
-    generate_coupon,
     save_aadhar_photo,
     normalize_path,
 )
-import cv2
-import numpy as np
 from utils.log_config import logger
+from services.coupons.coupon_pool import coupon_pool
+from services.reference_data.reference_cache import reference_cache
 from datetime import datetime, timezone
-from deepface import DeepFace
+from services.verification_service.face_runtime import (
+    get_cv2,
+)
+from services.verification_service.face_detection import detect_faces_in_image
 
 MAX_RETRIES = 3
 
@@ -62,7 +66,7 @@ def add_new_candidate(payload: NewCandidatePayload, db: Session):
                     state=payload.state,
                     store_id=payload.store_id if payload.store_id else None,
                     division=payload.division,
-                    coupon_code=generate_coupon(),
+                    coupon_code=coupon_pool.take(),
                     region_id=payload.region_id,
                 )
                 if payload.aadhar_number:
@@ -94,15 +98,14 @@ def add_new_candidate(payload: NewCandidatePayload, db: Session):
                             detail="Failed to generate unique Employee ID after several attempts. Try again",
                         )
                     elif ".coupon_code" in error_message:
-                        print(error_message)
-
-                        # Retry if duplicate ID
-                        if attempt < MAX_RETRIES - 1:
-                            time.sleep(0.1)
+                        # Only a write that bypassed the pool can get here;
+                        # the next pool code is all a retry needs
+                        logger.error(f"Coupon pool handed out a used code - {e}")
+                        if attempt == 0:
                             continue
                         raise HTTPException(
                             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                            detail="Failed to generate unique Coupon after several attempts. Try again",
+                            detail="Failed to assign a unique Coupon. Try again",
                         )
 
                     elif ".mobile_number" in error_message:
@@ -135,6 +138,46 @@ def add_new_candidate(payload: NewCandidatePayload, db: Session):
         )
 
 
+def _to_candidate_item_with_store(candidate: Candidate) -> CandidateItemWithStore:
+    store = candidate.store
+
+    return CandidateItemWithStore(
+        id=candidate.id,
+        full_name=candidate.full_name,
+        mobile_number=candidate.mobile_number,
+        dob=candidate.dob,
+        state=candidate.state,
+        city=candidate.city,
+        division=candidate.division,
+        store_id=candidate.store_id,
+        photo=candidate.photo if candidate.photo else None,
+        issued_status=candidate.issued_status.issued_status
+        if candidate.issued_status
+        else "not_issued",
+        vendor_spoc_id=candidate.vendor_spoc_id,
+        aadhar_number=candidate.aadhar_number_masked,
+        aadhar_photo=candidate.aadhar_photo if candidate.aadhar_photo else None,
+        is_candidate_verified=candidate.is_candidate_verified,
+        coupon_code=candidate.coupon_code,
+        gift_card_code=candidate.gift_card_code,
+        store=StoreItemOut(
+            name=store.name,
+            id=store.id,
+            city=store.city,
+            email=store.email,
+            mobile_number=store.mobile_number,
+            count=store.count,
+            address=store.address,
+        )
+        if store
+        else None,
+        region=RegionOutSchema.model_validate(candidate.region)
+        if candidate.region
+        else None,
+        voucher_issued_at=candidate.voucher_issued_at,
+    )
+
+
 def get_candidate_by_id(candidate_id: str, db: Session):
     try:
         candidate = db.get(Candidate, candidate_id)
@@ -143,43 +186,35 @@ def get_candidate_by_id(candidate_id: str, db: Session):
                 status_code=status.HTTP_404_NOT_FOUND, detail="Employee not found"
             )
 
-        store = candidate.store
+        return _to_candidate_item_with_store(candidate)
 
-        return CandidateItemWithStore(
-            id=candidate.id,
-            full_name=candidate.full_name,
-            mobile_number=candidate.mobile_number,
-            dob=candidate.dob,
-            state=candidate.state,
-            city=candidate.city,
-            division=candidate.division,
-            store_id=candidate.store_id,
-            photo=candidate.photo if candidate.photo else None,
-            issued_status=candidate.issued_status.issued_status
-            if candidate.issued_status
-            else "not_issued",
-            vendor_spoc_id=candidate.vendor_spoc_id,
-            aadhar_number=candidate.aadhar_number_masked,
-            aadhar_photo=candidate.aadhar_photo if candidate.aadhar_photo else None,
-            is_candidate_verified=candidate.is_candidate_verified,
-            coupon_code=candidate.coupon_code,
-            gift_card_code=candidate.gift_card_code,
-            store=StoreItemOut(
-                name=store.name,
-                id=store.id,
-                city=store.city,
-                email=store.email,
-                mobile_number=store.mobile_number,
-                count=store.count,
-                address=store.address,
-            )
-            if store
-            else None,
-            region=RegionOutSchema.model_validate(candidate.region)
-            if candidate.region
-            else None,
-            voucher_issued_at=candidate.voucher_issued_at,
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error in getting beneficiary by id - {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={"msg": "Error getting Employee by ID", "err_stack": str(e)},
+        )
+
+
+async def get_candidate_by_id_async(candidate_id: str, db: AsyncSession):
+    try:
+        candidate = await db.get(
+            Candidate,
+            candidate_id,
+            options=[
+                selectinload(Candidate.store).selectinload(Store.city),
+                selectinload(Candidate.issued_status),
+                selectinload(Candidate.region),
+            ],
         )
+        if not candidate:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Employee not found"
+            )
+
+        return _to_candidate_item_with_store(candidate)
 
     except HTTPException:
         raise
@@ -191,6 +226,34 @@ def get_candidate_by_id(candidate_id: str, db: Session):
         )
 
 
+def voucher_code_lookup(code: str, code_type: str | None = None):
+    """
+    Candidate presenting a coupon or gift-card code (any VoucherCode type, or
+    only `code_type`). One index range on voucher_codes, then a primary-key
+    read of candidates.
+    """
+    stmt = (
+        select(Candidate)
+        .join(VoucherCode, VoucherCode.candidate_id == Candidate.id)
+        .where(VoucherCode.code == code)
+    )
+    if code_type is not None:
+        stmt = stmt.where(VoucherCode.code_type == code_type)
+    return stmt.limit(1)
+
+
+def get_candidate_by_voucher_code(
+    code: str, db: Session, code_type: str | None = None
+) -> Candidate | None:
+    return db.scalar(voucher_code_lookup(code, code_type))
+
+
+async def get_candidate_by_voucher_code_async(
+    code: str, db: AsyncSession, code_type: str | None = None
+) -> Candidate | None:
+    return await db.scalar(voucher_code_lookup(code, code_type))
+
+
 def get_candidate_details_by_id(candidate_id: str, db: Session):
     try:
         candidate = db.get(Candidate, candidate_id)
@@ -247,9 +310,7 @@ def get_candidate_details_by_id(candidate_id: str, db: Session):
 
 def get_candidate_details_by_coupon_code(coupon_code: str, db: Session):
     try:
-        candidate = db.scalar(
-            select(Candidate).where(Candidate.coupon_code == coupon_code)
-        )
+        candidate = get_candidate_by_voucher_code(coupon_code, db)
         if not candidate:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -367,11 +428,97 @@ def get_candidate_by_photo_url(photo_url, db: Session):
         )
 
 
+# Columns the candidate list is projected from (no ORM objects per row)
+CANDIDATE_LIST_COLUMNS = (
+    Candidate.id,
+    Candidate.coupon_code,
+    Candidate.full_name,
+    Candidate.mobile_number,
+    Candidate.dob,
+    Candidate.city,
+    Candidate.state,
+    Candidate.photo,
+    Candidate.division,
+    Candidate.vendor_spoc_id,
+    Candidate.region_id,
+    Candidate.aadhar_number_masked,
+    Candidate.aadhar_photo,
+    Candidate.gift_card_code,
+    Candidate.store_id,
+    Candidate.is_candidate_verified,
+    Candidate.verified_by,
+    Candidate.voucher_issued_at,
+)
+
+
+def _issued_status_column():
+    # Aliased: the list query may already join issued_statuses for its filter
+    issued = aliased(IssuedStatus)
+    return (
+        select(issued.issued_status)
+        .where(issued.candidate_id == Candidate.id)
+        .scalar_subquery()
+        .label("issued_status")
+    )
+
+
+def _verifiers(db: Session, user_ids: set[str]) -> dict[str, dict]:
+    if not user_ids:
+        return {}
+    users = db.scalars(
+        select(User).options(selectinload(User.regions)).where(User.id.in_(user_ids))
+    ).all()
+    return {user.id: UserOut.model_validate(user).model_dump() for user in users}
+
+
+def candidate_list_rows(rows, db: Session, current_user: UserOut) -> list[dict]:
+    """
+    The JSON of CandidateItemWithStore for each row, built as plain dicts.
+    Stores, regions and verifiers are dumped once per distinct id.
+    """
+    show_gift_card = current_user.role in ["super_admin", "admin"]
+    verifiers = _verifiers(db, {row.verified_by for row in rows if row.verified_by})
+    stores, regions = {}, {}
+    for store_id in {row.store_id for row in rows if row.store_id}:
+        store = reference_cache.store(store_id)
+        stores[store_id] = store.model_dump() if store else None
+    for region_id in {row.region_id for row in rows if row.region_id}:
+        region = reference_cache.region(region_id)
+        regions[region_id] = region.model_dump() if region else None
+
+    return [
+        {
+            "id": row.id,
+            "coupon_code": row.coupon_code,
+            "full_name": row.full_name,
+            "mobile_number": row.mobile_number,
+            "dob": row.dob,
+            "city": row.city,
+            "state": row.state,
+            "photo": row.photo or None,
+            "issued_status": row.issued_status or "not_issued",
+            "division": row.division,
+            "vendor_spoc_id": row.vendor_spoc_id,
+            "region": regions.get(row.region_id),
+            "aadhar_number": row.aadhar_number_masked,
+            "aadhar_photo": row.aadhar_photo or None,
+            "gift_card_code": row.gift_card_code if show_gift_card else None,
+            "store_id": row.store_id,
+            "is_candidate_verified": row.is_candidate_verified,
+            "store": stores.get(row.store_id),
+            "verified_by": verifiers.get(row.verified_by),
+            "voucher_issued_at": row.voucher_issued_at,
+        }
+        for row in rows
+    ]
+
+
 def get_all_candidates(
     db: Session, params: CandidatesSearchParams, current_user: UserOut
 ):
+    """Returns JSON-ready dicts; the route renders them with json_response."""
     try:
-        stmt = select(Candidate)
+        stmt = select(*CANDIDATE_LIST_COLUMNS)
         stmt_count = select(
             func.count(Candidate.id).label("total_candidates"),
             func.sum(case((Candidate.is_candidate_verified, 1), else_=0)).label(
@@ -463,65 +610,17 @@ def get_all_candidates(
 
         filtered_count = db.execute(filtered_count_stmt).scalar()
 
+        stmt = stmt.add_columns(_issued_status_column()).order_by(sort_col)
         if params.page >= 1:
-            candidates = db.scalars(
-                stmt.order_by(sort_col)
-                .limit(params.page_size)
-                .offset(params.page * params.page_size - params.page_size)
+            rows = db.execute(
+                stmt.limit(params.page_size).offset(
+                    params.page * params.page_size - params.page_size
+                )
             ).all()
         else:
-            candidates = db.scalars(stmt.order_by(sort_col)).all()
+            rows = db.execute(stmt).all()
 
-        result = []
-        for candidate in candidates:
-            verified_by = (
-                db.get(User, candidate.verified_by) if candidate.verified_by else None
-            )
-            verified_by_user = (
-                UserOut.model_validate(verified_by) if verified_by else None
-            )
-            store = candidate.store
-            print(str(candidate.issued_status))
-            data = CandidateItemWithStore(
-                id=candidate.id,
-                full_name=candidate.full_name,
-                mobile_number=candidate.mobile_number,
-                dob=candidate.dob,
-                state=candidate.state,
-                city=candidate.city,
-                division=candidate.division,
-                store_id=candidate.store_id,
-                photo=candidate.photo if candidate.photo else None,
-                issued_status=candidate.issued_status.issued_status
-                if candidate.issued_status
-                else "not_issued",
-                vendor_spoc_id=candidate.vendor_spoc_id,
-                aadhar_number=candidate.aadhar_number_masked,
-                aadhar_photo=candidate.aadhar_photo if candidate.aadhar_photo else None,
-                is_candidate_verified=candidate.is_candidate_verified,
-                coupon_code=candidate.coupon_code,
-                verified_by=verified_by_user,
-                gift_card_code=candidate.gift_card_code
-                if current_user.role in ["super_admin", "admin"]
-                else None,
-                store=StoreItemOut(
-                    name=store.name,
-                    id=store.id,
-                    city=store.city,
-                    count=store.count,
-                    email=store.email,
-                    address=store.address,
-                    mobile_number=store.mobile_number,
-                )
-                if store
-                else None,
-                region=RegionOutSchema.model_validate(candidate.region)
-                if candidate.region
-                else None,
-                voucher_issued_at=candidate.voucher_issued_at,
-            )
-
-            result.append(data)
+        result = candidate_list_rows(rows, db, current_user)
         return {
             "msg": "Employees fetched successfully",
             "data": {
@@ -875,6 +974,9 @@ async def validate_face(photo: UploadFile):
     contents = await photo.read()
 
     # Convert bytes to OpenCV image
+    import numpy as np
+
+    cv2 = get_cv2()
     np_arr = np.frombuffer(contents, np.uint8)
     img = cv2.imdecode(np_arr, cv2.IMREAD_COLOR)
 
@@ -884,11 +986,7 @@ async def validate_face(photo: UploadFile):
         )
 
     try:
-        faces = DeepFace.extract_faces(
-            img_path=img,
-            detector_backend="opencv",  # best accuracy
-        )
-        print("faces >>>", faces)
+        faces = await asyncio.to_thread(detect_faces_in_image, img)
     except Exception as e:
         logger.error(f"No Face detected in upload image, {str(e)}")
         raise HTTPException(
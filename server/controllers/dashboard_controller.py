@@ -1,26 +1,28 @@
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, and_, case
-from models import Candidate, User, VerificationStatus, Store
+from models import Candidate, User, VerificationStatus
 from models.issued_statuses import IssuedStatus
-from models import UpgradeRequest, City, StoreCityAssociation
+from models import UpgradeRequest
 from fastapi import HTTPException, status
 from typing import Any
 from models.schemas.auth_schemas import UserOut
+from services.reference_data.reference_cache import reference_cache
 
 
-def get_admin_dashboard_stats(db: Session) -> dict[str, Any]:
+async def get_admin_dashboard_stats(db: AsyncSession) -> dict[str, Any]:
     """Get comprehensive dashboard statistics for admin"""
     try:
         # Total candidates
-        total_candidates = db.scalar(select(func.count(Candidate.id)))
+        total_candidates = await db.scalar(select(func.count(Candidate.id)))
 
         # Verified candidates
-        verified_candidates = db.scalar(
+        verified_candidates = await db.scalar(
             select(func.count(Candidate.id)).where(Candidate.is_candidate_verified)
         )
 
         # Candidates with laptops issued
-        issued_laptops = db.scalar(
+        issued_laptops = await db.scalar(
             select(func.count(Candidate.id))
             .join(IssuedStatus)
             .where(
@@ -31,61 +33,86 @@ def get_admin_dashboard_stats(db: Session) -> dict[str, Any]:
             )
         )
 
-        upgrade_requests_stats = db.execute(
-            select(
-                func.sum(case((~UpgradeRequest.is_accepted, 1), else_=0)).label(
-                    "upgrade_requests"
-                ),
-                func.sum(case((UpgradeRequest.is_accepted, 1), else_=0)).label(
-                    "upgrades_completed"
-                ),
+        upgrade_requests_stats = (
+            await db.execute(
+                select(
+                    func.sum(case((~UpgradeRequest.is_accepted, 1), else_=0)).label(
+                        "upgrade_requests"
+                    ),
+                    func.sum(case((UpgradeRequest.is_accepted, 1), else_=0)).label(
+                        "upgrades_completed"
+                    ),
+                )
             )
         ).all()
 
         # print("UPGRADE STATS", upgrade_requests_stats)
 
-        total_stores = db.scalar(select(func.count(Store.id)))
+        stores = await reference_cache.aget("stores")
+        total_stores = len(stores)
 
         # Pending verifications
         pending_verifications = (total_candidates or 0) - (verified_candidates or 0)
 
-        # Store-wise statistics
-        # Store-wise statistics (safe for many-to-many cities and multiple issued statuses)
-        store_stats = db.execute(
-            select(
-                Store.id,
-                Store.name,
-                func.group_concat(func.distinct(City.name).op("SEPARATOR")(", ")).label(
-                    "cities"
-                ),
-                # Total candidates (distinct!)
-                func.count(func.distinct(Candidate.id)).label("total_candidates"),
-                # Laptops issued (distinct candidates who were issued laptops)
-                func.count(
-                    func.distinct(
-                        case((IssuedStatus.issued_status == "issued", Candidate.id))
+        # Store-wise statistics: candidate counts per store in one grouped pass;
+        # store names and cities come from the reference cache
+        store_stats = {
+            row.store_id: row
+            for row in (
+                await db.execute(
+                    select(
+                        Candidate.store_id,
+                        # Total candidates (distinct!)
+                        func.count(func.distinct(Candidate.id)).label(
+                            "total_candidates"
+                        ),
+                        # Laptops issued (distinct candidates who were issued laptops)
+                        func.count(
+                            func.distinct(
+                                case(
+                                    (
+                                        IssuedStatus.issued_status == "issued",
+                                        Candidate.id,
+                                    )
+                                )
+                            )
+                        ).label("laptops_issued"),
+                        func.count(
+                            func.distinct(
+                                case((Candidate.is_candidate_verified, Candidate.id))
+                            )
+                        ).label("vouchers_issued"),
+                        func.count(
+                            func.distinct(
+                                case(
+                                    (
+                                        ~VerificationStatus.is_aadhar_verified,
+                                        Candidate.id,
+                                    )
+                                )
+                            )
+                        ).label("aadhar_failed"),
+                        func.count(
+                            func.distinct(
+                                case(
+                                    (
+                                        ~VerificationStatus.is_facial_verified,
+                                        Candidate.id,
+                                    )
+                                )
+                            )
+                        ).label("facial_failed"),
                     )
-                ).label("laptops_issued"),
-                func.count(
-                    func.distinct(case((Candidate.is_candidate_verified, Candidate.id)))
-                ).label("vouchers_issued"),
-                # Verification failures (verification table is 1-to-1 per candidate, so sum is safe)
-                func.sum(
-                    case((~VerificationStatus.is_aadhar_verified, 1), else_=0)
-                ).label("aadhar_failed"),
-                func.sum(
-                    case((~VerificationStatus.is_facial_verified, 1), else_=0)
-                ).label("facial_failed"),
-            )
-            .outerjoin(StoreCityAssociation, Store.id == StoreCityAssociation.store_id)
-            .outerjoin(City, City.id == StoreCityAssociation.city_id)
-            .outerjoin(Candidate, Store.id == Candidate.store_id)
-            .outerjoin(IssuedStatus, Candidate.id == IssuedStatus.candidate_id)
-            .outerjoin(
-                VerificationStatus, Candidate.id == VerificationStatus.candidate_id
-            )
-            .group_by(Store.id, Store.name)
-        ).all()
+                    .outerjoin(IssuedStatus, Candidate.id == IssuedStatus.candidate_id)
+                    .outerjoin(
+                        VerificationStatus,
+                        Candidate.id == VerificationStatus.candidate_id,
+                    )
+                    .where(Candidate.store_id.is_not(None))
+                    .group_by(Candidate.store_id)
+                )
+            ).all()
+        }
 
         # store_stats = db.execute(
         #     select(
@@ -133,16 +160,17 @@ def get_admin_dashboard_stats(db: Session) -> dict[str, Any]:
             },
             "store_statistics": [
                 {
-                    "store_id": row.id,
-                    "store_name": row.name,
-                    "city": row.cities,
-                    "total_candidates": row.total_candidates or 0,
-                    "aadhar_failed": row.aadhar_failed or 0,
-                    "facial_failed": row.facial_failed or 0,
-                    "vouchers_issued": row.vouchers_issued or 0,
-                    "laptops_issued": row.laptops_issued or 0,
+                    "store_id": store.id,
+                    "store_name": store.name,
+                    "city": ", ".join(sorted(c.name for c in store.city or [])) or None,
+                    "total_candidates": getattr(row, "total_candidates", 0),
+                    "aadhar_failed": getattr(row, "aadhar_failed", 0),
+                    "facial_failed": getattr(row, "facial_failed", 0),
+                    "vouchers_issued": getattr(row, "vouchers_issued", 0),
+                    "laptops_issued": getattr(row, "laptops_issued", 0),
                 }
-                for row in store_stats
+                for store in stores.values()
+                for row in [store_stats.get(store.id)]
             ],
             "upgrade_statistics": {
                 "upgrade_requests": upgrade_requests_stats[0].upgrade_requests
@@ -160,16 +188,18 @@ def get_admin_dashboard_stats(db: Session) -> dict[str, Any]:
         )
 
 
-def get_store_agent_dashboard_stats(db: Session, store_id: str) -> dict[str, Any]:
+async def get_store_agent_dashboard_stats(
+    db: AsyncSession, store_id: str
+) -> dict[str, Any]:
     """Get dashboard statistics for store agent"""
     try:
         # Total candidates in this store
-        total_candidates = db.scalar(
+        total_candidates = await db.scalar(
             select(func.count(Candidate.id)).where(Candidate.store_id == store_id)
         )
 
         # Verified candidates
-        verified_candidates = db.scalar(
+        verified_candidates = await db.scalar(
             select(func.count(Candidate.id)).where(
                 and_(
                     Candidate.store_id == store_id,
@@ -179,7 +209,7 @@ def get_store_agent_dashboard_stats(db: Session, store_id: str) -> dict[str, Any
         )
 
         # Laptops issued
-        issued_laptops = db.scalar(
+        issued_laptops = await db.scalar(
             select(func.count(Candidate.id))
             .join(IssuedStatus)
             .where(
@@ -191,37 +221,41 @@ def get_store_agent_dashboard_stats(db: Session, store_id: str) -> dict[str, Any
             )
         )
 
-        upgrade_requests_stats = db.execute(
-            select(
-                func.sum(case((~UpgradeRequest.is_accepted, 1), else_=0)).label(
-                    "upgrade_requests"
-                ),
-                func.sum(case((UpgradeRequest.is_accepted, 1), else_=0)).label(
-                    "upgrades_completed"
-                ),
+        upgrade_requests_stats = (
+            await db.execute(
+                select(
+                    func.sum(case((~UpgradeRequest.is_accepted, 1), else_=0)).label(
+                        "upgrade_requests"
+                    ),
+                    func.sum(case((UpgradeRequest.is_accepted, 1), else_=0)).label(
+                        "upgrades_completed"
+                    ),
+                )
+                .join(Candidate, Candidate.id == UpgradeRequest.candidate_id)
+                .where(Candidate.store_id == store_id)
             )
-            .join(Candidate, Candidate.id == UpgradeRequest.candidate_id)
-            .where(Candidate.store_id == store_id)
         ).all()
 
         # Recent issuances (last 10)
-        recent_issuances = db.execute(
-            select(
-                Candidate.id,
-                Candidate.full_name,
-                Candidate.mobile_number,
-                IssuedStatus.issued_at,
-                IssuedStatus.issued_laptop_serial,
-            )
-            .join(IssuedStatus)
-            .where(
-                and_(
-                    Candidate.store_id == store_id,
-                    IssuedStatus.issued_status == "issued",
+        recent_issuances = (
+            await db.execute(
+                select(
+                    Candidate.id,
+                    Candidate.full_name,
+                    Candidate.mobile_number,
+                    IssuedStatus.issued_at,
+                    IssuedStatus.issued_laptop_serial,
+                )
+                .join(IssuedStatus)
+                .where(
+                    and_(
+                        Candidate.store_id == store_id,
+                        IssuedStatus.issued_status == "issued",
+                    )
                 )
+                .order_by(IssuedStatus.issued_at.desc())
+                .limit(10)
             )
-            .order_by(IssuedStatus.issued_at.desc())
-            .limit(10)
         ).all()
 
         return {
@@ -256,8 +290,8 @@ def get_store_agent_dashboard_stats(db: Session, store_id: str) -> dict[str, Any
         )
 
 
-def get_registration_officer_dashboard_stats(
-    db: Session, current_user: UserOut
+async def get_registration_officer_dashboard_stats(
+    db: AsyncSession, current_user: UserOut
 ) -> dict[str, Any]:
     """Get dashboard statistics for registration officer"""
     try:
@@ -267,7 +301,7 @@ def get_registration_officer_dashboard_stats(
             region_ids = [r.id for r in current_user.regions]
             total_cand_stmt = total_cand_stmt.where(Candidate.region_id.in_(region_ids))
 
-        total_candidates = db.scalar(total_cand_stmt) or 0
+        total_candidates = await db.scalar(total_cand_stmt) or 0
 
         # Verified candidates
         verified_candidates_stmt = select(func.count(Candidate.id)).where(
@@ -278,7 +312,7 @@ def get_registration_officer_dashboard_stats(
             verified_candidates_stmt = verified_candidates_stmt.where(
                 Candidate.region_id.in_(region_ids)
             )
-        verified_candidates = db.scalar(verified_candidates_stmt)
+        verified_candidates = await db.scalar(verified_candidates_stmt)
 
         issued_laptops_stmt = (
             select(func.count(Candidate.id))
@@ -311,13 +345,13 @@ def get_registration_officer_dashboard_stats(
                 Candidate.region_id.in_(region_ids)
             )
 
-        issued_laptops = db.scalar(issued_laptops_stmt)
-        upgrade_laptops = db.scalar(upgrade_laptops_stmt)
+        issued_laptops = await db.scalar(issued_laptops_stmt)
+        upgrade_laptops = await db.scalar(upgrade_laptops_stmt)
 
         # Pending verifications
         pending_verifications = total_candidates - (verified_candidates or 0)
 
-        total_stores = db.scalar(select(func.count(Store.id)))
+        total_stores = len(await reference_cache.aget("stores"))
 
         return {
             "summary": {
@@ -336,7 +370,9 @@ def get_registration_officer_dashboard_stats(
         )
 
 
-def get_region_wise_dashboard_stats(db: Session, region_id: str) -> dict[str, Any]:
+async def get_region_wise_dashboard_stats(
+    db: AsyncSession, region_id: str
+) -> dict[str, Any]:
     """Get dashboard statistics for registration officer"""
     try:
         # Total candidates
@@ -344,11 +380,11 @@ def get_region_wise_dashboard_stats(db: Session, region_id: str) -> dict[str, An
             Candidate.region_id == region_id
         )
 
-        total_candidates = db.scalar(total_cand_stmt) or 0
+        total_candidates = await db.scalar(total_cand_stmt) or 0
 
         # Verified candidates
         verified_candidates = (
-            db.scalar(
+            await db.scalar(
                 select(func.count(Candidate.id)).where(
                     and_(
                         Candidate.is_candidate_verified,
@@ -362,7 +398,7 @@ def get_region_wise_dashboard_stats(db: Session, region_id: str) -> dict[str, An
         # Pending verifications
         pending_verifications = total_candidates - (verified_candidates or 0)
 
-        total_stores = db.scalar(select(func.count(Store.id)))
+        total_stores = len(await reference_cache.aget("stores"))
 
         # Pending candidates (not verified)
         # pending_candidates = db.execute(
@@ -401,21 +437,21 @@ def get_region_wise_dashboard_stats(db: Session, region_id: str) -> dict[str, An
         )
 
 
-def get_laptop_issuance_stats_of_all(db: Session):
+async def get_laptop_issuance_stats_of_all(db: AsyncSession):
     try:
-        count_of_total_candidates = db.scalar(select(func.count(Candidate.id)))
+        count_of_total_candidates = await db.scalar(select(func.count(Candidate.id)))
 
-        count_of_verified_candidates = db.scalar(
+        count_of_verified_candidates = await db.scalar(
             select(func.count(Candidate.id)).where(Candidate.is_candidate_verified)
         )
 
-        count_of_candidate_recieved_laptops = db.scalar(
+        count_of_candidate_recieved_laptops = await db.scalar(
             select(func.count(Candidate.id))
             .join(IssuedStatus)
             .where(IssuedStatus.issued_status == "issued")
         )
 
-        count_of_stores = db.scalar(select(func.count(Store.id)))
+        count_of_stores = len(await reference_cache.aget("stores"))
 
         return {
             "count_of_total_candidates": count_of_total_candidates,
@@ -1,16 +1,20 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import select
 from fastapi import HTTPException, status
 
-from models import Region, RegionUserAssociation
+from models import Region
 from models.schemas.region_schemas import RegionOutSchema
 from models.schemas.auth_schemas import UserOut
+from services.reference_data.reference_cache import (
+    bump_reference_versions,
+    reference_cache,
+)
 
 
 def create_new_region(db: Session, name: str) -> RegionOutSchema:
     try:
         new_region = Region(name=name)
         db.add(new_region)
+        bump_reference_versions(db, "regions")
         db.commit()
         db.refresh(new_region)
         return RegionOutSchema.model_validate(new_region)
@@ -24,19 +28,16 @@ def create_new_region(db: Session, name: str) -> RegionOutSchema:
 
 def get_all_regions(db: Session, name: str | None, current_user: UserOut):
     try:
-        stmt = select(Region)
+        regions = list(reference_cache.get("regions").values())
         if current_user.role == "registration_officer":
-            print("USER ROLE REGISTRATION OFFICER")
-            stmt = stmt.join(
-                RegionUserAssociation, RegionUserAssociation.region_id == Region.id
-            ).where(RegionUserAssociation.user_id == current_user.id)
-            print("STMT", stmt)
+            # get_current_user loads an officer's regions
+            own = {region.id for region in current_user.regions or []}
+            regions = [region for region in regions if region.id in own]
 
         if name:
-            stmt = stmt.where(Region.name.ilike(f"%{name}%"))
-        regions = db.scalars(stmt).all()
+            regions = [r for r in regions if name.lower() in r.name.lower()]
 
-        return [RegionOutSchema.model_validate(region) for region in regions]
+        return regions
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
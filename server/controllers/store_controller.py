@@ -7,14 +7,19 @@ from models.schemas.store_schemas import (
     CityOut,
 )
 from fastapi import HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy import select, func, and_, asc, desc
+from sqlalchemy import select, func, and_, asc, desc, case
 from models import IssuedStatus
 from models.stores import Store
 from models.users import User
 from models import Candidate, StoreCityAssociation, City
 from models.schemas.auth_schemas import UserOut, RegisterRequest
+from services.reference_data.reference_cache import (
+    bump_reference_versions,
+    reference_cache,
+)
 from utils.log_config import logger
 
 MAX_RETRIES = 3
@@ -32,8 +37,7 @@ def add_new_store(payload: AddNewStore, db: Session):
         )
 
         db.add(new_store)
-        db.commit()
-        db.refresh(new_store)
+        db.flush()
 
         for city_id in payload.city_ids:
             association = StoreCityAssociation(
@@ -42,9 +46,14 @@ def add_new_store(payload: AddNewStore, db: Session):
             )
             db.add(association)
 
+        bump_reference_versions(db, "stores")
+        db.commit()
+        db.refresh(new_store)
+
         return new_store
 
     except Exception as e:
+        db.rollback()
         logger.error(f"Error adding new store - {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -52,108 +61,128 @@ def add_new_store(payload: AddNewStore, db: Session):
         )
 
 
-async def get_all_stores(db: Session, params: StoreSearchParams):
-    try:
-        query = select(Store)
+def _store_counts_subquery():
+    """Beneficiaries and issued laptops per store, in one grouped pass."""
+    issued = case((IssuedStatus.issued_status == "issued", IssuedStatus.candidate_id))
+    return (
+        select(
+            Candidate.store_id.label("store_id"),
+            func.count(Candidate.id).label("total_assigned_candidates"),
+            func.count(issued).label("total_laptops_issued"),
+        )
+        .outerjoin(IssuedStatus, IssuedStatus.candidate_id == Candidate.id)
+        .where(Candidate.store_id.is_not(None))
+        .group_by(Candidate.store_id)
+        .subquery()
+    )
+
+
+def _store_sort_column(sort_by: str):
+    if sort_by == "city":
+        # A store can have several cities; sort on the first by name
+        return (
+            select(func.min(City.name))
+            .join(StoreCityAssociation, StoreCityAssociation.city_id == City.id)
+            .where(StoreCityAssociation.store_id == Store.id)
+            .correlate(Store)
+            .scalar_subquery()
+        )
+    return getattr(Store, sort_by)
 
-        # ✅ SEARCH (same logic as Candidates)
-        if params and params.search_by and params.search_term:
-            setattr(params, "page", -1)
 
-            if params.search_by.lower() == "city":
-                query = (
-                    query.join(
-                        StoreCityAssociation, Store.id == StoreCityAssociation.store_id
-                    )
+def store_listing_query(params: StoreSearchParams):
+    """
+    One page of stores with their counts: a single SELECT, plus one batched
+    query each for agents (with their regions) and cities, whatever the page size.
+    """
+    counts = _store_counts_subquery()
+    query = (
+        select(
+            Store,
+            func.coalesce(counts.c.total_assigned_candidates, 0),
+            func.coalesce(counts.c.total_laptops_issued, 0),
+        )
+        .outerjoin(counts, counts.c.store_id == Store.id)
+        .options(
+            selectinload(Store.store_agents).selectinload(User.regions),
+            selectinload(Store.city),
+        )
+    )
+
+    if params.search_by and params.search_term:
+        if params.search_by.lower() == "city":
+            query = query.where(
+                Store.id.in_(
+                    select(StoreCityAssociation.store_id)
                     .join(City, City.id == StoreCityAssociation.city_id)
                     .where(City.name.ilike(f"%{params.search_term}%"))
-                    .distinct(Store.id)
-                )
-            elif params.search_by.lower() == "name":
-                query = query.where(Store.name.ilike(f"%{params.search_term}%"))
-            else:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Invalid search_by value: {params.search_by}. Must be 'city' or 'name'.",
                 )
-
-        # ✅ SORT
-        sort_col = getattr(Store, params.sort_by)
-
-        if params.sort_order == "asc":
-            sort_col = asc(sort_col)
-        else:
-            sort_col = desc(sort_col)
-
-        stats_count = db.query(
-            func.count(Store.id).label("total_count"),
-            func.sum(Store.count).label("total_stock"),
-        ).first()
-
-        print("Stats count: ", stats_count)
-
-        # ✅ PAGINATION
-        if params.page >= 1:
-            query = (
-                query.order_by(sort_col)
-                .limit(params.page_size)
-                .offset(params.page * params.page_size - params.page_size)
             )
+        elif params.search_by.lower() == "name":
+            query = query.where(Store.name.ilike(f"%{params.search_term}%"))
         else:
-            query = query.order_by(sort_col)
-
-        stores = db.scalars(query).all()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid search_by value: {params.search_by}. Must be 'city' or 'name'.",
+            )
 
-        # ✅ DISTINCT CITIES (unchanged)
-        cities = db.scalars(select(City).distinct()).all()
+    sort_col = _store_sort_column(params.sort_by)
+    sort_col = asc(sort_col) if params.sort_order == "asc" else desc(sort_col)
+    # Store.id breaks ties so pages don't overlap
+    query = query.order_by(sort_col, Store.id)
 
-        result = []
+    if params.page >= 1:
+        query = query.limit(params.page_size).offset(
+            params.page * params.page_size - params.page_size
+        )
+    return query
 
-        for store in stores:
-            store_agents = []
 
-            total_assigned_candidates = db.scalar(
-                select(func.count(Candidate.id)).where(Candidate.store_id == store.id)
-            )
+async def get_all_stores(db: Session, params: StoreSearchParams):
+    try:
+        # ✅ SEARCH returns every match on one page (same as Candidates)
+        if params and params.search_by and params.search_term:
+            setattr(params, "page", -1)
 
-            total_laptops_issued = db.scalar(
-                select(func.count(IssuedStatus.candidate_id))
-                .select_from(Candidate)
-                .join(IssuedStatus, IssuedStatus.candidate_id == Candidate.id)
-                .where(
-                    and_(
-                        Candidate.store_id == store.id,
-                        IssuedStatus.issued_status == "issued",
-                    )
-                )
+        stats_count = db.execute(
+            select(
+                func.count(Store.id).label("total_count"),
+                func.sum(Store.count).label("total_stock"),
             )
+        ).first()
 
-            if store.store_agents:
-                for agent in store.store_agents:
-                    store_agents.append(UserOut.model_validate(agent))
-
-            result.append(
-                StoreItemWithUser(
-                    id=store.id,
-                    name=store.name,
-                    address=store.address,
-                    city=store.city,
-                    mobile_number=store.mobile_number,
-                    count=store.count,
-                    email=store.email,
-                    store_agents=store_agents,
-                    total_assigned_candidates=total_assigned_candidates,
-                    total_laptops_issued=total_laptops_issued,
-                )
+        rows = db.execute(store_listing_query(params)).all()
+
+        # ✅ CITIES for the filter dropdown
+        cities = await reference_cache.aget("cities")
+
+        result = [
+            StoreItemWithUser(
+                id=store.id,
+                name=store.name,
+                address=store.address,
+                city=store.city,
+                mobile_number=store.mobile_number,
+                count=store.count,
+                email=store.email,
+                store_agents=[
+                    UserOut.model_validate(agent) for agent in store.store_agents
+                ],
+                total_assigned_candidates=total_assigned_candidates,
+                total_laptops_issued=total_laptops_issued,
             )
+            for store, total_assigned_candidates, total_laptops_issued in rows
+        ]
 
         return {
             "stores": result,
             "cities": cities,
             "total_count": stats_count.total_count if stats_count else 0,
-            "total_stock": int(stats_count.total_stock) if stats_count else 0,
+            "total_stock": int(stats_count.total_stock or 0) if stats_count else 0,
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error in getting all stores - {e}")
         raise HTTPException(
@@ -164,7 +193,7 @@ async def get_all_stores(db: Session, params: StoreSearchParams):
 
 def get_all_cities(db: Session):
     try:
-        cities = db.scalars(select(City).order_by(asc(City.name))).all()
+        cities = reference_cache.get("cities")
         result = [CityOut.model_validate(city) for city in cities]
         return result
     except Exception as e:
@@ -177,13 +206,31 @@ def get_all_cities(db: Session):
 
 def get_store_of_user(db: Session, user: UserOut):
     try:
-        store_id = user.store_id
-        store = db.get(Store, store_id)
+        store = reference_cache.store(user.store_id)
         if not store:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Store not found"
             )
-        return StoreItemOut.model_validate(store)
+        return store
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Error in getting store of user")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={"msg": "Error getting candidates for store", "err_stack": str(e)},
+        )
+
+
+async def get_store_of_user_async(db: AsyncSession, user: UserOut):
+    try:
+        stores = await reference_cache.aget("stores")
+        store = stores.get(user.store_id) if user.store_id else None
+        if not store:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Store not found"
+            )
+        return store
     except HTTPException:
         raise
     except Exception as e:
@@ -242,6 +289,7 @@ def update_store_details(store_id: str, payload: UpdateStorePayload, db: Session
                         db.add(new_association)
 
         db.add(store)
+        bump_reference_versions(db, "stores")
         db.commit()
         db.refresh(store)
 
@@ -3,6 +3,10 @@ from utils.helpers import save_utility_pdf, normalize_path
 from fastapi import UploadFile, HTTPException, status
 from sqlalchemy.orm import Session
 from sqlalchemy import select
+from services.reference_data.reference_cache import (
+    bump_reference_versions,
+    reference_cache,
+)
 import os
 
 
@@ -19,6 +23,7 @@ async def save_utility_files(file: UploadFile, db: Session, type: str):
         else:
             existing_file = UtilityFile(type=type, path=utility_file_path)
             db.add(existing_file)
+        bump_reference_versions(db, "utility_files")
         db.commit()
 
     except HTTPException:
@@ -32,9 +37,7 @@ async def save_utility_files(file: UploadFile, db: Session, type: str):
 
 def get_utility_file(db: Session, file_type: str):
     try:
-        utility_file = db.scalar(
-            select(UtilityFile).where(UtilityFile.type == file_type)
-        )
+        utility_file = reference_cache.get("utility_files").get(file_type)
 
         if not utility_file:
             raise HTTPException(
@@ -53,7 +56,7 @@ def get_utility_file(db: Session, file_type: str):
 
 def get_all_utility_files(db: Session):
     try:
-        utility_files = db.scalars(select(UtilityFile)).all()
+        utility_files = list(reference_cache.get("utility_files").values())
         if not utility_files:
             return []
         return utility_files
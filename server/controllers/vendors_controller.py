@@ -4,12 +4,17 @@ from models.schemas import vendor_schemas
 from models.vendors import Vendor, VendorSpoc
 from fastapi import HTTPException, status, UploadFile
 from utils.helpers import save_vendor_spoc_img, get_relative_upload_path
+from services.reference_data.reference_cache import (
+    bump_reference_versions,
+    reference_cache,
+)
 
 
 def add_vendor(payload: vendor_schemas.NewVendor, db: Session):
     try:
         new_vendor = Vendor(**payload.model_dump())
         db.add(new_vendor)
+        bump_reference_versions(db, "vendors")
         db.commit()
         db.refresh(new_vendor)
         return new_vendor
@@ -137,6 +142,7 @@ def get_all_vendor_spoc(db: Session, params: vendor_schemas.VendorSpocSearchPara
             vendor_spocs = db.scalars(stmt.order_by(sort_col)).all()
 
         # ---- Response mapping ----
+        vendors = reference_cache.get("vendors")
         result = []
         for v in vendor_spocs:
             result.append(
@@ -147,7 +153,7 @@ def get_all_vendor_spoc(db: Session, params: vendor_schemas.VendorSpocSearchPara
                     mobile_number=v.mobile_number,
                     email=v.email,
                     photo=get_relative_upload_path(v.photo) if v.photo else None,
-                    vendor=v.vendor,
+                    vendor=vendors.get(v.vendor_id) or v.vendor,
                 )
             )
 
@@ -221,6 +227,7 @@ async def update_vendor(
                 setattr(vendor, key, val)
 
         db.add(vendor)
+        bump_reference_versions(db, "vendors")
         db.commit()
         db.refresh(vendor)
         return vendor
@@ -2,17 +2,17 @@ from services.verification_service.email_service import (
     send_otp_email,
     send_otp_to_admin,
 )
-from typing import Any
+from typing import Any, Awaitable
 from services.verification_service.mobile_notification_service import (
     send_beneficiary_sms_otp,
 )
 from sqlalchemy.exc import IntegrityError
 from models.schemas.region_schemas import RegionOutSchema
-from PIL import Image
 
 from fastapi import HTTPException, status, UploadFile
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import select, or_, exists
+from sqlalchemy.orm import Session, aliased, joinedload, selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, exists
 from models.candidates import Candidate
 from models.otps import Otp
 from datetime import datetime, timezone
@@ -21,8 +21,7 @@ from models.schemas import verification_schemas as v_schemas
 from models.schemas.candidate_schemas import CandidateItemWithStore
 from models.schemas.store_schemas import StoreItemOut
 from models.schemas.auth_schemas import UserOut
-from models import IssuedStatus, VerificationStatus, UpgradeRequest, User
-from deepface import DeepFace
+from models import IssuedStatus, VerificationStatus, UpgradeRequest, User, Store
 import os
 from utils.helpers import (
     normalize_path,
@@ -32,15 +31,29 @@ from utils.helpers import (
 from dotenv import load_dotenv
 from datetime import date
 import traceback
+from dataclasses import dataclass
 
 from concurrent.futures import ThreadPoolExecutor
-from threading import Lock
 
 import asyncio
+import time
 
 from utils.log_config import logger
+from controllers.candidates_controller import (
+    get_candidate_by_voucher_code,
+    get_candidate_by_voucher_code_async,
+)
+from services.verification_service.face_metrics import face_metrics
+from services.verification_service.face_runtime import get_deepface
+from services.verification_service.facial_recognition import verify_face_pair
+from services.verification_service.verification_cache import (
+    aadhar_result_cache,
+    aadhar_result_key,
+    face_result_cache,
+    face_result_key,
+)
 
-max_workers = min(2, os.cpu_count() - 1)
+max_workers = max(1, min(2, (os.cpu_count() or 2) - 1))
 executor = ThreadPoolExecutor(max_workers=max_workers)
 face_semaphore = asyncio.Semaphore(2)
 
@@ -55,27 +68,20 @@ os.makedirs(BASE_CANDIDATE_IMG_PATH, exist_ok=True)
 os.makedirs(BASE_STORE_CANDIDATE_UPLOADS, exist_ok=True)
 
 
-_model = None
-_model_lock = Lock()
-
-
-def get_model():
-    global _model
-    if _model is None:
-        with _model_lock:
-            if _model is None:
-                _model = DeepFace.build_model("ArcFace")
-    return _model
-
-
-async def generate_otp(candidate_id: str, db: Session):
+async def generate_otp(candidate_id: str, db: AsyncSession):
     try:
-        candidate = db.get(Candidate, candidate_id)
+        candidate = await db.get(
+            Candidate,
+            candidate_id,
+            options=[selectinload(Candidate.store).selectinload(Store.city)],
+        )
         if not candidate:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Candidate not found"
             )
-        existing_otp = db.scalar(select(Otp).where(Otp.candidate_id == candidate.id))
+        existing_otp = await db.scalar(
+            select(Otp).where(Otp.candidate_id == candidate.id)
+        )
         now = datetime.now(timezone.utc)
         exp = ensure_utc(existing_otp.expires_at) if existing_otp else None
 
@@ -90,8 +96,8 @@ async def generate_otp(candidate_id: str, db: Session):
         otp_val = new_otp.generate_otp()
 
         db.add(new_otp)
-        db.commit()
-        db.refresh(new_otp)
+        await db.commit()
+        await db.refresh(new_otp)
 
         email_payload = CandidateInOtp(
             otp=otp_val,
@@ -123,33 +129,35 @@ async def generate_otp(candidate_id: str, db: Session):
         )
 
 
-async def otp_resend(candidate_id: str, db: Session, to_admin: bool = False):
+async def otp_resend(candidate_id: str, db: AsyncSession, to_admin: bool = False):
     try:
-        candidate = db.get(Candidate, candidate_id)
+        candidate = await db.get(
+            Candidate, candidate_id, options=[selectinload(Candidate.store)]
+        )
         if not candidate:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Candidate not found"
             )
-        otp = db.scalar(select(Otp).where(Otp.candidate_id == candidate.id))
+        otp = await db.scalar(select(Otp).where(Otp.candidate_id == candidate.id))
         now = datetime.now(timezone.utc)
 
         if otp and ensure_utc(otp.expires_at) < now:
-            db.delete(otp)
-            db.commit()
+            await db.delete(otp)
+            await db.commit()
 
             otp = Otp(candidate_id=candidate.id)
             _otp_val = otp.generate_otp()
 
             db.add(otp)
-            db.commit()
-            db.refresh(otp)
+            await db.commit()
+            await db.refresh(otp)
         elif otp is None:
             otp = Otp(candidate_id=candidate.id)
             _otp_val = otp.generate_otp()
 
             db.add(otp)
-            db.commit()
-            db.refresh(otp)
+            await db.commit()
+            await db.refresh(otp)
 
         if not to_admin:
             # email_payload = CandidateInOtp(
@@ -220,20 +228,6 @@ async def otp_resend(candidate_id: str, db: Session, to_admin: bool = False):
         )
 
 
-def check_spoof(image_path):
-    try:
-        face_objs = DeepFace.extract_faces(img_path=image_path, anti_spoofing=True)
-
-        if not face_objs:
-            return True  # No face = suspicious
-
-        return any(not f.get("is_real", False) for f in face_objs)
-
-    except Exception as e:
-        logger.error(f"Spoof check failed: {e}")
-        return True  # FAIL CLOSED (assume spoof)
-
-
 async def facial_recognition_old(img_path: str, original_img: str):
     try:
         norm_input_img_path = normalize_path(img_path)
@@ -248,7 +242,7 @@ async def facial_recognition_old(img_path: str, original_img: str):
         # norm_cand_imgs_path = normalize_path(cand_imgs_path)
         # fallback_norm_cand_imgs_path = normalize_path(fallback_cand_imgs_path)
         # print(f"DB-PATH - {norm_cand_imgs_path}")
-        result = DeepFace.verify(
+        result = get_deepface().verify(
             img1_path=norm_input_img_path,
             img2_path=norm_org_cand_path,
         )
@@ -307,15 +301,7 @@ def validate_image_path(path: str, label: str) -> str:
     return path
 
 
-def convert_to_jpg(path: str) -> str:
-    """
-    Convert any image to RGB JPEG.
-    Returns path to converted file (adds '_rgb.jpg' suffix)
-    """
-    img = Image.open(path).convert("RGB")
-    new_path = path.rsplit(".", 1)[0] + "_rgb.jpg"
-    img.save(new_path, format="JPEG")
-    return new_path
+NO_FACE_REASON = "NO FACE DETECTED. RETAKE"
 
 
 def deepface_verify_sync(img1: str, img2: str) -> dict[str, Any]:
@@ -328,28 +314,8 @@ def deepface_verify_sync(img1: str, img2: str) -> dict[str, Any]:
         img1 = validate_image_path(img1, "Uploaded")
         img2 = validate_image_path(img2, "Beneficiary Original")
 
-        # Convert to RGB JPEG for OpenCV compatibility
-        img1 = convert_to_jpg(img1)
-        img2 = convert_to_jpg(img2)
-
-        # DeepFace verification
-        result = DeepFace.verify(
-            img1_path=img1,
-            img2_path=img2,
-            model_name="ArcFace",
-            detector_backend="opencv",
-            enforce_detection=True,  # Ensure face must be detected
-        )
-
-        # Check distance to determine verification
-        distance = result.get("distance")
-        verified = distance is not None and distance <= 0.53
-
-        return {
-            "verified": verified,
-            "distance": distance,
-            "reason": None if verified else "Face did not match",
-        }
+        # Quality gate, detection and matching; no face raises ValueError
+        return verify_face_pair(img1, img2)
 
     except FileNotFoundError as fe:
         print("File not found", fe)
@@ -361,7 +327,7 @@ def deepface_verify_sync(img1: str, img2: str) -> dict[str, Any]:
         print(traceback.format_exc())
         return {
             "verified": False,
-            "reason": "NO FACE DETECTED. RETAKE",
+            "reason": NO_FACE_REASON,
             "distance": None,
         }
     except Exception as e:
@@ -383,14 +349,27 @@ async def facial_recognition(img_path: str, original_img: str) -> dict[str, Any]
     async with face_semaphore:
         loop = asyncio.get_running_loop()
         result = await loop.run_in_executor(
-            None, deepface_verify_sync, img_path, original_img
+            executor, deepface_verify_sync, img_path, original_img
         )
         return result
 
 
-async def verify_otp(candidate_id: str, otp_input: str, db: Session):
+def is_final_face_result(result: dict[str, Any]) -> bool:
+    """
+    Verdicts that a resubmission of the same images would get again. File and
+    processing errors and liveness timeouts may pass on a retry.
+    """
+    liveness = result.get("liveness") or {}
+    if liveness.get("outcome") in ("timeout", "error"):
+        return False
+    return "quality" in result or result.get("reason") == NO_FACE_REASON
+
+
+async def verify_otp(candidate_id: str, otp_input: str, db: AsyncSession):
     try:
-        otp_record = db.scalar(select(Otp).where(Otp.candidate_id == candidate_id))
+        otp_record = await db.scalar(
+            select(Otp).where(Otp.candidate_id == candidate_id)
+        )
         if not otp_record:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -409,8 +388,8 @@ async def verify_otp(candidate_id: str, otp_input: str, db: Session):
                 status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid OTP"
             )
 
-        db.delete(otp_record)
-        verification_status = db.get(VerificationStatus, candidate_id)
+        await db.delete(otp_record)
+        verification_status = await db.get(VerificationStatus, candidate_id)
         if not verification_status or (
             not verification_status.is_facial_verified
             and not verification_status.overriding_user
@@ -430,15 +409,15 @@ async def verify_otp(candidate_id: str, otp_input: str, db: Session):
             )
 
         is_requested_for_upgrade: bool = bool(
-            db.scalar(
+            await db.scalar(
                 select(exists().where(UpgradeRequest.candidate_id == candidate_id))
             )
         )
 
         verification_status.is_otp_verified = True
         db.add(verification_status)
-        db.commit()
-        db.refresh(verification_status)
+        await db.commit()
+        await db.refresh(verification_status)
 
         return {
             "msg": "OTP verified successfully",
@@ -502,21 +481,77 @@ def get_issuance_details(candidate_id: str, db: Session):
         )
 
 
+async def _timed_stage(name: str, stage: Awaitable, timings: dict[str, float]):
+    """Await one consolidate stage, recording its time and outcome."""
+    start = time.perf_counter()
+    outcome = "ok"
+    try:
+        return await stage
+    except asyncio.CancelledError:
+        outcome = "cancelled"
+        raise
+    except Exception:
+        outcome = "error"
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        timings[name] = elapsed * 1000
+        face_metrics.record(f"consolidate.{name}", elapsed, outcome)
+
+
+async def _get_issued_status(candidate_id: str, db: AsyncSession) -> str | None:
+    try:
+        return await db.scalar(
+            select(IssuedStatus.issued_status).where(
+                IssuedStatus.candidate_id == candidate_id
+            )
+        )
+    except Exception as e:
+        logger.error(f"Error in getting issuance etials in consolidate - {e}")
+        return None
+
+
+async def _verify_aadhar(candidate: Candidate, aadhar_number: str) -> bool:
+    # bcrypt runs off the event loop, once per (candidate, entered number)
+    return await aadhar_result_cache.get_or_compute(
+        aadhar_result_key(candidate.id, candidate.aadhar_number_hashed, aadhar_number),
+        lambda: asyncio.to_thread(candidate.verify_aadhar_number, aadhar_number),
+    )
+
+
+async def _verify_face(candidate: Candidate, candidate_photo: str) -> dict[str, Any]:
+    norm_input_img_path = normalize_path(candidate_photo)
+    norm_org_cand_path = normalize_path(candidate.photo)
+    # Liveness runs inside the face pipeline, alongside the embedding.
+    # A resubmitted capture (same bytes) reuses or joins the earlier match.
+    try:
+        face_key = await face_result_key(
+            candidate.id, norm_input_img_path, norm_org_cand_path
+        )
+    except OSError as e:
+        # A missing or unreadable photo: the pipeline reports it as not
+        # verified, and there is nothing to key a cached result on
+        logger.warning(f"Face result not cacheable for {candidate.id} - {e}")
+        return await facial_recognition(
+            img_path=norm_input_img_path, original_img=norm_org_cand_path
+        )
+    return await face_result_cache.get_or_compute(
+        face_key,
+        lambda: facial_recognition(
+            img_path=norm_input_img_path, original_img=norm_org_cand_path
+        ),
+        cacheable=is_final_face_result,
+    )
+
+
 async def candidate_verification_consolidate(
-    payload: v_schemas.ConsolidateVerificationRequest, db: Session, store_id: str
+    payload: v_schemas.ConsolidateVerificationRequest, db: AsyncSession, store_id: str
 ):
     msg = []
     verification_issues = []
 
     try:
-        candidate = db.scalar(
-            select(Candidate).where(
-                or_(
-                    Candidate.coupon_code == payload.coupon_code,
-                    Candidate.gift_card_code == payload.coupon_code,
-                )
-            )
-        )
+        candidate = await get_candidate_by_voucher_code_async(payload.coupon_code, db)
     except Exception as e:
         logger.error(f"Error in getting candidate in consolidate verif - {e}")
         raise
@@ -541,11 +576,25 @@ async def candidate_verification_consolidate(
         is_coupon_verified=True
     )
 
-    try:
-        issuanceDetails = db.scalar(
-            select(IssuedStatus).where(IssuedStatus.candidate_id == candidate.id)
+    # The issuance lookup and Aadhaar check start together; the face match
+    # only once the lookup says the laptop isn't issued yet, since cancelling
+    # it doesn't stop the ArcFace run in its executor thread. Results are taken
+    # in the order the checks take precedence, and a decisive one cancels the
+    # stages still running.
+    stage_timings: dict[str, float] = {}
+    issuance_task = asyncio.create_task(
+        _timed_stage("issuance", _get_issued_status(candidate.id, db), stage_timings)
+    )
+    aadhar_task = asyncio.create_task(
+        _timed_stage(
+            "aadhar", _verify_aadhar(candidate, payload.aadhar_number), stage_timings
         )
-        if issuanceDetails and issuanceDetails.issued_status == "issued":
+    )
+    face_task = None
+    stages = [issuance_task, aadhar_task]
+
+    try:
+        if await issuance_task == "issued":
             result = {
                 "verification_status": verification_status_in.model_dump(),
                 "candidate": {
@@ -563,84 +612,51 @@ async def candidate_verification_consolidate(
                 "msg": "Laptop has already been issued for beneficiary",
                 "data": result,
             }
-    except Exception as e:
-        logger.error(f"Error in getting issuance etials in consolidate - {e}")
-        pass
-
-    # Aadhaar verification
 
-    if candidate.verify_aadhar_number(payload.aadhar_number):
-        verification_status_in.is_aadhar_verified = True
-    else:
-        verification_issues.append("aadhar")
-        msg.append("Aadhaar number does not match.")
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Aadhar number doesn't match",
-        )
-
-    if not candidate.photo:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Beneficiary photo not registered.",
-        )
-
-    # Facial verification
-    try:
-        norm_input_img_path = normalize_path(payload.candidate_photo)
-        norm_org_cand_path = normalize_path(candidate.photo)
-        print(
-            "INPUT PATH:",
-            norm_input_img_path,
-            os.path.exists(norm_input_img_path),
-            os.path.getsize(norm_input_img_path),
-        )
-        print(
-            "DB PATH:",
-            norm_org_cand_path,
-            os.path.exists(norm_org_cand_path),
-            os.path.getsize(norm_org_cand_path),
-        )
-        print(
-            "Candidate photo path:",
-            norm_org_cand_path,
-            os.path.exists(norm_org_cand_path),
-        )
-        print(
-            "Input photo path:",
-            norm_input_img_path,
-            os.path.exists(norm_input_img_path),
-        )
-
-        # is_spoof = check_spoof(norm_input_img_path)
-        # if is_spoof:
-        #     print(is_spoof)
-        #     msg.append(
-        #         "Spoof detectected with beneficiary photo. Photo is not captured in realtime."
-        #     )
+        if candidate.photo:
+            face_task = asyncio.create_task(
+                _timed_stage(
+                    "face",
+                    _verify_face(candidate, payload.candidate_photo),
+                    stage_timings,
+                )
+            )
+            stages.append(face_task)
 
-    except HTTPException:
-        raise
+        if await aadhar_task:
+            verification_status_in.is_aadhar_verified = True
+        else:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Aadhar number doesn't match",
+            )
 
-    except Exception as e:
-        logger.error(f"Final Error in consolidate - {e}")
-        raise
+        if face_task is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Beneficiary photo not registered.",
+            )
 
-    try:
-        # is_candidate_face_verified = {"verified": False, "reason": msg}
-        # if not is_spoof:
-        is_candidate_face_verified = await facial_recognition(
-            img_path=norm_input_img_path, original_img=norm_org_cand_path
-        )
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error in facial verification in consolidate verification - {e}")
-        raise HTTPException(
-            status_code=500, detail="Unexpected error in facial verification. Try again"
+        try:
+            is_candidate_face_verified = await face_task
+        except Exception as e:
+            logger.error(
+                f"Error in facial verification in consolidate verification - {e}"
+            )
+            raise HTTPException(
+                status_code=500,
+                detail="Unexpected error in facial verification. Try again",
+            )
+    finally:
+        for task in stages:
+            task.cancel()
+        # Settle cancelled/failed stages so none is left un-retrieved
+        await asyncio.gather(*stages, return_exceptions=True)
+        logger.info(
+            f"Consolidate stages for {candidate.id}: "
+            + ", ".join(f"{name}={ms:.0f}ms" for name, ms in stage_timings.items())
         )
 
-    print(f"Candidate face in db: - {candidate.photo}")
     if is_candidate_face_verified.get("verified"):
         verification_status_in.is_facial_verified = True
     else:
@@ -652,7 +668,7 @@ async def candidate_verification_consolidate(
 
     # Save verification status
     try:
-        new_verification_status = db.get(VerificationStatus, candidate.id)
+        new_verification_status = await db.get(VerificationStatus, candidate.id)
         if not new_verification_status:
             new_verification_status = VerificationStatus(
                 candidate_id=candidate.id,
@@ -680,8 +696,8 @@ async def candidate_verification_consolidate(
         new_verification_status.entered_aadhar_number = payload.aadhar_number
 
         db.add(new_verification_status)
-        db.commit()
-        db.refresh(new_verification_status)
+        await db.commit()
+        await db.refresh(new_verification_status)
 
         verification_status_in.is_all_verified = all(
             [
@@ -720,7 +736,7 @@ async def candidate_verification_consolidate(
         logger.error(
             f"Unexpected error while verifying the beneficiary, Try again - {e}"
         )
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Unexpected error while verifying the beneficiary, Try again",
@@ -767,13 +783,107 @@ def override_verification_process(
         )
 
 
+@dataclass
+class IssuanceContext:
+    """Rows the issuance and upgrade checks read, loaded by one joined query."""
+
+    candidate: Candidate
+    store: Store
+    verification: VerificationStatus | None
+    issued: IssuedStatus | None
+    upgrade: UpgradeRequest | None
+    latest_issuer: v_schemas.LatestIssuer | None
+
+
+def _issuance_context_query(candidate_id: str, user: UserOut):
+    recent = aliased(IssuedStatus)
+    latest = aliased(IssuedStatus)
+    # The store user's most recent issuance, for the "same employee" photo
+    latest_issued_candidate = (
+        select(recent.candidate_id)
+        .where(recent.issued_by == user.id)
+        .order_by(recent.issued_at.desc())
+        .limit(1)
+        .correlate(None)
+        .scalar_subquery()
+    )
+    return (
+        select(
+            Candidate, Store, VerificationStatus, IssuedStatus, UpgradeRequest, latest
+        )
+        .select_from(Candidate)
+        .outerjoin(Store, Store.id == user.store_id)
+        .outerjoin(VerificationStatus, VerificationStatus.candidate_id == Candidate.id)
+        .outerjoin(IssuedStatus, IssuedStatus.candidate_id == Candidate.id)
+        .outerjoin(UpgradeRequest, UpgradeRequest.candidate_id == Candidate.id)
+        .outerjoin(latest, latest.candidate_id == latest_issued_candidate)
+        .where(Candidate.id == candidate_id)
+    )
+
+
+def _to_issuance_context(row) -> IssuanceContext:
+    if row is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Beneficiary not found"
+        )
+    candidate, store, verification, issued, upgrade, latest = row
+    if store is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Store not found"
+        )
+    return IssuanceContext(
+        candidate=candidate,
+        store=store,
+        verification=verification,
+        issued=issued,
+        upgrade=upgrade,
+        latest_issuer=(
+            v_schemas.LatestIssuer.model_validate(latest) if latest else None
+        ),
+    )
+
+
+def load_issuance_context(
+    db: Session, candidate_id: str, user: UserOut
+) -> IssuanceContext:
+    try:
+        row = db.execute(_issuance_context_query(candidate_id, user)).first()
+        return _to_issuance_context(row)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error in loading issuance context - {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error fetching beneficiary issuance details.",
+        )
+
+
+async def load_issuance_context_async(
+    db: AsyncSession, candidate_id: str, user: UserOut
+) -> IssuanceContext:
+    try:
+        row = (await db.execute(_issuance_context_query(candidate_id, user))).first()
+        return _to_issuance_context(row)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error in loading issuance context - {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error fetching beneficiary issuance details.",
+        )
+
+
 async def upload_laptop_issuance_details(
-    payload: v_schemas.LaptopIssueRequest, db: Session, user_id: str, candidate_id: str
+    payload: v_schemas.LaptopIssueRequest,
+    db: AsyncSession,
+    user_id: str,
+    context: IssuanceContext,
 ):
+    candidate_id = context.candidate.id
     try:
-        issued_status = db.scalar(
-            select(IssuedStatus).where(IssuedStatus.candidate_id == candidate_id)
-        )
+        issued_status = context.issued
 
         if issued_status and issued_status.issued_status == "issued":
             raise HTTPException(
@@ -808,21 +918,15 @@ async def upload_laptop_issuance_details(
             issued_status.issued_by = user_id
 
         db.add(issued_status)
-        db.commit()
-        db.refresh(issued_status)
-
-        result = db.scalar(
-            select(IssuedStatus).outerjoin(
-                UpgradeRequest, IssuedStatus.candidate_id == UpgradeRequest.candidate_id
-            )
-        )
-        return result
+        # expire_on_commit=False: the row is returned as written, no re-select
+        await db.commit()
+        return issued_status
 
     except HTTPException:
         raise
 
     except IntegrityError as e:
-        db.rollback()
+        await db.rollback()
         error_message = str(e.orig)
 
         if "Duplicate entry" in error_message:
@@ -865,12 +969,31 @@ def get_latest_issuer_details(db: Session, store_user_id: str):
         )
 
 
+async def get_latest_issuer_details_async(db: AsyncSession, store_user_id: str):
+    try:
+        latest_issued_status = await db.scalar(
+            select(IssuedStatus)
+            .where(IssuedStatus.issued_by == store_user_id)
+            .order_by(IssuedStatus.issued_at.desc())
+            .limit(1)
+        )
+        if not latest_issued_status:
+            return
+        return v_schemas.LatestIssuer.model_validate(latest_issued_status)
+    except Exception as e:
+        logger.error(f"Error in getting latest issuer details - {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error fetching latest Issuer details.",
+        )
+
+
 def verify_for_upgrade(
     payload: v_schemas.RequestForUploadPayload, db: Session, store: StoreItemOut
 ):
     try:
-        candidate_data = db.scalar(
-            select(Candidate).where(Candidate.coupon_code == payload.coupon_code)
+        candidate_data = get_candidate_by_voucher_code(
+            payload.coupon_code, db, "coupon"
         )
 
         if not candidate_data:
@@ -975,8 +1098,8 @@ def confirm_upgrade(
     store: StoreItemOut,
 ):
     try:
-        candidate_data = db.scalar(
-            select(Candidate).where(Candidate.coupon_code == payload.coupon_code)
+        candidate_data = get_candidate_by_voucher_code(
+            payload.coupon_code, db, "coupon"
         )
 
         if not candidate_data:
@@ -1130,28 +1253,20 @@ async def upload_laptop_issuance_bill_reciept(
 
 
 def request_new_upgrade(
-    candidate_id: str,
+    context: IssuanceContext,
     db: Session,
-    store: StoreItemOut,
     payload: v_schemas.RequestNewUpgradePayload | None,
 ):
+    candidate = context.candidate
+    candidate_id = candidate.id
     try:
-        candidate = db.get(Candidate, candidate_id)
-        if not candidate:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="Beneficiary Not found"
-            )
-        if candidate.store and candidate.store.id != store.id:
+        if candidate.store_id and candidate.store_id != context.store.id:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Benficairy is not alloted to your store.",
             )
 
-        verification_status = db.scalar(
-            select(VerificationStatus).where(
-                VerificationStatus.candidate_id == candidate.id
-            )
-        )
+        verification_status = context.verification
         if not verification_status:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -1175,7 +1290,7 @@ def request_new_upgrade(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Beneficiary's verfication process is failed, please re-verify.",
             )
-        candidate_issued_status = candidate.issued_status
+        candidate_issued_status = context.issued
         if (
             candidate_issued_status
             and candidate_issued_status.issued_status == "issued"
@@ -1192,9 +1307,7 @@ def request_new_upgrade(
                     "is_already_issued": True,
                 },
             }
-        existing_upgrade = db.scalar(
-            select(UpgradeRequest).where(UpgradeRequest.candidate_id == candidate.id)
-        )
+        existing_upgrade = context.upgrade
 
         if existing_upgrade and not existing_upgrade.is_accepted:
             return {
@@ -1239,19 +1352,15 @@ def request_new_upgrade(
 
 
 def close_upgrade_request(
-    candidate_id: str,
+    context: IssuanceContext,
     db: Session,
     payload: v_schemas.UpgradeClosurePayload,
     current_user: UserOut,
 ):
+    candidate_id = context.candidate.id
     try:
-        existing_upgrade_request = db.scalar(
-            select(UpgradeRequest).where(UpgradeRequest.candidate_id == candidate_id)
-        )
-
-        issued_status = db.scalar(
-            select(IssuedStatus).where(IssuedStatus.candidate_id == candidate_id)
-        )
+        existing_upgrade_request = context.upgrade
+        issued_status = context.issued
         if issued_status and issued_status.issued_status == "issued":
             return {
                 "msg": "Beneficiary already recieved laptop",
@@ -8,7 +8,33 @@ class DBConfig(BaseSettings):
     POOL_TIMEOUT: int
     POOL_RECYCLE: int
 
+    # Defaults to DATABASE_URL with the pymysql driver swapped for aiomysql
+    ASYNC_DATABASE_URL: str | None = None
+
+    # Optional read replica for dashboards, exports and list endpoints
+    READ_DATABASE_URL: str | None = None
+    # Clients that wrote within this window keep reading from the primary
+    REPLICA_MAX_LAG_SECONDS: int = 5
+
+    # When DB_MAX_CONNECTIONS is set, pool sizes are derived from it and the
+    # worker count instead of POOL_SIZE / MAX_OVERFLOW (see db.pool)
+    DB_MAX_CONNECTIONS: int | None = None
+    DB_RESERVED_CONNECTIONS: int = 10
+    WEB_CONCURRENCY: int = 1
+
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
+    @property
+    def async_database_url(self) -> str:
+        if self.ASYNC_DATABASE_URL:
+            return self.ASYNC_DATABASE_URL
+        return self.DATABASE_URL.replace("+pymysql", "+aiomysql", 1)
+
+    @property
+    def async_read_database_url(self) -> str | None:
+        if not self.READ_DATABASE_URL:
+            return None
+        return self.READ_DATABASE_URL.replace("+pymysql", "+aiomysql", 1)
+
 
 Config = DBConfig()  # type:ignore
@@ -1,29 +1,78 @@
-from collections.abc import Generator
+import threading
+import time
+from collections.abc import AsyncGenerator, Generator
+from typing import Any
 
-from sqlalchemy import create_engine
+from fastapi import Request
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import QueuePool
 
 from .base import Base
 from .config import Config
+from .pool import (
+    InstrumentedAsyncQueuePool,
+    InstrumentedQueuePool,
+    PoolSizing,
+    instrument_engine,
+    size_pool_for_workers,
+)
+from utils.log_config import logger
+
+_engine_lock = threading.Lock()
+_engine = None
+
+
+def get_pool_sizing() -> PoolSizing:
+    """POOL_SIZE / MAX_OVERFLOW, or sizes derived from DB_MAX_CONNECTIONS when set."""
+    if Config.DB_MAX_CONNECTIONS:
+        return size_pool_for_workers(
+            max_connections=Config.DB_MAX_CONNECTIONS,
+            workers=Config.WEB_CONCURRENCY,
+            reserved_connections=Config.DB_RESERVED_CONNECTIONS,
+        )
+    return PoolSizing(pool_size=Config.POOL_SIZE, max_overflow=Config.MAX_OVERFLOW)
+
+
+def pool_settings() -> dict[str, Any]:
+    sizing = get_pool_sizing()
+    return {
+        "pool_size": sizing.pool_size,
+        "max_overflow": sizing.max_overflow,
+        "pool_timeout": Config.POOL_TIMEOUT,
+        "pool_recycle": Config.POOL_RECYCLE,
+    }
 
 
 def create_db_engine():
     engine = create_engine(
         url=Config.DATABASE_URL,
-        poolclass=QueuePool,
-        pool_size=Config.POOL_SIZE,
-        max_overflow=Config.MAX_OVERFLOW,
-        pool_timeout=Config.POOL_TIMEOUT,
-        pool_recycle=Config.POOL_RECYCLE,
+        poolclass=InstrumentedQueuePool,
         echo=False,
+        **pool_settings(),
     )
+    instrument_engine(engine, "primary")
     return engine
 
 
+def get_db_engine():
+    """The process-wide primary engine; its pool is shared by every request."""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = create_db_engine()
+    return _engine
+
+
 def create_session_factory():
-    engine = create_db_engine()
-    SessionLocal = sessionmaker(autoflush=True, autocommit=False, bind=engine)
+    SessionLocal = sessionmaker(autoflush=True, autocommit=False, bind=get_db_engine())
     return SessionLocal
 
 
@@ -40,5 +89,181 @@ def get_db_conn() -> Generator:
 
 
 def init_db():
-    engine = create_db_engine()
+    # Imported here: models import db.base, which this package provides
+    from models.voucher_codes import backfill_voucher_codes
+
+    engine = get_db_engine()
     Base.metadata.create_all(engine)
+    # Code lookups only read voucher_codes; fill in whatever it is missing
+    try:
+        with engine.begin() as conn:
+            added = backfill_voucher_codes(conn)
+        if added:
+            logger.info(f"Backfilled {added} voucher codes")
+    except IntegrityError:
+        # Another worker backfilled the same rows at the same time
+        logger.info("Voucher codes already backfilled by another worker")
+
+
+# ---- Async (aiomysql) ----
+# One engine per process: the pool has to outlive requests to be of any use.
+
+_async_engine: AsyncEngine | None = None
+_async_session_factory: async_sessionmaker[AsyncSession] | None = None
+
+
+def create_async_db_engine() -> AsyncEngine:
+    engine = create_async_engine(
+        url=Config.async_database_url,
+        poolclass=InstrumentedAsyncQueuePool,
+        echo=False,
+        **pool_settings(),
+    )
+    instrument_engine(engine.sync_engine, "primary_async")
+    return engine
+
+
+def get_async_db_engine() -> AsyncEngine:
+    global _async_engine
+    if _async_engine is None:
+        _async_engine = create_async_db_engine()
+    return _async_engine
+
+
+def get_async_session_factory() -> async_sessionmaker[AsyncSession]:
+    global _async_session_factory
+    if _async_session_factory is None:
+        # expire_on_commit=False: attributes stay readable after commit without
+        # an implicit (and in async, illegal) lazy refresh.
+        _async_session_factory = async_sessionmaker(
+            bind=get_async_db_engine(), autoflush=True, expire_on_commit=False
+        )
+    return _async_session_factory
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    AsyncSessionLocal = get_async_session_factory()
+    async with AsyncSessionLocal() as db:
+        try:
+            yield db
+        except Exception:
+            await db.rollback()
+            raise
+
+
+async def dispose_async_engine():
+    global _async_engine, _async_session_factory
+    global _async_read_engine, _async_read_session_factory
+    for engine in (_async_engine, _async_read_engine):
+        if engine is not None:
+            await engine.dispose()
+    _async_engine = None
+    _async_session_factory = None
+    _async_read_engine = None
+    _async_read_session_factory = None
+
+
+# ---- Read replica ----
+# Reports and list endpoints read through get_read_db / get_async_read_db.
+# Without READ_DATABASE_URL they behave exactly like the primary dependencies.
+# A client that wrote within REPLICA_MAX_LAG_SECONDS (LAST_WRITE_COOKIE, set
+# by the middleware in main.py) is kept on the primary to read its own writes.
+
+LAST_WRITE_COOKIE = "last_write_at"
+
+_read_session_factory: sessionmaker | None = None
+_async_read_engine: AsyncEngine | None = None
+_async_read_session_factory: async_sessionmaker[AsyncSession] | None = None
+
+
+def _set_read_only(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute("SET SESSION TRANSACTION READ ONLY")
+    cursor.close()
+
+
+def create_read_db_engine():
+    engine = create_engine(
+        url=Config.READ_DATABASE_URL,
+        poolclass=InstrumentedQueuePool,
+        echo=False,
+        **pool_settings(),
+    )
+    event.listen(engine, "connect", _set_read_only)
+    instrument_engine(engine, "replica")
+    return engine
+
+
+def create_async_read_db_engine() -> AsyncEngine:
+    engine = create_async_engine(
+        url=Config.async_read_database_url,
+        poolclass=InstrumentedAsyncQueuePool,
+        echo=False,
+        **pool_settings(),
+    )
+    event.listen(engine.sync_engine, "connect", _set_read_only)
+    instrument_engine(engine.sync_engine, "replica_async")
+    return engine
+
+
+def is_pinned_to_primary(request: Request) -> bool:
+    last_write = request.cookies.get(LAST_WRITE_COOKIE)
+    if not last_write:
+        return False
+    try:
+        return time.time() - float(last_write) < Config.REPLICA_MAX_LAG_SECONDS
+    except ValueError:
+        return False
+
+
+def use_read_replica(request: Request) -> bool:
+    return bool(Config.READ_DATABASE_URL) and not is_pinned_to_primary(request)
+
+
+def get_read_session_factory() -> sessionmaker:
+    global _read_session_factory
+    if _read_session_factory is None:
+        with _engine_lock:
+            if _read_session_factory is None:
+                _read_session_factory = sessionmaker(
+                    autoflush=False, autocommit=False, bind=create_read_db_engine()
+                )
+    return _read_session_factory
+
+
+def get_async_read_session_factory() -> async_sessionmaker[AsyncSession]:
+    global _async_read_engine, _async_read_session_factory
+    if _async_read_session_factory is None:
+        _async_read_engine = create_async_read_db_engine()
+        _async_read_session_factory = async_sessionmaker(
+            bind=_async_read_engine, autoflush=False, expire_on_commit=False
+        )
+    return _async_read_session_factory
+
+
+def get_read_db(request: Request) -> Generator:
+    if use_read_replica(request):
+        SessionLocal = get_read_session_factory()
+    else:
+        SessionLocal = create_session_factory()
+    db = SessionLocal()
+    try:
+        yield db
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+async def get_async_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    if use_read_replica(request):
+        AsyncSessionLocal = get_async_read_session_factory()
+    else:
+        AsyncSessionLocal = get_async_session_factory()
+    async with AsyncSessionLocal() as db:
+        try:
+            yield db
+        except Exception:
+            await db.rollback()
+            raise
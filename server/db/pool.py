@@ -0,0 +1,270 @@
+"""Instrumented connection pools and per-route DB usage for /metrics."""
+
+import math
+import threading
+import time
+from collections.abc import Callable
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+class _Stat:
+    """Running count / total / max of a duration in seconds."""
+
+    __slots__ = ("count", "total", "max")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def as_dict(self) -> dict[str, float]:
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total / self.count * 1000, 2) if self.count else 0.0,
+            "max_ms": round(self.max * 1000, 2),
+            "total_ms": round(self.total * 1000, 2),
+        }
+
+
+class PoolMetrics:
+    def __init__(self, name: str, engine: Engine):
+        self.name = name
+        self.engine = engine
+        self._lock = threading.Lock()
+        self.checkout_wait = _Stat()
+        self.hold_time = _Stat()
+        self.connection_age = _Stat()
+        self.timeouts = 0
+        self.connects = 0
+        self.invalidations = 0
+
+    def record_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.checkout_wait.add(seconds)
+
+    def record_timeout(self, seconds: float) -> None:
+        with self._lock:
+            self.timeouts += 1
+            self.checkout_wait.add(seconds)
+
+    def record_connect(self) -> None:
+        with self._lock:
+            self.connects += 1
+
+    def record_checkout(self, age: float) -> None:
+        with self._lock:
+            self.connection_age.add(age)
+
+    def record_checkin(self, held: float) -> None:
+        with self._lock:
+            self.hold_time.add(held)
+
+    def record_invalidate(self) -> None:
+        with self._lock:
+            self.invalidations += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        pool = self.engine.pool
+        with self._lock:
+            return {
+                "pool_size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow": pool.overflow(),
+                "timeouts": self.timeouts,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+                "checkout_wait": self.checkout_wait.as_dict(),
+                "hold_time": self.hold_time.as_dict(),
+                "connection_age_at_checkout": self.connection_age.as_dict(),
+            }
+
+
+class _TimedCheckoutMixin:
+    """Times the blocking part of a checkout, which pool events can't see."""
+
+    _metrics: PoolMetrics | None = None
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except PoolTimeoutError:
+            if self._metrics:
+                self._metrics.record_timeout(time.perf_counter() - start)
+            raise
+        if self._metrics:
+            self._metrics.record_wait(time.perf_counter() - start)
+        return conn
+
+    def recreate(self):
+        new_pool = super().recreate()
+        new_pool._metrics = self._metrics
+        return new_pool
+
+
+class InstrumentedQueuePool(_TimedCheckoutMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+pool_metrics: dict[str, PoolMetrics] = {}
+
+
+# ---- Per-request DB usage ----
+
+
+@dataclass
+class RequestDBStats:
+    queries: int = 0
+    db_time: float = 0.0
+
+
+@dataclass
+class RouteDBStats:
+    requests: int = 0
+    queries: int = 0
+    max_queries: int = 0
+    db_time: _Stat = field(default_factory=_Stat)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "queries": self.queries,
+            "avg_queries": round(self.queries / self.requests, 2)
+            if self.requests
+            else 0.0,
+            "max_queries": self.max_queries,
+            "db_time": self.db_time.as_dict(),
+        }
+
+
+_current_request: ContextVar[RequestDBStats | None] = ContextVar(
+    "db_request_stats", default=None
+)
+_route_stats: dict[str, RouteDBStats] = {}
+_route_lock = threading.Lock()
+
+
+def start_request_tracking() -> tuple[RequestDBStats, Token]:
+    stats = RequestDBStats()
+    return stats, _current_request.set(stats)
+
+
+def finish_request_tracking(token: Token, route: str, stats: RequestDBStats) -> None:
+    _current_request.reset(token)
+    with _route_lock:
+        route_stats = _route_stats.setdefault(route, RouteDBStats())
+        route_stats.requests += 1
+        route_stats.queries += stats.queries
+        route_stats.max_queries = max(route_stats.max_queries, stats.queries)
+        route_stats.db_time.add(stats.db_time)
+
+
+def route_metrics() -> dict[str, dict[str, Any]]:
+    with _route_lock:
+        return {route: s.as_dict() for route, s in sorted(_route_stats.items())}
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get("query_started_at")
+    if not started:
+        return
+    elapsed = time.perf_counter() - started.pop()
+    stats = _current_request.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_time += elapsed
+
+
+# ---- Wiring ----
+
+
+def instrument_engine(engine: Engine, name: str) -> PoolMetrics:
+    """Attach pool and query listeners. Pass `async_engine.sync_engine` for async."""
+    metrics = PoolMetrics(name, engine)
+    engine.pool._metrics = metrics
+    pool_metrics[name] = metrics
+
+    def on_connect(dbapi_connection, connection_record):
+        connection_record.info["connected_at"] = time.monotonic()
+        metrics.record_connect()
+
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        now = time.monotonic()
+        connection_record.info["checked_out_at"] = now
+        metrics.record_checkout(now - connection_record.info.get("connected_at", now))
+
+    def on_checkin(dbapi_connection, connection_record):
+        checked_out_at = connection_record.info.pop("checked_out_at", None)
+        if checked_out_at is not None:
+            metrics.record_checkin(time.monotonic() - checked_out_at)
+
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        metrics.record_invalidate()
+
+    listeners: list[tuple[str, Callable]] = [
+        ("connect", on_connect),
+        ("checkout", on_checkout),
+        ("checkin", on_checkin),
+        ("invalidate", on_invalidate),
+        ("before_cursor_execute", _before_cursor_execute),
+        ("after_cursor_execute", _after_cursor_execute),
+    ]
+    for identifier, fn in listeners:
+        event.listen(engine, identifier, fn)
+    return metrics
+
+
+def all_pool_metrics() -> dict[str, dict[str, Any]]:
+    return {name: m.snapshot() for name, m in pool_metrics.items()}
+
+
+# ---- Sizing ----
+
+
+@dataclass(frozen=True)
+class PoolSizing:
+    pool_size: int
+    max_overflow: int
+
+
+def size_pool_for_workers(
+    max_connections: int,
+    workers: int,
+    engines_per_worker: int = 2,
+    reserved_connections: int = 10,
+    overflow_ratio: float = 0.5,
+) -> PoolSizing:
+    """
+    Split MySQL's max_connections across worker processes.
+    Every worker owns its own pools (sync + async engine on the primary), so
+    workers * engines_per_worker * (pool_size + max_overflow) has to fit in
+    max_connections minus what is kept back for admin tools and migrations.
+    """
+    workers = max(1, workers)
+    engines_per_worker = max(1, engines_per_worker)
+    budget = max(max_connections - reserved_connections, workers * engines_per_worker)
+    per_engine = max(1, budget // (workers * engines_per_worker))
+    pool_size = max(1, math.ceil(per_engine / (1 + overflow_ratio)))
+    return PoolSizing(pool_size=pool_size, max_overflow=max(0, per_engine - pool_size))
@@ -0,0 +1,355 @@
+"""
+Offline face-match evaluation: FAR/FRR, ROC/DET and latency per backend.
+
+    python face_threshold_eval.py [--backend deepface --backend onnx-int8]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+from sqlalchemy import select
+
+from db.connection import create_session_factory
+from models import Candidate, IssuedStatus, VerificationStatus
+from services.verification_service.face_detection import (
+    FACE_DETECTOR_CASCADE,
+    detect_faces_in_image,
+)
+from services.verification_service.face_embeddings import (
+    EMBEDDING_BACKENDS,
+    get_embedding_backend,
+    onnx_model_path,
+    preprocess_faces,
+)
+from services.verification_service.face_quality import decode_image
+from services.verification_service.face_runtime import FACE_MATCH_THRESHOLD
+from utils.helpers import normalize_path
+
+THRESHOLDS = np.round(np.arange(0.0, 1.2001, 0.0025), 4)
+
+
+def load_pairs(issued_only: bool, limit: int | None) -> list[tuple[str, str, str]]:
+    """(candidate_id, uploaded photo, registered photo) with both files on disk."""
+    stmt = (
+        select(
+            VerificationStatus.candidate_id,
+            VerificationStatus.uploaded_candidate_photo,
+            Candidate.photo,
+        )
+        .join(Candidate, Candidate.id == VerificationStatus.candidate_id)
+        .where(
+            VerificationStatus.uploaded_candidate_photo.is_not(None),
+            Candidate.photo.is_not(None),
+        )
+        .order_by(VerificationStatus.candidate_id)
+    )
+    if issued_only:
+        # Issued laptops passed OTP too: the upload really is that person
+        stmt = stmt.join(IssuedStatus, IssuedStatus.candidate_id == Candidate.id).where(
+            IssuedStatus.issued_status == "issued"
+        )
+    if limit:
+        stmt = stmt.limit(limit)
+
+    db = create_session_factory()()
+    try:
+        rows = db.execute(stmt).all()
+    finally:
+        db.close()
+
+    pairs = []
+    for candidate_id, uploaded, photo in rows:
+        uploaded, photo = normalize_path(uploaded), normalize_path(photo)
+        if os.path.exists(uploaded) and os.path.exists(photo):
+            pairs.append((candidate_id, uploaded, photo))
+    return pairs
+
+
+class EmbeddingCache:
+    def __init__(self, path: str):
+        self.path = path
+        self.vectors: dict[str, np.ndarray] = {}
+        if os.path.exists(path):
+            data = np.load(path, allow_pickle=False)
+            self.vectors = dict(zip(data["keys"].tolist(), data["vectors"]))
+
+    @staticmethod
+    def key(backend: str, image_path: str) -> str:
+        stat = os.stat(image_path)
+        cascade = ",".join(FACE_DETECTOR_CASCADE)
+        return f"{backend}|{cascade}|{image_path}|{stat.st_size}|{stat.st_mtime_ns}"
+
+    def save(self) -> None:
+        if not self.vectors:
+            return
+        keys = list(self.vectors)
+        np.savez(
+            self.path,
+            keys=np.array(keys),
+            vectors=np.stack([self.vectors[k] for k in keys]),
+        )
+
+
+def detect_all(paths: list[str]) -> tuple[dict[str, np.ndarray], list[float]]:
+    """Largest aligned face per image, preprocessed for ArcFace; detection ms per image."""
+    faces, timings = {}, []
+    for path in paths:
+        start = time.perf_counter()
+        try:
+            face_objs = detect_faces_in_image(decode_image(path))
+        except ValueError:
+            continue
+        finally:
+            timings.append((time.perf_counter() - start) * 1000)
+        largest = max(
+            face_objs, key=lambda f: f["facial_area"]["w"] * f["facial_area"]["h"]
+        )
+        faces[path] = preprocess_faces([largest["face"]])[0]
+    return faces, timings
+
+
+def embed_all(
+    backend_name: str,
+    faces: dict[str, np.ndarray],
+    cache: EmbeddingCache,
+    batch_size: int,
+) -> tuple[dict[str, np.ndarray], list[float]]:
+    """Unit-norm embeddings per image path; ms per face of each uncached batch."""
+    backend = get_embedding_backend(backend_name)
+    keys = {path: EmbeddingCache.key(backend_name, path) for path in faces}
+    missing = [path for path in faces if keys[path] not in cache.vectors]
+    per_face_ms = []
+    for i in range(0, len(missing), batch_size):
+        batch_paths = missing[i : i + batch_size]
+        start = time.perf_counter()
+        vectors = backend.embed(np.stack([faces[p] for p in batch_paths]))
+        per_face_ms.append((time.perf_counter() - start) * 1000 / len(batch_paths))
+        vectors = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+        for path, vector in zip(batch_paths, vectors):
+            cache.vectors[keys[path]] = vector.astype(np.float32)
+    return {path: cache.vectors[keys[path]] for path in faces}, per_face_ms
+
+
+def single_face_latency(
+    backend_name: str, faces: dict[str, np.ndarray], samples: int
+) -> list[float]:
+    """Batch-of-one latency, which is what a verification request pays."""
+    backend = get_embedding_backend(backend_name)
+    timings = []
+    for face in list(faces.values())[:samples]:
+        start = time.perf_counter()
+        backend.embed(face[None, ...])
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def score_pairs(
+    pairs: list[tuple[str, str, str]],
+    embeddings: dict[str, np.ndarray],
+    max_impostors: int,
+    seed: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    usable = [(u, p) for _, u, p in pairs if u in embeddings and p in embeddings]
+    if not usable:
+        return np.empty(0), np.empty(0)
+    uploads = np.stack([embeddings[u] for u, _ in usable])
+    photos = np.stack([embeddings[p] for _, p in usable])
+    genuine = 1.0 - np.einsum("ij,ij->i", uploads, photos)
+
+    n = len(usable)
+    total = n * (n - 1)
+    if total <= max_impostors:
+        distances = 1.0 - uploads @ photos.T
+        impostor = distances[~np.eye(n, dtype=bool)]
+    else:
+        rng = np.random.default_rng(seed)
+        rows = rng.integers(0, n, max_impostors)
+        # Shift by 1..n-1 so a row never meets its own candidate's photo
+        cols = (rows + rng.integers(1, n, max_impostors)) % n
+        impostor = 1.0 - np.einsum("ij,ij->i", uploads[rows], photos[cols])
+    return genuine, impostor
+
+
+def error_rates(
+    genuine: np.ndarray, impostor: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """FAR and FRR at every value in THRESHOLDS (match when distance <= t)."""
+    far = np.searchsorted(np.sort(impostor), THRESHOLDS, side="right") / len(impostor)
+    frr = 1.0 - np.searchsorted(np.sort(genuine), THRESHOLDS, side="right") / len(
+        genuine
+    )
+    return far, frr
+
+
+def summarize(
+    genuine: np.ndarray, impostor: np.ndarray, target_far: float
+) -> dict[str, float]:
+    far, frr = error_rates(genuine, impostor)
+    eer_idx = int(np.argmin(np.abs(far - frr)))
+    current_far = float(np.mean(impostor <= FACE_MATCH_THRESHOLD))
+    current_frr = float(np.mean(genuine > FACE_MATCH_THRESHOLD))
+    # Largest threshold (fewest false rejects) that keeps FAR within target
+    within = np.nonzero(far <= target_far)[0]
+    target_idx = int(within[-1]) if len(within) else 0
+    return {
+        "genuine_pairs": len(genuine),
+        "impostor_pairs": len(impostor),
+        "threshold": FACE_MATCH_THRESHOLD,
+        "far_at_threshold": current_far,
+        "frr_at_threshold": current_frr,
+        "eer": float((far[eer_idx] + frr[eer_idx]) / 2),
+        "eer_threshold": float(THRESHOLDS[eer_idx]),
+        "target_far": target_far,
+        "threshold_for_target_far": float(THRESHOLDS[target_idx]),
+        "frr_at_target_far": float(frr[target_idx]),
+    }
+
+
+def percentiles(values: list[float]) -> dict[str, float]:
+    if not values:
+        return {"p50_ms": 0.0, "p95_ms": 0.0}
+    ordered = sorted(values)
+    return {
+        "p50_ms": round(statistics.median(ordered), 2),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 2),
+    }
+
+
+def plot_curves(curves: dict[str, tuple[np.ndarray, np.ndarray]], out_dir: str) -> None:
+    try:
+        import matplotlib
+
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+    except ImportError:
+        print("matplotlib not installed - skipping roc.png / det.png")
+        return
+
+    fig, ax = plt.subplots()
+    for name, (far, frr) in curves.items():
+        ax.plot(far, 1 - frr, label=name)
+    ax.set(xscale="log", xlabel="False accept rate", ylabel="True accept rate")
+    ax.legend()
+    fig.savefig(os.path.join(out_dir, "roc.png"), dpi=120)
+
+    fig, ax = plt.subplots()
+    for name, (far, frr) in curves.items():
+        ax.plot(far, frr, label=name)
+    ax.set(
+        xscale="log",
+        yscale="log",
+        xlabel="False accept rate",
+        ylabel="False reject rate",
+    )
+    ax.legend()
+    fig.savefig(os.path.join(out_dir, "det.png"), dpi=120)
+    plt.close("all")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--backend", action="append", choices=EMBEDDING_BACKENDS, dest="backends"
+    )
+    parser.add_argument("--issued-only", action="store_true")
+    parser.add_argument("--limit", type=int, default=None)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--max-impostors", type=int, default=1_000_000)
+    parser.add_argument("--latency-samples", type=int, default=50)
+    parser.add_argument("--target-far", type=float, default=0.001)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cache", default="face_eval_cache.npz")
+    parser.add_argument("--out-dir", default="face_eval")
+    args = parser.parse_args()
+
+    backends = [
+        name
+        for name in (args.backends or EMBEDDING_BACKENDS)
+        if name == "deepface" or os.path.exists(onnx_model_path(name))
+    ]
+    pairs = load_pairs(args.issued_only, args.limit)
+    if not pairs:
+        print("No verification photo pairs found")
+        return 1
+    print(f"{len(pairs)} pairs, backends: {', '.join(backends)}")
+
+    paths = sorted({p for _, u, r in pairs for p in (u, r)})
+    faces, detect_ms = detect_all(paths)
+    print(
+        f"Faces found in {len(faces)}/{len(paths)} images "
+        f"(detection {percentiles(detect_ms)})"
+    )
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    cache = EmbeddingCache(args.cache)
+    summary: dict[str, dict] = {}
+    curves = {}
+    for name in backends:
+        embeddings, batch_ms = embed_all(name, faces, cache, args.batch_size)
+        cache.save()
+        genuine, impostor = score_pairs(
+            pairs, embeddings, args.max_impostors, args.seed
+        )
+        if not len(genuine) or not len(impostor):
+            print(f"{name}: not enough pairs with faces to score")
+            continue
+
+        far, frr = error_rates(genuine, impostor)
+        curves[name] = (far, frr)
+        np.savetxt(
+            os.path.join(args.out_dir, f"roc_{name}.csv"),
+            np.column_stack([THRESHOLDS, far, frr]),
+            delimiter=",",
+            header="threshold,far,frr",
+            comments="",
+            fmt="%.6f",
+        )
+        summary[name] = {
+            **summarize(genuine, impostor, args.target_far),
+            "latency": {
+                "detect_per_image": percentiles(detect_ms),
+                "embed_per_face_batched": percentiles(batch_ms),
+                "embed_single_face": percentiles(
+                    single_face_latency(name, faces, args.latency_samples)
+                ),
+            },
+        }
+
+    print(
+        f"\n{'backend':<12}{'FAR@t':>9}{'FRR@t':>9}{'EER':>8}{'EER t':>8}"
+        f"{'t@FAR':>8}{'FRR@FAR':>9}{'embed1 ms':>11}{'batched ms':>12}"
+    )
+    for name, s in summary.items():
+        latency = s["latency"]
+        print(
+            f"{name:<12}{s['far_at_threshold']:>9.4f}{s['frr_at_threshold']:>9.4f}"
+            f"{s['eer']:>8.4f}{s['eer_threshold']:>8.3f}"
+            f"{s['threshold_for_target_far']:>8.3f}{s['frr_at_target_far']:>9.4f}"
+            f"{latency['embed_single_face']['p50_ms']:>11.2f}"
+            f"{latency['embed_per_face_batched']['p50_ms']:>12.2f}"
+        )
+
+    with open(os.path.join(args.out_dir, "summary.json"), "w") as f:
+        json.dump(
+            {
+                "pairs": len(pairs),
+                "images": len(paths),
+                "images_with_face": len(faces),
+                "cascade": list(FACE_DETECTOR_CASCADE),
+                "backends": summary,
+            },
+            f,
+            indent=2,
+        )
+    plot_curves(curves, args.out_dir)
+    print(f"\nWrote {args.out_dir}/summary.json and roc_<backend>.csv")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
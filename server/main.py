@@ -57,22 +57,51 @@ from routes import region_routes
 
 print(">>> secure_file_serving_routes OK")
 
+print(">>> importing campaign_routes")
+from routes import campaign_routes
+
+print(">>> campaign_routes OK")
+
+print(">>> importing metrics_routes")
+from routes import metrics_routes
+
+print(">>> metrics_routes OK")
+
+print(">>> importing upload_session_routes")
+from routes import upload_session_routes
+
+print(">>> upload_session_routes OK")
+
 
 print(">>> [5] routes imported")
 
 print(">>> [6] importing db connection")
-from db.connection import init_db
+from db.connection import (
+    init_db,
+    dispose_async_engine,
+    get_pool_sizing,
+    LAST_WRITE_COOKIE,
+)
+from db.pool import start_request_tracking, finish_request_tracking
+from db.config import Config as DBConfig
+from services.verification_service.email_templates import email_templates
+from services.verification_service.mobile_notification_service import close_sms_client
+from services.readiness.warmup import run_warmup, readiness_report
 
 print(">>> [7] db connection imported")
 
 print(">>> [8] importing logging config")
 from utils.log_config import LOGGING_CONFIG
+from utils.compression import CompressionMiddleware
+from utils.responses import FastJSONResponse
 
 print(">>> [9] logging config imported")
 
+import asyncio
 import logging
 import logging.config
 import os
+import time
 from dotenv import load_dotenv
 
 print(">>> [10] standard libs imported")
@@ -97,9 +126,20 @@ print(">>> [16] base dirs set")
 async def lifespan(app: FastAPI):
     print(">>> [17] lifespan start - init_db()")
     init_db()
+    sizing = get_pool_sizing()
+    logger.info(
+        f"DB pool: pool_size={sizing.pool_size} max_overflow={sizing.max_overflow} "
+        f"per engine, workers={DBConfig.WEB_CONCURRENCY}"
+    )
+    email_templates.load()
+    # Runs in the background: /health is up immediately, /ready once warm
+    warmup_task = asyncio.create_task(run_warmup())
     print(">>> [18] lifespan yield")
     yield
     print(">>> [19] lifespan shutdown")
+    warmup_task.cancel()
+    await close_sms_client()
+    await dispose_async_engine()
 
 
 print(">>> [20] creating FastAPI app")
@@ -112,6 +152,7 @@ app = FastAPI(
     docs_url=None if ENV == "production" else "/docs",
     redoc_url=None if ENV == "production" else "/redoc",
     openapi_url=None if ENV == "production" else "/openapi.json",
+    default_response_class=FastJSONResponse,
 )
 print(">>> [21] FastAPI app created")
 
@@ -130,6 +171,9 @@ app.add_middleware(
 )
 print(">>> [23] CORS middleware added")
 
+# Large JSON (candidate lists, dashboards) goes out brotli / gzip compressed
+app.add_middleware(CompressionMiddleware)
+
 
 @app.middleware("http")
 async def remove_server_header(
@@ -138,6 +182,49 @@ async def remove_server_header(
     return await call_next(request)
 
 
+WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+INSECURE_COOKIES = os.getenv("INSECURE_COOKIES", "false").lower() == "true"
+
+
+@app.middleware("http")
+async def mark_recent_write(
+    request: Request, call_next: Callable[[Request], Response]
+) -> Response:
+    """Pin the client to the primary for a moment after it writes (read-your-writes)."""
+    response = await call_next(request)
+    if (
+        DBConfig.READ_DATABASE_URL
+        and request.method in WRITE_METHODS
+        and response.status_code < 400
+    ):
+        response.set_cookie(
+            key=LAST_WRITE_COOKIE,
+            value=str(time.time()),
+            httponly=True,
+            secure=not INSECURE_COOKIES,
+            samesite="lax" if INSECURE_COOKIES else "none",
+            path="/",
+            max_age=DBConfig.REPLICA_MAX_LAG_SECONDS,
+        )
+    return response
+
+
+@app.middleware("http")
+async def track_db_usage(
+    request: Request, call_next: Callable[[Request], Response]
+) -> Response:
+    """Per-route query count and DB time, served by /metrics/db."""
+    stats, token = start_request_tracking()
+    try:
+        return await call_next(request)
+    finally:
+        route = request.scope.get("route")
+        route_name = (
+            f"{request.method} {route.path}" if route is not None else "unmatched"
+        )
+        finish_request_tracking(token, route_name, stats)
+
+
 print(">>> [26] middleware registered")
 
 
@@ -146,7 +233,15 @@ async def health_check():
     return {"msg": "I'm alive", "status": "ok"}
 
 
-print(">>> [27] health route registered")
+@app.get("/ready")
+async def readiness_check(response: Response):
+    ready, report = await readiness_report()
+    if not ready:
+        response.status_code = 503
+    return report
+
+
+print(">>> [27] health and ready routes registered")
 
 print(">>> [28] including routers")
 app.include_router(auth_routes.router)
@@ -168,5 +263,8 @@ print(">>> [36] utility_file_routes included")
 app.include_router(secure_file_serving_routes.router)
 print(">>> [37] secure_file_serving_routes included")
 app.include_router(region_routes.router)
+app.include_router(campaign_routes.router)
+app.include_router(metrics_routes.router)
+app.include_router(upload_session_routes.router)
 
 print(">>> [38] main.py import completed")
@@ -12,3 +12,7 @@ from .upgrade_reqests import UpgradeRequest
 from .utilty_files import UtilityFile
 from .regions import Region, RegionUserAssociation
 from .cities import City, StoreCityAssociation
+from .campaigns import Campaign, CampaignRecipient
+from .voucher_codes import VoucherCode
+from .coupon_pool import CouponPoolCode
+from .reference_data_versions import ReferenceDataVersion
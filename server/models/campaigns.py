@@ -0,0 +1,73 @@
+from sqlalchemy import String, Integer, DateTime, Text, ForeignKey, Index
+from sqlalchemy.orm import relationship, mapped_column, Mapped
+
+from datetime import datetime
+from db.base import Base, BaseMixin
+
+
+class Campaign(Base, BaseMixin):
+    """A bulk reminder sent to a filtered set of beneficiaries"""
+
+    __tablename__ = "campaigns"
+
+    name: Mapped[str] = mapped_column(String(150), nullable=False)
+    channel: Mapped[str] = mapped_column(String(20), nullable=False, default="sms")
+    message_template: Mapped[str] = mapped_column(Text, nullable=False)
+
+    # JSON dump of the recipient filters used when the campaign was created
+    filters: Mapped[str] = mapped_column(Text, nullable=True)
+
+    # draft | running | completed | failed
+    status: Mapped[str] = mapped_column(String(20), nullable=False, default="draft")
+
+    total_recipients: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    sent_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    failed_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    created_by: Mapped[str] = mapped_column(
+        String(40),
+        ForeignKey("users.id", ondelete="set null", onupdate="cascade"),
+        nullable=True,
+    )
+    started_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    completed_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+
+    recipients = relationship(
+        "CampaignRecipient", back_populates="campaign", cascade="all, delete-orphan"
+    )
+
+    def __repr__(self):
+        return f"<Campaign {self.id} - {self.status} {self.sent_count}/{self.total_recipients}>"
+
+
+class CampaignRecipient(Base, BaseMixin):
+    """Per-recipient delivery result of a campaign"""
+
+    __tablename__ = "campaign_recipients"
+
+    campaign_id: Mapped[str] = mapped_column(
+        String(40),
+        ForeignKey("campaigns.id", onupdate="cascade", ondelete="cascade"),
+        nullable=False,
+    )
+    candidate_id: Mapped[str] = mapped_column(
+        String(40),
+        ForeignKey("candidates.id", onupdate="cascade", ondelete="cascade"),
+        nullable=False,
+    )
+    destination: Mapped[str] = mapped_column(String(100), nullable=False)
+
+    # pending | sent | failed
+    status: Mapped[str] = mapped_column(String(20), nullable=False, default="pending")
+    provider_message_key: Mapped[str] = mapped_column(String(100), nullable=True)
+    error_message: Mapped[str] = mapped_column(Text, nullable=True)
+    sent_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+
+    campaign = relationship("Campaign", back_populates="recipients")
+
+    __table_args__ = (
+        Index("ix_campaign_recipients_campaign_status", "campaign_id", "status"),
+    )
+
+    def __repr__(self):
+        return f"<CampaignRecipient {self.candidate_id}: {self.status}>"
@@ -0,0 +1,29 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import DateTime, Index, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from db.base import Base
+
+
+class CouponPoolCode(Base):
+    """
+    Every coupon code ever generated. Codes are created in bulk, unique by
+    primary key, and handed out in batches: a process claims a batch by setting
+    reserved_by, then serves it from memory (services/coupons/coupon_pool.py).
+    Rows are never deleted, so a code can never be generated twice.
+    """
+
+    __tablename__ = "coupon_pool"
+
+    code: Mapped[str] = mapped_column(String(15), primary_key=True)
+    reserved_by: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    reserved_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=lambda: datetime.now(timezone.utc), nullable=False
+    )
+
+    __table_args__ = (Index("ix_coupon_pool_reserved_by", "reserved_by"),)
+
+    def __repr__(self):
+        return f"<CouponPoolCode {self.code} reserved_by={self.reserved_by}>"
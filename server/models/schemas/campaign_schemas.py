@@ -0,0 +1,49 @@
+from pydantic import BaseModel, ConfigDict
+from typing import Literal
+from datetime import datetime
+
+
+class CampaignFilters(BaseModel):
+    region_ids: list[str] | None = None
+    store_ids: list[str] | None = None
+    issued_status: Literal["issued", "not_issued"] | None = None
+    is_candidate_verified: bool | None = None
+
+
+class NewCampaignPayload(BaseModel):
+    name: str
+    channel: Literal["sms"] = "sms"
+    # Placeholders: {{ full_name }}, {{ store_name }}, {{ store_address }},
+    # {{ region_name }}, {{ coupon_code }}
+    message_template: str
+    filters: CampaignFilters = CampaignFilters()
+    start_now: bool = True
+
+
+class CampaignOut(BaseModel):
+    id: str
+    name: str
+    channel: str
+    message_template: str
+    filters: str | None = None
+    status: str
+    total_recipients: int
+    sent_count: int
+    failed_count: int
+    created_by: str | None = None
+    created_at: datetime
+    started_at: datetime | None = None
+    completed_at: datetime | None = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class CampaignRecipientOut(BaseModel):
+    candidate_id: str
+    destination: str
+    status: str
+    provider_message_key: str | None = None
+    error_message: str | None = None
+    sent_at: datetime | None = None
+
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,20 @@
+from pydantic import BaseModel, Field
+
+
+class NewUploadSessionPayload(BaseModel):
+    filename: str
+    content_type: str
+    size: int = Field(gt=0)
+    # Hex sha256 of the whole file, checked once the last chunk lands
+    sha256: str = Field(pattern=r"^[0-9a-fA-F]{64}$")
+
+
+class UploadSessionOut(BaseModel):
+    upload_id: str
+    filename: str
+    content_type: str
+    size: int
+    offset: int
+    completed: bool
+    chunk_size: int
+    expires_at: float
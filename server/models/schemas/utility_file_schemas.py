@@ -0,0 +1,13 @@
+from pydantic import BaseModel, ConfigDict
+from datetime import datetime
+
+
+class UtilityFileOut(BaseModel):
+    id: str
+    type: str
+    path: str
+    is_active: bool | None = None
+    created_at: datetime
+    updated_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,128 @@
+from sqlalchemy import (
+    String,
+    ForeignKey,
+    Index,
+    delete,
+    event,
+    insert,
+    inspect,
+    literal,
+    select,
+)
+from sqlalchemy.orm import Mapped, mapped_column
+
+from db.base import Base
+from .candidates import Candidate
+
+# code_type -> Candidate column holding that code. A new kind of code is a new
+# entry here plus a backfill; lookups don't change.
+VOUCHER_CODE_COLUMNS = {
+    "coupon": "coupon_code",
+    "gift_card": "gift_card_code",
+}
+
+
+class VoucherCode(Base):
+    """
+    Every code a beneficiary can present at the counter, in one indexed
+    column. Kept in sync with the Candidate columns by the mapper events below,
+    so any ORM write (API, bulk upload, gift-card scripts) maintains it.
+    """
+
+    __tablename__ = "voucher_codes"
+
+    candidate_id: Mapped[str] = mapped_column(
+        String(40),
+        ForeignKey("candidates.id", ondelete="cascade", onupdate="cascade"),
+        primary_key=True,
+    )
+    code_type: Mapped[str] = mapped_column(String(20), primary_key=True)
+    # Not unique: placeholder gift-card codes have been shared by candidates
+    code: Mapped[str] = mapped_column(String(30), nullable=False)
+
+    __table_args__ = (
+        # Covers the whole lookup: code -> candidate_id without a table read
+        Index("ix_voucher_codes_code_candidate", "code", "candidate_id"),
+    )
+
+    def __repr__(self):
+        return f"<VoucherCode {self.code_type} {self.code} -> {self.candidate_id}>"
+
+
+def _sync_voucher_codes(connection, candidate: Candidate, changed_only: bool):
+    state = inspect(candidate)
+    table = VoucherCode.__table__
+    for code_type, column in VOUCHER_CODE_COLUMNS.items():
+        if changed_only and not state.attrs[column].history.has_changes():
+            continue
+        connection.execute(
+            delete(table).where(
+                table.c.candidate_id == candidate.id, table.c.code_type == code_type
+            )
+        )
+        code = getattr(candidate, column)
+        if code:
+            connection.execute(
+                insert(table).values(
+                    candidate_id=candidate.id, code_type=code_type, code=code
+                )
+            )
+
+
+@event.listens_for(Candidate, "after_insert")
+def _voucher_codes_after_insert(mapper, connection, target):
+    _sync_voucher_codes(connection, target, changed_only=False)
+
+
+@event.listens_for(Candidate, "after_update")
+def _voucher_codes_after_update(mapper, connection, target):
+    _sync_voucher_codes(connection, target, changed_only=True)
+
+
+def resync_voucher_codes(connection, candidate_ids: list[str]) -> None:
+    """Rebuild the rows of these candidates after a Core write (no mapper events)."""
+    table = VoucherCode.__table__
+    candidates = Candidate.__table__
+    connection.execute(delete(table).where(table.c.candidate_id.in_(candidate_ids)))
+    for code_type, column in VOUCHER_CODE_COLUMNS.items():
+        code = candidates.c[column]
+        connection.execute(
+            insert(table).from_select(
+                ["candidate_id", "code_type", "code"],
+                select(candidates.c.id, literal(code_type), code).where(
+                    candidates.c.id.in_(candidate_ids), code.is_not(None), code != ""
+                ),
+            )
+        )
+
+
+def backfill_voucher_codes(connection) -> int:
+    """
+    Add the rows of every candidate code not in voucher_codes yet. Safe to run
+    repeatedly; init_db runs it at startup, so a table create_all made empty
+    (or one that missed a write that bypassed the ORM) is filled before any
+    lookup depends on it.
+    """
+    table = VoucherCode.__table__
+    candidates = Candidate.__table__
+    added = 0
+    for code_type, column in VOUCHER_CODE_COLUMNS.items():
+        code = candidates.c[column]
+        missing = (
+            select(table.c.candidate_id)
+            .where(
+                table.c.candidate_id == candidates.c.id,
+                table.c.code_type == code_type,
+            )
+            .exists()
+        )
+        result = connection.execute(
+            insert(table).from_select(
+                ["candidate_id", "code_type", "code"],
+                select(candidates.c.id, literal(code_type), code).where(
+                    code.is_not(None), code != "", ~missing
+                ),
+            )
+        )
+        added += max(result.rowcount, 0)
+    return added
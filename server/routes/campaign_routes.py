@@ -0,0 +1,74 @@
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Path, status
+from sqlalchemy.orm import Session
+from typing import Annotated
+from db.connection import get_db_conn
+from models.schemas.auth_schemas import UserOut
+from models.schemas.campaign_schemas import NewCampaignPayload
+from services.auth.deps import get_current_user
+from services.campaigns.engine import run_campaign
+from controllers import campaign_controller
+
+router = APIRouter(prefix="/campaigns", tags=["Campaigns"])
+
+
+def _require_admin(current_user: UserOut):
+    if current_user.role != "admin" and current_user.role != "super_admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorised to manage campaigns",
+        )
+
+
+@router.post("", status_code=status.HTTP_201_CREATED)
+async def create_campaign(
+    payload: Annotated[NewCampaignPayload, ""],
+    background_tasks: BackgroundTasks,
+    db: Annotated[Session, Depends(get_db_conn)],
+    current_user: Annotated[UserOut, Depends(get_current_user)],
+):
+    _require_admin(current_user)
+    result = campaign_controller.create_campaign(
+        payload=payload, db=db, current_user=current_user
+    )
+    if payload.start_now and result.total_recipients > 0:
+        campaign_controller.get_campaign_for_start(campaign_id=result.id, db=db)
+        background_tasks.add_task(run_campaign, result.id)
+    return {"msg": "Campaign created", "data": result}
+
+
+@router.post("/{campaign_id}/start", status_code=status.HTTP_202_ACCEPTED)
+async def start_campaign(
+    campaign_id: Annotated[str, Path(title="Campaign ID")],
+    background_tasks: BackgroundTasks,
+    db: Annotated[Session, Depends(get_db_conn)],
+    current_user: Annotated[UserOut, Depends(get_current_user)],
+):
+    """
+    Start a draft campaign, or resume one that stopped with pending recipients
+    (including a "running" one whose run died, see CAMPAIGN_STALE_SECONDS).
+    """
+    _require_admin(current_user)
+    campaign_controller.get_campaign_for_start(campaign_id=campaign_id, db=db)
+    background_tasks.add_task(run_campaign, campaign_id)
+    return {"msg": "Campaign started"}
+
+
+@router.get("", status_code=status.HTTP_200_OK)
+async def get_all_campaigns(
+    db: Annotated[Session, Depends(get_db_conn)],
+    current_user: Annotated[UserOut, Depends(get_current_user)],
+):
+    _require_admin(current_user)
+    result = campaign_controller.get_all_campaigns(db=db)
+    return {"msg": "Campaigns fetched", "data": result}
+
+
+@router.get("/{campaign_id}", status_code=status.HTTP_200_OK)
+async def get_campaign_details(
+    campaign_id: Annotated[str, Path(title="Campaign ID")],
+    db: Annotated[Session, Depends(get_db_conn)],
+    current_user: Annotated[UserOut, Depends(get_current_user)],
+):
+    _require_admin(current_user)
+    result = campaign_controller.get_campaign_details(campaign_id=campaign_id, db=db)
+    return {"msg": "Campaign fetched", "data": result}
@@ -7,11 +7,12 @@ from fastapi import (
     UploadFile,
     File,
     Path,
+    Response,
 )
 from sqlalchemy.orm import Session
 from typing import Annotated, Literal
 
-from db.connection import get_db_conn
+from db.connection import get_db_conn, get_read_db
 from models.schemas.candidate_schemas import (
     NewCandidatePayload,
     CandidatesSearchParams,
@@ -33,9 +34,23 @@ from controllers.candidates_controller import (
 from controllers.store_controller import get_store_of_user
 from models.schemas.auth_schemas import UserOut
 from services.auth.deps import get_current_user
+from services.reference_data.etags import etag_for
+from utils.responses import json_response
 
 router = APIRouter(prefix="/candidates", tags=["Candidates"])
 
+# What the candidate lists are built from, for their ETags
+CANDIDATE_LIST_TABLES = (
+    "candidates",
+    "issued_statuses",
+    "verification_statuses",
+    "upgrade_requests",
+    "users",
+    "stores",
+    "cities",
+    "regions",
+)
+
 
 # ✅ Add a new candidate
 @router.post("", status_code=status.HTTP_201_CREATED)
@@ -102,9 +117,14 @@ async def upload_candidate_photo(
 
 
 # ✅ Get all candidates (with optional search)
-@router.get("", status_code=status.HTTP_200_OK)
+@router.get(
+    "",
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(etag_for(*CANDIDATE_LIST_TABLES))],
+)
 async def list_candidates(
-    db: Annotated[Session, Depends(get_db_conn)],
+    response: Response,
+    db: Annotated[Session, Depends(get_read_db)],
     current_user: Annotated[UserOut, Depends(get_current_user)],
     search_by: Annotated[
         Literal["id", "full_name"] | None,
@@ -161,13 +181,17 @@ async def list_candidates(
         upgrade_request=upgrade_request,
         distribution_location=distribution_location,
     )
-    return get_all_candidates(db, params, current_user)
+    return json_response(get_all_candidates(db, params, current_user), response)
 
 
 # ✅ Get all candidates belonging to a specific store
-@router.get("/store", status_code=status.HTTP_200_OK)
+@router.get(
+    "/store",
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(etag_for(*CANDIDATE_LIST_TABLES))],
+)
 async def list_candidates_of_store(
-    db: Annotated[Session, Depends(get_db_conn)],
+    db: Annotated[Session, Depends(get_read_db)],
     current_user: Annotated[UserOut, Depends(get_current_user)],
     search_by: Annotated[
         Literal["id", "full_name"] | None,
@@ -4,9 +4,11 @@ from sqlalchemy import text, select, and_, func, case
 import pandas as pd
 from typing import Annotated
 from sqlalchemy.orm import Session
-from db.connection import get_db_conn
+from sqlalchemy.ext.asyncio import AsyncSession
+from db.connection import get_read_db, get_async_read_db
 from models.schemas.auth_schemas import UserOut
 from services.auth.deps import get_current_user
+from services.reference_data.etags import etag_for
 import os
 from datetime import datetime
 from controllers.dashboard_controller import (
@@ -19,7 +21,7 @@ from controllers.dashboard_controller import (
 )
 from models import Candidate, IssuedStatus, Store
 
-from controllers.store_controller import get_store_of_user
+from controllers.store_controller import get_store_of_user_async
 
 BASE_SERVER_DIR = os.getenv("BASE_SERVER_DIR")
 BASE_CSV_UPLOAD_DIR = os.path.join("downloads")
@@ -27,11 +29,22 @@ os.makedirs(BASE_CSV_UPLOAD_DIR, exist_ok=True)
 
 router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
 
+# What the dashboard statistics are built from, for their ETags
+STATS_TABLES = (
+    "candidates",
+    "issued_statuses",
+    "verification_statuses",
+    "upgrade_requests",
+    "users",
+    "stores",
+    "cities",
+)
+
 
 # ✅ Get all candidates (with optional search)
 @router.get("/download/candidates", status_code=status.HTTP_200_OK)
 async def download_candidates_data(
-    db: Annotated[Session, Depends(get_db_conn)],
+    db: Annotated[Session, Depends(get_read_db)],
     current_user: Annotated[UserOut, Depends(get_current_user)],
 ):
     if current_user.role not in {"admin", "super_admin"}:
@@ -102,7 +115,7 @@ async def download_candidates_data(
 # ✅ Get all candidates (with optional search)
 @router.get("/download/store-allotment", status_code=status.HTTP_200_OK)
 async def download_store_allotment_data(
-    db: Annotated[Session, Depends(get_db_conn)],
+    db: Annotated[Session, Depends(get_read_db)],
     current_user: Annotated[UserOut, Depends(get_current_user)],
 ):
     if current_user.role not in {"admin", "super_admin"}:
@@ -152,13 +165,13 @@ async def download_store_allotment_data(
     )
 
 
-@router.get("/stats/brief")
+@router.get("/stats/brief", dependencies=[Depends(etag_for(*STATS_TABLES))])
 async def get_brief_stats(
-    db: Annotated[Session, Depends(get_db_conn)],
+    db: Annotated[AsyncSession, Depends(get_async_read_db)],
     current_user: Annotated[UserOut, Depends(get_current_user)],
 ):
     try:
-        result = get_laptop_issuance_stats_of_all(db)
+        result = await get_laptop_issuance_stats_of_all(db)
         return {"data": result, "msg": "Fetched the stats successfully"}
     except Exception as e:
         print(f"IN DASHROUTE {e}")
@@ -168,20 +181,24 @@ async def get_brief_stats(
         )
 
 
-@router.get("/stats/role-based", status_code=status.HTTP_200_OK)
+@router.get(
+    "/stats/role-based",
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(etag_for(*STATS_TABLES))],
+)
 async def get_role_based_stats(
-    db: Annotated[Session, Depends(get_db_conn)],
+    db: Annotated[AsyncSession, Depends(get_async_read_db)],
     current_user: Annotated[UserOut, Depends(get_current_user)],
 ):
     """Get dashboard statistics based on user role"""
 
     if current_user.role in ["admin", "super_admin"]:
-        stats = get_admin_dashboard_stats(db)
+        stats = await get_admin_dashboard_stats(db)
     elif current_user.role == "store_agent":
-        store = get_store_of_user(db, current_user)
-        stats = get_store_agent_dashboard_stats(db, store.id)
+        store = await get_store_of_user_async(db, current_user)
+        stats = await get_store_agent_dashboard_stats(db, store.id)
     elif current_user.role == "registration_officer":
-        stats = get_registration_officer_dashboard_stats(db, current_user)
+        stats = await get_registration_officer_dashboard_stats(db, current_user)
     else:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN, detail="Access denied"
@@ -190,10 +207,14 @@ async def get_role_based_stats(
     return {"msg": "Dashboard statistics retrieved", "data": stats}
 
 
-@router.get("/stats/region-wise/{region_id}", status_code=status.HTTP_200_OK)
+@router.get(
+    "/stats/region-wise/{region_id}",
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(etag_for(*STATS_TABLES))],
+)
 async def get_region_wise_stats(
     region_id: str,
-    db: Annotated[Session, Depends(get_db_conn)],
+    db: Annotated[AsyncSession, Depends(get_async_read_db)],
     current_user: Annotated[UserOut, Depends(get_current_user)],
 ):
     """Get dashboard statistics for a specific region"""
@@ -202,7 +223,7 @@ async def get_region_wise_stats(
             status_code=status.HTTP_403_FORBIDDEN, detail="Access denied"
         )
     try:
-        stats = get_region_wise_dashboard_stats(db, region_id)
+        stats = await get_region_wise_dashboard_stats(db, region_id)
         return {"msg": "Region statistics retrieved successfully", "data": stats}
     except Exception as e:
         raise HTTPException(
@@ -213,7 +234,7 @@ async def get_region_wise_stats(
 
 @router.get("/registration_office-locations")
 async def list_registration_office_locations(
-    db: Annotated[Session, Depends(get_db_conn)],
+    db: Annotated[Session, Depends(get_read_db)],
     current_user: Annotated[UserOut, Depends(get_current_user)],
 ):
     if current_user.role not in ["admin", "super_admin", "registration_officer"]:
@@ -0,0 +1,54 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Annotated
+from dataclasses import asdict
+from db.config import Config
+from db.connection import get_pool_sizing
+from db.pool import all_pool_metrics, route_metrics
+from models.schemas.auth_schemas import UserOut
+from services.auth.deps import get_current_user
+from services.verification_service.face_metrics import face_metrics
+from services.verification_service.face_runtime import load_timings
+
+router = APIRouter(prefix="/metrics", tags=["Metrics"])
+
+
+@router.get("/db", status_code=status.HTTP_200_OK)
+async def get_db_metrics(
+    current_user: Annotated[UserOut, Depends(get_current_user)],
+):
+    """Connection-pool state and per-route query counts / DB time of this worker."""
+    if current_user.role not in ["admin", "super_admin"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Access denied"
+        )
+    return {
+        "msg": "DB metrics fetched",
+        "data": {
+            "pool_settings": {
+                **asdict(get_pool_sizing()),
+                "pool_timeout": Config.POOL_TIMEOUT,
+                "pool_recycle": Config.POOL_RECYCLE,
+                "workers": Config.WEB_CONCURRENCY,
+            },
+            "pools": all_pool_metrics(),
+            "routes": route_metrics(),
+        },
+    }
+
+
+@router.get("/face", status_code=status.HTTP_200_OK)
+async def get_face_metrics(
+    current_user: Annotated[UserOut, Depends(get_current_user)],
+):
+    """Per-stage timings and outcomes of the face pipeline in this worker."""
+    if current_user.role not in ["admin", "super_admin"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Access denied"
+        )
+    return {
+        "msg": "Face pipeline metrics fetched",
+        "data": {
+            "load_timings": {k: round(v, 3) for k, v in load_timings.items()},
+            "stages": face_metrics.snapshot(),
+        },
+    }
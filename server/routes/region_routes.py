@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, status, Query
 from sqlalchemy.orm import Session
 
-from db.connection import get_db_conn
+from db.connection import get_db_conn, get_read_db
 from models.schemas.region_schemas import RegionOutSchema, NewRegionSchema
 from controllers.region_controller import create_new_region, get_all_regions
 from typing import Annotated
@@ -33,7 +33,7 @@ def create_region(
     status_code=status.HTTP_200_OK,
 )
 def list_regions(
-    db: Annotated[Session, Depends(get_db_conn)],
+    db: Annotated[Session, Depends(get_read_db)],
     current_user: Annotated[UserOut, Depends(get_current_user)],
     name: Annotated[str | None, Query(...)] = None,
 ):
@@ -8,7 +8,7 @@ from controllers.bulk_upload_controller import (
 )
 import io
 from sqlalchemy.orm import Session
-from db.connection import get_db_conn
+from db.connection import get_db_conn, get_read_db
 from models.schemas.store_schemas import (
     AddNewStore,
     StoreSearchParams,
@@ -27,6 +27,7 @@ from typing import Annotated, Literal
 from models.schemas.auth_schemas import UserOut
 
 from services.auth.deps import get_current_user
+from services.reference_data.etags import etag_for
 
 router = APIRouter(prefix="/stores", tags=["Stores"])
 
@@ -50,9 +51,24 @@ async def create_store(
     return {"message": "Store created successfully", "data": new_store}
 
 
-@router.get("", status_code=status.HTTP_200_OK)
+@router.get(
+    "",
+    status_code=status.HTTP_200_OK,
+    dependencies=[
+        Depends(
+            etag_for(
+                "stores",
+                "cities",
+                "users",
+                "regions",
+                "candidates",
+                "issued_statuses",
+            )
+        )
+    ],
+)
 async def list_stores(
-    db: Annotated[Session, Depends(get_db_conn)],
+    db: Annotated[Session, Depends(get_read_db)],
     current_user: Annotated[UserOut, Depends(get_current_user)],
     search_by: Annotated[
         Literal["city", "name"] | None,
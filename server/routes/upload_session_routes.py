@@ -0,0 +1,105 @@
+from fastapi import APIRouter, Depends, Header, HTTPException, Path, Request, status
+from typing import Annotated
+
+from models.schemas.auth_schemas import UserOut
+from models.schemas.upload_session_schemas import (
+    NewUploadSessionPayload,
+    UploadSessionOut,
+)
+from services.auth.deps import get_current_user
+from services.uploads.upload_sessions import (
+    UPLOAD_CHUNK_MAX_BYTES,
+    append_upload_chunk,
+    create_upload_session,
+    delete_upload_session,
+    get_upload_session,
+)
+
+router = APIRouter(prefix="/upload-sessions", tags=["Upload Sessions"])
+
+
+def _require_store_user(current_user: UserOut):
+    if current_user.role not in ["super_admin", "store_agent"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Access denied"
+        )
+
+
+@router.post("", status_code=status.HTTP_201_CREATED)
+async def open_upload_session(
+    payload: NewUploadSessionPayload,
+    current_user: Annotated[UserOut, Depends(get_current_user)],
+):
+    """Start a resumable upload; send chunks with PATCH /upload-sessions/{id}."""
+    _require_store_user(current_user)
+    session = await create_upload_session(
+        user_id=current_user.id,
+        filename=payload.filename,
+        content_type=payload.content_type,
+        size=payload.size,
+        sha256=payload.sha256,
+    )
+    return {
+        "msg": "Upload session created",
+        "data": UploadSessionOut(**session.out()),
+    }
+
+
+@router.get("/{upload_id}")
+async def get_upload_session_status(
+    upload_id: Annotated[str, Path(...)],
+    current_user: Annotated[UserOut, Depends(get_current_user)],
+):
+    """Where to resume: `offset` is the number of bytes already stored."""
+    _require_store_user(current_user)
+    session = await get_upload_session(upload_id, current_user.id)
+    return {"msg": "Upload session fetched", "data": UploadSessionOut(**session.out())}
+
+
+@router.patch("/{upload_id}")
+async def upload_chunk(
+    request: Request,
+    upload_id: Annotated[str, Path(...)],
+    upload_offset: Annotated[int, Header(alias="Upload-Offset", ge=0)],
+    current_user: Annotated[UserOut, Depends(get_current_user)],
+    chunk_sha256: Annotated[str | None, Header(alias="Upload-Chunk-Sha256")] = None,
+):
+    """
+    Raw chunk bytes as the body, written at Upload-Offset. A 409 carries the
+    offset to resume from; the session is complete once offset == size.
+    """
+    _require_store_user(current_user)
+    too_large = HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"Chunks are limited to {UPLOAD_CHUNK_MAX_BYTES} bytes.",
+    )
+    if int(request.headers.get("content-length") or 0) > UPLOAD_CHUNK_MAX_BYTES:
+        raise too_large
+    # Chunked transfer-encoding has no Content-Length; count what arrives
+    chunk = bytearray()
+    async for part in request.stream():
+        chunk += part
+        if len(chunk) > UPLOAD_CHUNK_MAX_BYTES:
+            raise too_large
+    chunk = bytes(chunk)
+    if not chunk:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Empty chunk."
+        )
+    session = await append_upload_chunk(
+        upload_id, current_user.id, upload_offset, chunk, chunk_sha256
+    )
+    return {
+        "msg": "Upload complete" if session.completed else "Chunk stored",
+        "data": UploadSessionOut(**session.out()),
+    }
+
+
+@router.delete("/{upload_id}")
+async def cancel_upload_session(
+    upload_id: Annotated[str, Path(...)],
+    current_user: Annotated[UserOut, Depends(get_current_user)],
+):
+    _require_store_user(current_user)
+    await delete_upload_session(upload_id, current_user.id)
+    return {"msg": "Upload session deleted"}
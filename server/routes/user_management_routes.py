@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 from typing import Annotated, Literal
 
-from db.connection import get_db_conn
+from db.connection import get_db_conn, get_read_db
 from models.schemas.auth_schemas import (
     AdminCreateUserRequest,
     AdminUpdateUserRequest,
@@ -58,7 +58,7 @@ async def create_user(
 
 @router.get("", status_code=status.HTTP_200_OK)
 async def get_all_users(
-    db: Annotated[Session, Depends(get_db_conn)],
+    db: Annotated[Session, Depends(get_read_db)],
     current_user: Annotated[UserOut, Depends(require_admin)],
     # ---- Search ----
     search_by: Annotated[
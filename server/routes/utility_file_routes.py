@@ -15,6 +15,7 @@ from sqlalchemy.orm import Session
 from typing import Annotated, Literal
 from db.connection import get_db_conn
 from services.auth.deps import get_current_user
+from services.reference_data.etags import etag_for
 from models.schemas.auth_schemas import UserOut
 from controllers.utility_files_controller import (
     save_utility_files,
@@ -28,7 +29,11 @@ from utils.helpers import normalize_path
 router = APIRouter(prefix="/utility_files", tags=["Utility Files"])
 
 
-@router.get("/all", status_code=status.HTTP_200_OK)
+@router.get(
+    "/all",
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(etag_for("utility_files"))],
+)
 def fetch_all_utility_files(
     db: Annotated[Session, Depends(get_db_conn)],
     current_user: Annotated[UserOut, Depends(get_current_user)],
@@ -11,7 +11,7 @@ from fastapi import (
 )
 from sqlalchemy.orm import Session
 from typing import Annotated, Literal
-from db.connection import get_db_conn
+from db.connection import get_db_conn, get_read_db
 from models.schemas import vendor_schemas
 from models.schemas.auth_schemas import UserOut
 from models.schemas.vendor_schemas import VendorSearchParams, VendorSpocSearchParams
@@ -43,7 +43,7 @@ async def create_vendor(
 
 @router.get("", status_code=status.HTTP_200_OK)
 async def get_all_vendors(
-    db: Annotated[Session, Depends(get_db_conn)],
+    db: Annotated[Session, Depends(get_read_db)],
     current_user: Annotated[UserOut, Depends(get_current_user)],
     # ---- Search ----
     search_by: Annotated[
@@ -157,7 +157,7 @@ async def update_vendor_spoc(
 
 @router.get("/spoc", status_code=status.HTTP_200_OK)
 async def get_all_vendors_spoc(
-    db: Annotated[Session, Depends(get_db_conn)],
+    db: Annotated[Session, Depends(get_read_db)],
     current_user: Annotated[UserOut, Depends(get_current_user)],
     # ---- Search ----
     search_by: Annotated[
@@ -1,5 +1,6 @@
 from controllers.candidates_controller import (
     get_candidate_by_id,
+    get_candidate_by_id_async,
     get_candidate_details_by_coupon_code,
 )
 from controllers.verification_controller import (
@@ -12,17 +13,21 @@ from controllers.verification_controller import (
     candidate_verification_consolidate,
     override_verification_process,
     get_latest_issuer_details,
+    load_issuance_context,
+    load_issuance_context_async,
     request_new_upgrade,
     close_upgrade_request,
     procees_with_no_upgrade,
     get_upgrade_details,
 )
-from controllers.store_controller import get_store_of_user
-from utils.helpers import save_image_file
+from controllers.store_controller import get_store_of_user, get_store_of_user_async
+from utils.helpers import remove_uploaded_files, save_image_file
+from utils.storage import run_io
+from services.uploads.upload_sessions import save_image_from_upload_session
 from models.verification_statuses import VerificationStatus
 
 
-from db.connection import get_db_conn
+from db.connection import get_db_conn, get_async_db
 from services.auth.deps import get_current_user
 from models.schemas.auth_schemas import UserOut
 from models.schemas.otp_schemas import OtpVerifyRequest
@@ -39,13 +44,68 @@ from fastapi import (
     Form,
 )
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from typing import Annotated
+import asyncio
+from functools import partial
+from typing import Annotated, Awaitable, Callable
 from pydantic import BaseModel
 
 router = APIRouter(prefix="/verify", tags=["Verification"])
 
 
+def _save_issuance_photo(
+    store_id: str,
+    candidate_id: str,
+    user_id: str,
+    prefix: str,
+    photo: UploadFile | None,
+    upload_id: str | None,
+) -> Callable[[], Awaitable[str]]:
+    """
+    The (not yet started) save of a multipart photo or a completed upload
+    session. A missing photo is rejected here, before any save begins.
+    """
+    if upload_id:
+        return partial(
+            save_image_from_upload_session,
+            store_id=store_id,
+            upload_id=upload_id,
+            user_id=user_id,
+            candidate_id=candidate_id,
+            isLaptopIssuance=True,
+            prefix=prefix,
+        )
+    if photo:
+        return partial(
+            save_image_file,
+            store_id=store_id,
+            photo=photo,
+            candidate_id=candidate_id,
+            isLaptopIssuance=True,
+            prefix=prefix,
+        )
+    raise HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail=f"{'Bill' if prefix == 'bill' else 'Laptop'} photo is required.",
+    )
+
+
+async def _save_issuance_photos(saves: list[Callable[[], Awaitable[str]]]) -> list[str]:
+    """
+    Run the saves concurrently on the upload I/O pool. If any fails, the files
+    the others wrote are removed and the first error is raised.
+    """
+    results = await asyncio.gather(*(save() for save in saves), return_exceptions=True)
+    errors = [r for r in results if isinstance(r, BaseException)]
+    if errors:
+        written = [r for r in results if isinstance(r, str)]
+        if written:
+            await run_io(remove_uploaded_files, written)
+        raise errors[0]
+    return results
+
+
 class AadharVerifyRequest(BaseModel):
     aadhar_number: str
 
@@ -81,7 +141,7 @@ async def get_laptop_issuance_details(
 
 @router.post("/otp/candidate/{candidate_id}")
 async def verify_candidate_via_otp(
-    db: Annotated[Session, Depends(get_db_conn)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
     current_user: Annotated[UserOut, Depends(get_current_user)],
     candidate_id: Annotated[str, Path(title="Candidate ID")],
     input_otp: Annotated[OtpVerifyRequest, ""],
@@ -96,8 +156,8 @@ async def verify_candidate_via_otp(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Unauthorised to verify candidates",
             )
-        store = get_store_of_user(db=db, user=current_user)
-        candidate = get_candidate_by_id(candidate_id=candidate_id, db=db)
+        store = await get_store_of_user_async(db=db, user=current_user)
+        candidate = await get_candidate_by_id_async(candidate_id=candidate_id, db=db)
         if candidate.store_id != store.id:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -118,7 +178,7 @@ async def verify_candidate_via_otp(
 
 @router.post("/otp/re-send/candidate/{candidate_id}")
 async def resend_candidate_otp(
-    db: Annotated[Session, Depends(get_db_conn)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
     current_user: Annotated[UserOut, Depends(get_current_user)],
     candidate_id: Annotated[str, Path(title="Candidate ID")],
 ):
@@ -132,8 +192,8 @@ async def resend_candidate_otp(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Unauthorised to resend candidate OTP",
             )
-        store = get_store_of_user(db=db, user=current_user)
-        candidate = get_candidate_by_id(candidate_id=candidate_id, db=db)
+        store = await get_store_of_user_async(db=db, user=current_user)
+        candidate = await get_candidate_by_id_async(candidate_id=candidate_id, db=db)
         if candidate.store_id != store.id:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -152,7 +212,7 @@ async def resend_candidate_otp(
 
 @router.post("/otp/send/to_admin/candidate/{candidate_id}")
 async def send_otp_to_admin(
-    db: Annotated[Session, Depends(get_db_conn)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
     current_user: Annotated[UserOut, Depends(get_current_user)],
     candidate_id: Annotated[str, Path(title="Candidate ID")],
 ):
@@ -166,8 +226,8 @@ async def send_otp_to_admin(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Unauthorised to resend candidate OTP",
             )
-        store = get_store_of_user(db=db, user=current_user)
-        candidate = get_candidate_by_id(candidate_id=candidate_id, db=db)
+        store = await get_store_of_user_async(db=db, user=current_user)
+        candidate = await get_candidate_by_id_async(candidate_id=candidate_id, db=db)
         if candidate.store_id != store.id:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -366,39 +426,43 @@ async def add_laptop_issuace_reciept(
 
 @router.post("/laptop-issuance/candidate/{candidate_id}")
 async def issue_candidate_laptop(
-    db: Annotated[Session, Depends(get_db_conn)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
     current_user: Annotated[UserOut, Depends(get_current_user)],
     candidate_id: Annotated[str, Path(title="Candidate ID")],
     laptop_serial: Annotated[str, Form(...), ""],
     store_employee_name: Annotated[str, Form(...), ""],
     store_employee_mobile: Annotated[str, Form(...), ""],
-    evidence_photo: Annotated[UploadFile, File(...)],
-    bill_photo: Annotated[UploadFile, File(title="Laptop Bill / Reciept Photo")],
+    evidence_photo: Annotated[UploadFile | None, File()] = None,
+    bill_photo: Annotated[
+        UploadFile | None, File(title="Laptop Bill / Reciept Photo")
+    ] = None,
     store_employee_photo: Annotated[
         UploadFile | None, File(title="store employee who is issuing the laptop")
     ] = None,
+    # Completed /upload-sessions ids, instead of the multipart photos
+    evidence_upload_id: Annotated[str | None, Form()] = None,
+    bill_upload_id: Annotated[str | None, Form()] = None,
+    store_employee_upload_id: Annotated[str | None, Form()] = None,
 ):
-    import asyncio
-
     try:
         if current_user.role != "store_agent" and current_user.role != "super_admin":
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Unauthorised to view candidate verification status",
             )
-        store = get_store_of_user(db=db, user=current_user)
-        candidate = get_candidate_by_id(candidate_id=candidate_id, db=db)
+        # Candidate, store, verification, issuance and latest issuer in one query
+        context = await load_issuance_context_async(
+            db=db, candidate_id=candidate_id, user=current_user
+        )
+        store = context.store
+        candidate = context.candidate
 
         if candidate.store_id != store.id:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Beneficiary Employee is not allotted to this store. Please check the candidate allotted store properly.",
             )
-        verification_status = db.scalar(
-            select(VerificationStatus).where(
-                VerificationStatus.candidate_id == candidate.id
-            )
-        )
+        verification_status = context.verification
         if not verification_status:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -426,43 +490,52 @@ async def issue_candidate_laptop(
                 detail="Beneficiary Employee has not been OTP verified yet",
             )
 
-        latest_issuer = get_latest_issuer_details(db=db, store_user_id=current_user.id)
-        store_employee_photo_url = None
-        if store_employee_photo:
-            store_employee_photo_url = await save_image_file(
-                store_id=store.id,
-                photo=store_employee_photo,
-                candidate_id=candidate_id,
-                isLaptopIssuance=True,
-                prefix="employee",
-            )
-        elif latest_issuer:
-            store_employee_photo_url = latest_issuer.store_employee_photo
-
-        else:
+        latest_issuer = context.latest_issuer
+        has_employee_photo = bool(store_employee_photo or store_employee_upload_id)
+        if not has_employee_photo and not latest_issuer:
             raise HTTPException(
                 status_code=400,
                 detail="Store employee photo required for first issuance",
             )
 
+        saves = [
+            _save_issuance_photo(
+                store.id,
+                candidate_id,
+                current_user.id,
+                "bill",
+                bill_photo,
+                bill_upload_id,
+            ),
+            _save_issuance_photo(
+                store.id,
+                candidate_id,
+                current_user.id,
+                "laptop",
+                evidence_photo,
+                evidence_upload_id,
+            ),
+        ]
+        if has_employee_photo:
+            saves.append(
+                _save_issuance_photo(
+                    store.id,
+                    candidate_id,
+                    current_user.id,
+                    "employee",
+                    store_employee_photo,
+                    store_employee_upload_id,
+                )
+            )
         (
             bill_photo_url,
             evidence_photo_url,
-        ) = await asyncio.gather(
-            save_image_file(
-                store_id=store.id,
-                photo=bill_photo,
-                candidate_id=candidate_id,
-                isLaptopIssuance=True,
-                prefix="bill",
-            ),
-            save_image_file(
-                store_id=store.id,
-                photo=evidence_photo,
-                candidate_id=candidate_id,
-                isLaptopIssuance=True,
-                prefix="laptop",
-            ),
+            *employee_photo_url,
+        ) = await _save_issuance_photos(saves)
+        store_employee_photo_url = (
+            employee_photo_url[0]
+            if employee_photo_url
+            else latest_issuer.store_employee_photo
         )
 
         if not store_employee_photo_url:
@@ -482,9 +555,9 @@ async def issue_candidate_laptop(
 
         issuance_result = await upload_laptop_issuance_details(
             payload=payload,
-            candidate_id=candidate_id,
             db=db,
             user_id=current_user.id,
+            context=context,
         )
         return {"msg": "Laptop issuance recorded successfully", "data": issuance_result}
     except HTTPException:
@@ -504,7 +577,7 @@ async def consolidate_verification_of_candidate(
     coupon_code: Annotated[str, Form(...)],
     photo: Annotated[UploadFile, File(...)],
     aadhar_number: Annotated[str, Form(...)],
-    db: Annotated[Session, Depends(get_db_conn)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
     current_user: Annotated[UserOut, Depends(get_current_user)],
 ):
     try:
@@ -514,7 +587,7 @@ async def consolidate_verification_of_candidate(
                 detail="Unauthorized to verify beneficiary",
             )
 
-        store = get_store_of_user(db=db, user=current_user)
+        store = await get_store_of_user_async(db=db, user=current_user)
 
         uploaded_img_path = await save_image_file(
             store_id=store.id, photo=photo, isVerify=True, candidate_id=coupon_code
@@ -615,14 +688,10 @@ def request_for_upgrade_later(
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN, detail="Access Denied"
             )
-        store = get_store_of_user(db=db, user=current_user)
-        if not store:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN, detail="Store not found for user"
-            )
-        return request_new_upgrade(
-            candidate_id=candidate_id, db=db, store=store, payload=payload
+        context = load_issuance_context(
+            db=db, candidate_id=candidate_id, user=current_user
         )
+        return request_new_upgrade(context=context, db=db, payload=payload)
     except HTTPException:
         raise
     except Exception as e:
@@ -643,14 +712,10 @@ def request_for_upgrade_now(
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN, detail="Access Denied"
             )
-        store = get_store_of_user(db=db, user=current_user)
-        if not store:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN, detail="Store not found for user"
-            )
-        return request_new_upgrade(
-            candidate_id=candidate_id, db=db, store=store, payload=None
+        context = load_issuance_context(
+            db=db, candidate_id=candidate_id, user=current_user
         )
+        return request_new_upgrade(context=context, db=db, payload=None)
     except HTTPException:
         raise
     except Exception as e:
@@ -670,33 +735,35 @@ async def confirm_and_submit_upgrade(
     cost_of_upgrade: Annotated[int, Form(...), ""],
     store_employee_name: Annotated[str, Form(...), ""],
     store_employee_mobile: Annotated[str, Form(...), ""],
-    evidence_photo: Annotated[UploadFile, File(...)],
-    bill_photo: Annotated[UploadFile, File(title="Laptop Bill / Reciept Photo")],
+    evidence_photo: Annotated[UploadFile | None, File()] = None,
+    bill_photo: Annotated[
+        UploadFile | None, File(title="Laptop Bill / Reciept Photo")
+    ] = None,
     store_employee_photo: Annotated[
         UploadFile | None, File(title="store employee who is issuing the laptop")
     ] = None,
+    # Completed /upload-sessions ids, instead of the multipart photos
+    evidence_upload_id: Annotated[str | None, Form()] = None,
+    bill_upload_id: Annotated[str | None, Form()] = None,
+    store_employee_upload_id: Annotated[str | None, Form()] = None,
 ):
-    import asyncio
-
     try:
         if current_user.role != "store_agent" and current_user.role != "super_admin":
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Unauthorised to view candidate verification status",
             )
-        store = get_store_of_user(db=db, user=current_user)
-
-        candidate = db.get(Candidate, candidate_id)
-        if not candidate:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="Beneficiary not found"
-            )
+        context = load_issuance_context(
+            db=db, candidate_id=candidate_id, user=current_user
+        )
+        store = context.store
+        candidate = context.candidate
         if candidate.store_id != store.id:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Beneficiary not assigned to this store",
             )
-        verification_status = candidate.verification_status
+        verification_status = context.verification
         if not verification_status:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -720,43 +787,52 @@ async def confirm_and_submit_upgrade(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Beneficiary Employee has not been facially verified yet",
             )
-        latest_issuer = get_latest_issuer_details(db=db, store_user_id=current_user.id)
-        store_employee_photo_url = None
-        if store_employee_photo:
-            store_employee_photo_url = await save_image_file(
-                store_id=store.id,
-                photo=store_employee_photo,
-                candidate_id=candidate_id,
-                isLaptopIssuance=True,
-                prefix="employee",
-            )
-        elif latest_issuer:
-            store_employee_photo_url = latest_issuer.store_employee_photo
-
-        else:
+        latest_issuer = context.latest_issuer
+        has_employee_photo = bool(store_employee_photo or store_employee_upload_id)
+        if not has_employee_photo and not latest_issuer:
             raise HTTPException(
                 status_code=400,
                 detail="Store employee photo required for first issuance",
             )
 
+        saves = [
+            _save_issuance_photo(
+                store.id,
+                candidate_id,
+                current_user.id,
+                "bill",
+                bill_photo,
+                bill_upload_id,
+            ),
+            _save_issuance_photo(
+                store.id,
+                candidate_id,
+                current_user.id,
+                "laptop",
+                evidence_photo,
+                evidence_upload_id,
+            ),
+        ]
+        if has_employee_photo:
+            saves.append(
+                _save_issuance_photo(
+                    store.id,
+                    candidate_id,
+                    current_user.id,
+                    "employee",
+                    store_employee_photo,
+                    store_employee_upload_id,
+                )
+            )
         (
             bill_photo_url,
             evidence_photo_url,
-        ) = await asyncio.gather(
-            save_image_file(
-                store_id=store.id,
-                photo=bill_photo,
-                candidate_id=candidate_id,
-                isLaptopIssuance=True,
-                prefix="bill",
-            ),
-            save_image_file(
-                store_id=store.id,
-                photo=evidence_photo,
-                candidate_id=candidate_id,
-                isLaptopIssuance=True,
-                prefix="laptop",
-            ),
+            *employee_photo_url,
+        ) = await _save_issuance_photos(saves)
+        store_employee_photo_url = (
+            employee_photo_url[0]
+            if employee_photo_url
+            else latest_issuer.store_employee_photo
         )
 
         if not store_employee_photo_url:
@@ -781,7 +857,7 @@ async def confirm_and_submit_upgrade(
             upgrade_details=upgrade_details, laptop_issue_details=laptop_issue_details
         )
         return close_upgrade_request(
-            payload=payload, candidate_id=candidate_id, db=db, current_user=current_user
+            payload=payload, context=context, db=db, current_user=current_user
         )
     except HTTPException:
         raise
@@ -803,9 +879,10 @@ def proceed_without_upgrade(
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN, detail="Access Denied"
             )
-        candidate = get_candidate_by_id(candidate_id=candidate_id, db=db)
-        store = get_store_of_user(db=db, user=current_user)
-        if candidate.store_id != store.id:
+        context = load_issuance_context(
+            db=db, candidate_id=candidate_id, user=current_user
+        )
+        if context.candidate.store_id != context.store.id:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Beneficiary not assigned to this store",
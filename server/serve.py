@@ -0,0 +1,222 @@
+"""
+Preload-and-fork server entry point (Linux).
+
+    python serve.py --workers 4 --host 0.0.0.0 --port 8000 [--preload-face-models]
+    kill -USR1 <master pid>    # per-process PSS/RSS report
+"""
+
+import argparse
+import gc
+import os
+import signal
+import sys
+import time
+
+FORWARDED_SIGNALS = (signal.SIGTERM, signal.SIGINT, signal.SIGHUP)
+SMAPS_FIELDS = ("Rss", "Pss", "Shared_Clean", "Shared_Dirty", "Private_Dirty")
+
+
+def preload_reference_data() -> None:
+    from db.connection import get_db_engine
+    from services.reference_data.reference_cache import reference_cache
+
+    try:
+        reference_cache.load_all()
+    except Exception as e:
+        # Workers load it on first read instead
+        print(f"Reference data not preloaded - {e}")
+    finally:
+        # Connections must not be shared with the forked workers
+        get_db_engine().dispose()
+
+
+def preload(face_models: bool) -> dict[str, float]:
+    """Import everything the workers will share. Returns seconds per step."""
+    timings = {}
+
+    start = time.perf_counter()
+    import main  # noqa: F401 - routes, schemas and ORM mappers
+
+    timings["import_app"] = time.perf_counter() - start
+
+    from services.verification_service.email_templates import email_templates
+
+    start = time.perf_counter()
+    email_templates.load()
+    timings["email_templates"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    preload_reference_data()
+    timings["reference_data"] = time.perf_counter() - start
+
+    # Imports only: the first TensorFlow inference hangs in a worker forked
+    # after the model was built
+    if face_models:
+        from services.verification_service.face_runtime import get_cv2, get_deepface
+
+        start = time.perf_counter()
+        get_cv2()
+        get_deepface()
+        timings["face_runtime"] = time.perf_counter() - start
+
+    # Keeps the workers' collector from writing to the shared pages
+    gc.collect()
+    gc.freeze()
+    return timings
+
+
+def smaps_rollup(pid: int) -> dict[str, int]:
+    """Memory counters of a process in kB."""
+    values = {}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) >= 2 and parts[0].rstrip(":") in SMAPS_FIELDS:
+                    values[parts[0].rstrip(":")] = int(parts[1])
+    except OSError:
+        pass
+    return values
+
+
+def memory_report(master_pid: int, worker_pids: list[int]) -> str:
+    rows = [("master", master_pid)] + [(f"worker {p}", p) for p in worker_pids]
+    lines = [
+        f"{'process':<16}{'rss MB':>10}{'pss MB':>10}{'shared MB':>11}{'private MB':>12}"
+    ]
+    total_rss = total_pss = 0
+    for label, pid in rows:
+        m = smaps_rollup(pid)
+        shared = m.get("Shared_Clean", 0) + m.get("Shared_Dirty", 0)
+        total_rss += m.get("Rss", 0)
+        total_pss += m.get("Pss", 0)
+        lines.append(
+            f"{label:<16}{m.get('Rss', 0) / 1024:>10.1f}{m.get('Pss', 0) / 1024:>10.1f}"
+            f"{shared / 1024:>11.1f}{m.get('Private_Dirty', 0) / 1024:>12.1f}"
+        )
+    lines.append(
+        f"total rss {total_rss / 1024:.1f} MB, total pss {total_pss / 1024:.1f} MB"
+    )
+    return "\n".join(lines)
+
+
+def run_worker(config, sock) -> None:
+    import uvicorn
+
+    for sig in FORWARDED_SIGNALS + (signal.SIGUSR1,):
+        signal.signal(sig, signal.SIG_DFL)
+    exit_code = 0
+    try:
+        uvicorn.Server(config).run(sockets=[sock])
+    except BaseException:
+        import traceback
+
+        traceback.print_exc()
+        exit_code = 1
+    finally:
+        os._exit(exit_code)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default=os.getenv("HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", "8000")))
+    parser.add_argument(
+        "--workers", type=int, default=int(os.getenv("WEB_CONCURRENCY", "1"))
+    )
+    parser.add_argument(
+        "--preload-face-models",
+        action="store_true",
+        default=os.getenv("PRELOAD_FACE_MODELS", "false").lower() == "true",
+    )
+    parser.add_argument(
+        "--memory-report-after",
+        type=float,
+        default=float(os.getenv("MEMORY_REPORT_AFTER_SECONDS", "0")),
+        help="Print a PSS/RSS report this many seconds after start (0 = only on SIGUSR1)",
+    )
+    args = parser.parse_args()
+
+    if not hasattr(os, "fork"):
+        print("serve.py needs os.fork(); use `uvicorn main:app` on this platform")
+        return 2
+
+    # Pool sizing (db.pool.size_pool_for_workers) reads this at import time
+    os.environ["WEB_CONCURRENCY"] = str(args.workers)
+
+    import uvicorn
+
+    timings = preload(args.preload_face_models)
+    print(
+        "Preloaded in master: "
+        + ", ".join(f"{name}={seconds:.2f}s" for name, seconds in timings.items())
+    )
+
+    from main import app
+
+    # log_config=None keeps the dictConfig main.py already applied
+    config = uvicorn.Config(app, host=args.host, port=args.port, log_config=None)
+    sock = config.bind_socket()
+
+    workers: dict[int, float] = {}
+    stopping = False
+    report_requested = False
+
+    def spawn() -> None:
+        pid = os.fork()
+        if pid == 0:
+            run_worker(config, sock)
+        workers[pid] = time.monotonic()
+
+    def on_stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in list(workers):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def on_report(signum, frame):
+        nonlocal report_requested
+        report_requested = True
+
+    for _ in range(max(1, args.workers)):
+        spawn()
+    for sig in FORWARDED_SIGNALS:
+        signal.signal(sig, on_stop)
+    signal.signal(signal.SIGUSR1, on_report)
+    print(
+        f"Master {os.getpid()} serving on {args.host}:{args.port}, workers {list(workers)}"
+    )
+
+    report_at = (
+        time.monotonic() + args.memory_report_after
+        if args.memory_report_after
+        else None
+    )
+    while workers:
+        pid, status = os.waitpid(-1, os.WNOHANG)
+        if pid:
+            started = workers.pop(pid, None)
+            if started is None:
+                continue
+            if not stopping:
+                print(f"Worker {pid} exited with status {status}, restarting")
+                # Don't spin if workers die on startup
+                if time.monotonic() - started < 1:
+                    time.sleep(1)
+                spawn()
+            continue
+
+        if report_requested or (report_at and time.monotonic() >= report_at):
+            report_requested, report_at = False, None
+            print(memory_report(os.getpid(), list(workers)), flush=True)
+        time.sleep(0.2)
+
+    sock.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
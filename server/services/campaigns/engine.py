@@ -0,0 +1,261 @@
+import asyncio
+import os
+import time
+from datetime import datetime, timezone
+from typing import Any
+
+import httpx
+from sqlalchemy import select, insert, update, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from db.connection import get_async_session_factory
+from models import Campaign, CampaignRecipient, Candidate, Store, Region, IssuedStatus
+from models.schemas.campaign_schemas import CampaignFilters
+from services.verification_service.email_templates import CompiledTemplate
+from services.verification_service.mobile_notification_service import (
+    fetch_sms_access_token,
+    send_bulk_sms,
+)
+from utils.log_config import logger
+
+# Provider limits: recipients per request, requests in flight, requests per second
+SMS_BATCH_SIZE = int(os.getenv("SMS_BATCH_SIZE", "50"))
+SMS_MAX_CONCURRENCY = int(os.getenv("SMS_MAX_CONCURRENCY", "4"))
+SMS_REQUESTS_PER_SECOND = float(os.getenv("SMS_REQUESTS_PER_SECOND", "5"))
+
+# Recipients loaded, rendered and checkpointed per round
+RECIPIENT_CHUNK_SIZE = 1000
+
+# A run refreshes its campaign's updated_at with every chunk it records. A
+# "running" campaign untouched for this long died with its process and may be
+# started again.
+CAMPAIGN_STALE_SECONDS = int(os.getenv("CAMPAIGN_STALE_SECONDS", "300"))
+
+# Fields available to {{ placeholders }} in a campaign message
+CAMPAIGN_PLACEHOLDERS = {
+    "full_name",
+    "coupon_code",
+    "store_name",
+    "store_address",
+    "region_name",
+}
+
+
+class AsyncRateLimiter:
+    """Token bucket shared by all concurrent batch senders of a campaign."""
+
+    def __init__(self, rate: float, burst: int | None = None):
+        self.rate = rate
+        self.capacity = burst or max(1, int(rate))
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(
+                    self.capacity, self.tokens + (now - self.updated) * self.rate
+                )
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+def build_recipient_query(filters: CampaignFilters):
+    stmt = select(Candidate.id, Candidate.mobile_number).where(
+        Candidate.mobile_number.is_not(None), Candidate.mobile_number != ""
+    )
+    if filters.region_ids:
+        stmt = stmt.where(Candidate.region_id.in_(filters.region_ids))
+    if filters.store_ids:
+        stmt = stmt.where(Candidate.store_id.in_(filters.store_ids))
+    if filters.is_candidate_verified is not None:
+        stmt = stmt.where(
+            Candidate.is_candidate_verified.is_(filters.is_candidate_verified)
+        )
+    if filters.issued_status == "issued":
+        stmt = stmt.join(IssuedStatus, IssuedStatus.candidate_id == Candidate.id).where(
+            IssuedStatus.issued_status == "issued"
+        )
+    elif filters.issued_status == "not_issued":
+        stmt = stmt.outerjoin(
+            IssuedStatus, IssuedStatus.candidate_id == Candidate.id
+        ).where(
+            or_(
+                IssuedStatus.issued_status != "issued",
+                IssuedStatus.candidate_id.is_(None),
+            )
+        )
+    return stmt
+
+
+def add_campaign_recipients(
+    db: Session, campaign_id: str, filters: CampaignFilters
+) -> int:
+    """Snapshot the matching beneficiaries as pending recipients (one executemany)."""
+    rows = db.execute(build_recipient_query(filters)).all()
+    if rows:
+        db.execute(
+            insert(CampaignRecipient),
+            [
+                {
+                    "campaign_id": campaign_id,
+                    "candidate_id": row.id,
+                    "destination": row.mobile_number,
+                    "status": "pending",
+                }
+                for row in rows
+            ],
+        )
+    return len(rows)
+
+
+def _pending_chunk_query(campaign_id: str, after_id: str):
+    return (
+        select(
+            CampaignRecipient.id,
+            CampaignRecipient.destination,
+            Candidate.full_name,
+            Candidate.coupon_code,
+            Store.name.label("store_name"),
+            Store.address.label("store_address"),
+            Region.name.label("region_name"),
+        )
+        .join(Candidate, Candidate.id == CampaignRecipient.candidate_id)
+        .outerjoin(Store, Store.id == Candidate.store_id)
+        .outerjoin(Region, Region.id == Candidate.region_id)
+        .where(
+            CampaignRecipient.campaign_id == campaign_id,
+            CampaignRecipient.status == "pending",
+            CampaignRecipient.id > after_id,
+        )
+        .order_by(CampaignRecipient.id)
+        .limit(RECIPIENT_CHUNK_SIZE)
+    )
+
+
+async def _send_batch(
+    client: httpx.AsyncClient,
+    token_state: dict[str, str],
+    batch: list[dict[str, str]],
+    limiter: AsyncRateLimiter,
+    semaphore: asyncio.Semaphore,
+) -> list[dict[str, Any]]:
+    async with semaphore:
+        try:
+            await limiter.acquire()
+            try:
+                return await send_bulk_sms(client, token_state["token"], batch)
+            except PermissionError:
+                token_state["token"] = await fetch_sms_access_token(client)
+                await limiter.acquire()
+                return await send_bulk_sms(client, token_state["token"], batch)
+        except Exception as e:
+            logger.error(f"Error in sending campaign SMS batch - {e}")
+            return [
+                {"message_key": r["message_key"], "success": False, "error": str(e)}
+                for r in batch
+            ]
+
+
+async def _record_results(
+    db: AsyncSession, campaign: Campaign, results: list[dict[str, Any]]
+) -> None:
+    now = datetime.now(timezone.utc)
+    await db.execute(
+        update(CampaignRecipient),
+        [
+            {
+                "id": r["message_key"],
+                "status": "sent" if r["success"] else "failed",
+                "provider_message_key": r["message_key"] if r["success"] else None,
+                "error_message": r["error"],
+                "sent_at": now if r["success"] else None,
+            }
+            for r in results
+        ],
+    )
+    sent = sum(1 for r in results if r["success"])
+    campaign.sent_count += sent
+    campaign.failed_count += len(results) - sent
+    await db.commit()
+
+
+async def run_campaign(campaign_id: str) -> None:
+    """
+    Send all pending recipients of a campaign.
+    Progress is committed per chunk, so an interrupted run resumes where it stopped.
+    Runs on the event loop, so every query goes through the async session.
+    """
+    AsyncSessionLocal = get_async_session_factory()
+    async with AsyncSessionLocal() as db:
+        campaign = await db.get(Campaign, campaign_id)
+        if not campaign:
+            logger.error(f"Campaign {campaign_id} not found")
+            return
+
+        template = CompiledTemplate(
+            campaign.name, campaign.message_template, autoescape=False
+        )
+        campaign.status = "running"
+        campaign.started_at = campaign.started_at or datetime.now(timezone.utc)
+        await db.commit()
+
+        limiter = AsyncRateLimiter(SMS_REQUESTS_PER_SECOND)
+        semaphore = asyncio.Semaphore(SMS_MAX_CONCURRENCY)
+        started = time.perf_counter()
+
+        try:
+            async with httpx.AsyncClient(timeout=30) as client:
+                token_state = {"token": await fetch_sms_access_token(client)}
+                after_id = ""
+                while True:
+                    rows = (
+                        await db.execute(_pending_chunk_query(campaign.id, after_id))
+                    ).all()
+                    if not rows:
+                        break
+                    after_id = rows[-1].id
+
+                    # The recipient row id doubles as the provider messageKey
+                    recipients = [
+                        {
+                            "message_key": row.id,
+                            "mobile_number": row.destination,
+                            "message": template.render(row._mapping),
+                        }
+                        for row in rows
+                    ]
+                    batches = [
+                        recipients[i : i + SMS_BATCH_SIZE]
+                        for i in range(0, len(recipients), SMS_BATCH_SIZE)
+                    ]
+                    batch_results = await asyncio.gather(
+                        *(
+                            _send_batch(client, token_state, b, limiter, semaphore)
+                            for b in batches
+                        )
+                    )
+                    await _record_results(
+                        db, campaign, [r for batch in batch_results for r in batch]
+                    )
+
+            campaign.status = "completed"
+        except Exception as e:
+            logger.error(f"Error in running campaign {campaign_id} - {e}")
+            await db.rollback()
+            # The rollback expired it; async sessions can't lazy-load
+            await db.refresh(campaign)
+            campaign.status = "failed"
+        finally:
+            campaign.completed_at = datetime.now(timezone.utc)
+            await db.commit()
+            logger.info(
+                f"Campaign {campaign_id} {campaign.status}: {campaign.sent_count} sent, "
+                f"{campaign.failed_count} failed in {time.perf_counter() - started:.1f}s"
+            )
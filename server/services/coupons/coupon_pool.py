@@ -0,0 +1,130 @@
+"""
+Coupon codes from the pre-generated coupon_pool table, reserved in batches
+per process.
+"""
+
+import os
+import socket
+import threading
+import uuid
+from collections import deque
+from datetime import datetime, timezone
+
+from dotenv import load_dotenv
+from sqlalchemy import insert, select, update
+
+from db.connection import get_db_engine
+from models import Candidate, CouponPoolCode, VoucherCode
+from utils.helpers import generate_coupon
+from utils.log_config import logger
+
+load_dotenv()
+
+# Codes a process reserves at a time
+COUPON_POOL_BATCH_SIZE = int(os.getenv("COUPON_POOL_BATCH_SIZE", "200"))
+# Codes generated whenever the table has too few free ones
+COUPON_POOL_GENERATE_SIZE = int(os.getenv("COUPON_POOL_GENERATE_SIZE", "5000"))
+
+# reserved_by of codes a candidate already has
+TAKEN_BY_CANDIDATES = "candidates"
+
+
+def codes_in_use(conn, codes) -> set[str]:
+    """Those of `codes` some candidate already presents at the counter."""
+    codes = list(codes)
+    if not codes:
+        return set()
+    used = set(
+        conn.scalars(
+            select(Candidate.coupon_code).where(Candidate.coupon_code.in_(codes))
+        )
+    )
+    used |= set(
+        conn.scalars(select(VoucherCode.code).where(VoucherCode.code.in_(codes)))
+    )
+    return used
+
+
+def generate_pool_codes(count: int) -> int:
+    """Add up to `count` new codes; codes that already exist are skipped."""
+    codes = {generate_coupon() for _ in range(count)}
+    stmt = (
+        insert(CouponPoolCode)
+        .prefix_with("IGNORE", dialect="mysql")
+        .prefix_with("OR IGNORE", dialect="sqlite")
+    )
+    with get_db_engine().begin() as conn:
+        codes -= codes_in_use(conn, codes)
+        if not codes:
+            return 0
+        result = conn.execute(stmt, [{"code": code} for code in codes])
+    return max(result.rowcount, 0)
+
+
+def reserve_pool_codes(count: int, owner: str) -> list[str]:
+    """Mark up to `count` free codes as reserved by `owner` and return them."""
+    with get_db_engine().begin() as conn:
+        codes = list(
+            conn.scalars(
+                select(CouponPoolCode.code)
+                .where(CouponPoolCode.reserved_by.is_(None))
+                .limit(count)
+                # Concurrent reservations take different rows instead of waiting
+                .with_for_update(skip_locked=True)
+            )
+        )
+        # Codes generated before their candidate existed, e.g. into a pool
+        # create_all made empty, are retired rather than handed out
+        used = codes_in_use(conn, codes)
+        codes = [code for code in codes if code not in used]
+        now = datetime.now(timezone.utc)
+        for reserved_by, batch in ((TAKEN_BY_CANDIDATES, used), (owner, codes)):
+            if batch:
+                conn.execute(
+                    update(CouponPoolCode)
+                    .where(CouponPoolCode.code.in_(batch))
+                    .values(reserved_by=reserved_by, reserved_at=now)
+                )
+        if used:
+            logger.warning(f"Coupon pool: retired {len(used)} codes already in use")
+    return codes
+
+
+class CouponPool:
+    def __init__(self, batch_size: int, generate_size: int):
+        self.batch_size = max(1, batch_size)
+        self.generate_size = max(1, generate_size)
+        self._codes: deque[str] = deque()
+        self._lock = threading.Lock()
+        self._pid: int | None = None
+        self._owner = ""
+
+    def _reset_after_fork(self) -> None:
+        if self._pid != os.getpid():
+            self._codes.clear()
+            self._pid = os.getpid()
+            self._owner = (
+                f"{socket.gethostname()[:40]}:{self._pid}:{uuid.uuid4().hex[:8]}"
+            )
+
+    def _refill(self, needed: int) -> None:
+        while len(self._codes) < needed:
+            wanted = max(self.batch_size, needed - len(self._codes))
+            codes = reserve_pool_codes(wanted, self._owner)
+            self._codes.extend(codes)
+            if len(codes) < wanted:
+                added = generate_pool_codes(max(self.generate_size, wanted))
+                logger.info(f"Coupon pool: generated {added} new codes")
+
+    def take(self) -> str:
+        return self.take_many(1)[0]
+
+    def take_many(self, count: int) -> list[str]:
+        """`count` unique, unused coupon codes (one reservation per batch)."""
+        with self._lock:
+            self._reset_after_fork()
+            self._refill(count)
+            return [self._codes.popleft() for _ in range(count)]
+
+
+coupon_pool = CouponPool(COUPON_POOL_BATCH_SIZE, COUPON_POOL_GENERATE_SIZE)
@@ -0,0 +1,217 @@
+"""Startup warm-up and the readiness check behind /ready."""
+
+import asyncio
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable
+
+from sqlalchemy import text
+
+from db.connection import get_async_db_engine, get_db_engine, get_pool_sizing
+from services.verification_service import email_service, mobile_notification_service
+from services.verification_service.face_embeddings import (
+    ARCFACE_INPUT_SIZE,
+    get_embedding_backend,
+)
+from services.verification_service.face_detection import FACE_DETECTOR_CASCADE
+from services.verification_service.face_liveness import FACE_LIVENESS_ENABLED
+from services.verification_service.face_runtime import (
+    get_deepface,
+    get_spoof_model,
+    load_face_runtime,
+)
+from utils.log_config import logger
+
+WARMUP_FACE_MODELS = os.getenv("WARMUP_FACE_MODELS", "true").lower() == "true"
+WARMUP_UPSTREAMS = os.getenv("WARMUP_UPSTREAMS", "true").lower() == "true"
+READY_DB_TIMEOUT_SECONDS = float(os.getenv("READY_DB_TIMEOUT_SECONDS", "2"))
+WARMUP_RETRY_FIRST_SECONDS = float(os.getenv("WARMUP_RETRY_FIRST_SECONDS", "1"))
+WARMUP_RETRY_MAX_SECONDS = float(os.getenv("WARMUP_RETRY_MAX_SECONDS", "60"))
+
+
+@dataclass
+class StepResult:
+    ok: bool
+    seconds: float
+    required: bool
+    error: str | None = None
+    attempts: int = 1
+
+
+@dataclass
+class WarmupState:
+    status: str = "pending"  # pending | running | done
+    started_at: float | None = None
+    finished_at: float | None = None
+    steps: dict[str, StepResult] = field(default_factory=dict)
+
+    @property
+    def ready(self) -> bool:
+        return self.status == "done" and all(
+            s.ok for s in self.steps.values() if s.required
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        total = None
+        if self.started_at is not None and self.finished_at is not None:
+            total = round(self.finished_at - self.started_at, 3)
+        return {
+            "status": self.status,
+            "total_seconds": total,
+            "steps": {
+                name: {
+                    "ok": s.ok,
+                    "required": s.required,
+                    "seconds": round(s.seconds, 3),
+                    "error": s.error,
+                    "attempts": s.attempts,
+                }
+                for name, s in self.steps.items()
+            },
+        }
+
+
+warmup_state = WarmupState()
+
+
+async def _run_step(
+    name: str, step: Callable[[], Awaitable[Any]], required: bool = True
+) -> None:
+    """Run `step()` once, or for a required step until it succeeds."""
+    delay = WARMUP_RETRY_FIRST_SECONDS
+    attempts = 0
+    while True:
+        attempts += 1
+        start = time.perf_counter()
+        try:
+            await step()
+            warmup_state.steps[name] = StepResult(
+                ok=True,
+                seconds=time.perf_counter() - start,
+                required=required,
+                attempts=attempts,
+            )
+            logger.info(
+                f"Warm-up step {name} done in {time.perf_counter() - start:.2f}s"
+            )
+            return
+        except Exception as e:
+            warmup_state.steps[name] = StepResult(
+                ok=False,
+                seconds=time.perf_counter() - start,
+                required=required,
+                error=str(e),
+                attempts=attempts,
+            )
+            if not required:
+                logger.warning(f"Warm-up step {name} failed - {e}")
+                return
+            logger.error(
+                f"Warm-up step {name} failed (attempt {attempts}), "
+                f"retrying in {delay:.0f}s - {e}"
+            )
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, WARMUP_RETRY_MAX_SECONDS)
+
+
+def _warm_face_models() -> None:
+    """Build the model and push one blank frame through every detector + embedding."""
+    import numpy as np
+
+    load_face_runtime()
+    DeepFace = get_deepface()
+    blank = np.zeros((224, 224, 3), dtype=np.uint8)
+    for detector_backend in FACE_DETECTOR_CASCADE:
+        DeepFace.extract_faces(
+            img_path=blank,
+            detector_backend=detector_backend,
+            enforce_detection=False,
+        )
+    get_embedding_backend().embed(
+        np.zeros((1, *ARCFACE_INPUT_SIZE, 3), dtype=np.float32)
+    )
+    if FACE_LIVENESS_ENABLED:
+        get_spoof_model().analyze(img=blank, facial_area=(62, 62, 100, 100))
+
+
+def _prime_sync_pool() -> None:
+    engine = get_db_engine()
+    conns = [engine.connect() for _ in range(get_pool_sizing().pool_size)]
+    try:
+        for conn in conns:
+            conn.execute(text("SELECT 1"))
+    finally:
+        for conn in conns:
+            conn.close()
+
+
+async def _prime_async_pool() -> None:
+    engine = get_async_db_engine()
+    conns = [await engine.connect() for _ in range(get_pool_sizing().pool_size)]
+    try:
+        for conn in conns:
+            await conn.execute(text("SELECT 1"))
+    finally:
+        for conn in conns:
+            await conn.close()
+
+
+async def _prime_graph() -> None:
+    result = await asyncio.to_thread(email_service.fetch_token)
+    if not result.get("token"):
+        raise RuntimeError("no Graph access token returned")
+
+
+async def run_warmup() -> WarmupState:
+    warmup_state.status = "running"
+    warmup_state.started_at = time.perf_counter()
+
+    steps = [
+        _run_step("db_pool", lambda: asyncio.to_thread(_prime_sync_pool)),
+        _run_step("db_pool_async", _prime_async_pool),
+    ]
+    if WARMUP_FACE_MODELS:
+        steps.append(
+            _run_step("face_models", lambda: asyncio.to_thread(_warm_face_models))
+        )
+    if WARMUP_UPSTREAMS:
+        # Third-party outages must not keep the API out of rotation
+        steps.append(
+            _run_step(
+                "sms_token",
+                mobile_notification_service.get_sms_access_token,
+                required=False,
+            )
+        )
+        steps.append(_run_step("graph_token", _prime_graph, required=False))
+
+    await asyncio.gather(*steps)
+
+    warmup_state.finished_at = time.perf_counter()
+    warmup_state.status = "done"
+    logger.info(
+        f"Warm-up finished in {warmup_state.finished_at - warmup_state.started_at:.2f}s"
+        f" (ready={warmup_state.ready})"
+    )
+    return warmup_state
+
+
+async def _ping_db() -> None:
+    async with get_async_db_engine().connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+
+async def readiness_report() -> tuple[bool, dict[str, Any]]:
+    db_ok, db_error = True, None
+    try:
+        await asyncio.wait_for(_ping_db(), timeout=READY_DB_TIMEOUT_SECONDS)
+    except Exception as e:
+        db_ok, db_error = False, str(e) or type(e).__name__
+
+    ready = warmup_state.ready and db_ok
+    return ready, {
+        "ready": ready,
+        "database": {"ok": db_ok, "error": db_error},
+        "warmup": warmup_state.as_dict(),
+    }
@@ -0,0 +1,169 @@
+"""Version counters per table, kept in reference_data_versions."""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable
+
+from sqlalchemy import event, insert, select, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from models.reference_data_versions import ReferenceDataVersion
+from utils.log_config import logger
+
+TRACKED_TABLES = frozenset(
+    {
+        "candidates",
+        "issued_statuses",
+        "verification_statuses",
+        "upgrade_requests",
+        "users",
+    }
+)
+
+_CHANGED_KEY = "tracked_tables_changed"
+
+DATA_VERSION_RETRY_FIRST_SECONDS = float(
+    os.getenv("DATA_VERSION_RETRY_FIRST_SECONDS", "0.5")
+)
+DATA_VERSION_RETRY_MAX_SECONDS = float(
+    os.getenv("DATA_VERSION_RETRY_MAX_SECONDS", "30")
+)
+
+
+def increment_versions(db: Session | Connection, names: Iterable[str]) -> None:
+    """Add one to each counter, creating missing ones, in the caller's transaction."""
+    names = sorted(set(names))
+    if not names:
+        return
+    result = db.execute(
+        update(ReferenceDataVersion)
+        .where(ReferenceDataVersion.name.in_(names))
+        .values(version=ReferenceDataVersion.version + 1)
+    )
+    if result.rowcount < len(names):
+        existing = set(
+            db.scalars(
+                select(ReferenceDataVersion.name).where(
+                    ReferenceDataVersion.name.in_(names)
+                )
+            )
+        )
+        for name in names:
+            if name not in existing:
+                db.execute(insert(ReferenceDataVersion).values(name=name, version=1))
+
+
+def read_versions(db: Session, names: Iterable[str] | None = None) -> dict[str, int]:
+    stmt = select(ReferenceDataVersion.name, ReferenceDataVersion.version)
+    if names is not None:
+        stmt = stmt.where(ReferenceDataVersion.name.in_(list(names)))
+    return {name: version for name, version in db.execute(stmt)}
+
+
+class _Bumper:
+    """Coalesces the tables committed since the last run into one UPDATE."""
+
+    def __init__(self):
+        self._pending: set[str] = set()
+        # Committed here but not bumped yet: pending, in flight or failed
+        self._unbumped: set[str] = set()
+        self._scheduled = False
+        self._lock = threading.Lock()
+        self._executor: ThreadPoolExecutor | None = None
+        self._pid: int | None = None
+
+    def add(self, names: set[str]) -> None:
+        with self._lock:
+            self._pending |= names
+            self._unbumped |= names
+            if self._pid != os.getpid():
+                # A forked worker inherits the executor but not its thread
+                self._executor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="data-versions"
+                )
+                self._pid = os.getpid()
+                self._scheduled = False
+            if self._scheduled:
+                return
+            self._scheduled = True
+        self._executor.submit(self._run)
+
+    def has_unbumped(self, names: Iterable[str]) -> bool:
+        return not self._unbumped.isdisjoint(names)
+
+    def _run(self) -> None:
+        # Imported here: db.connection reads the configuration at import
+        from db.connection import get_db_engine
+
+        delay = DATA_VERSION_RETRY_FIRST_SECONDS
+        while True:
+            with self._lock:
+                names, self._pending = self._pending, set()
+                if not names:
+                    self._scheduled = False
+                    return
+            try:
+                with get_db_engine().begin() as conn:
+                    increment_versions(conn, names)
+            except Exception as e:
+                logger.error(
+                    f"Failed to bump data versions {sorted(names)}, "
+                    f"retrying in {delay:.1f}s - {e}"
+                )
+                with self._lock:
+                    self._pending |= names
+                time.sleep(delay)
+                delay = min(delay * 2, DATA_VERSION_RETRY_MAX_SECONDS)
+                continue
+            delay = DATA_VERSION_RETRY_FIRST_SECONDS
+            with self._lock:
+                self._unbumped -= names - self._pending
+
+
+_bumper = _Bumper()
+
+
+def has_pending_versions(names: Iterable[str]) -> bool:
+    """Whether a commit in this process to any of `names` is not counted yet."""
+    return _bumper.has_unbumped(names)
+
+
+def _record(session: Session, tables) -> None:
+    changed = {name for name in tables if name in TRACKED_TABLES}
+    if changed:
+        session.info.setdefault(_CHANGED_KEY, set()).update(changed)
+
+
+@event.listens_for(Session, "after_flush")
+def _record_flushed(session: Session, flush_context) -> None:
+    _record(
+        session,
+        {
+            obj.__table__.name
+            for obj in (*session.new, *session.dirty, *session.deleted)
+            if hasattr(obj, "__table__")
+        },
+    )
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _record_bulk_statements(state) -> None:
+    if state.is_insert or state.is_update or state.is_delete:
+        mapper = state.bind_mapper
+        if mapper is not None:
+            _record(state.session, {mapper.local_table.name})
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_committed(session: Session) -> None:
+    changed = session.info.pop(_CHANGED_KEY, None)
+    if changed:
+        _bumper.add(changed)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back(session: Session) -> None:
+    session.info.pop(_CHANGED_KEY, None)
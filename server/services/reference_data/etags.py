@@ -0,0 +1,76 @@
+"""ETags for polled GET endpoints, built from reference_data_versions."""
+
+import hashlib
+import os
+from typing import Annotated
+
+from fastapi import Depends, HTTPException, Request, Response, status
+
+from db.connection import (
+    create_session_factory,
+    get_read_session_factory,
+    use_read_replica,
+)
+from models.schemas.auth_schemas import UserOut
+from services.auth.deps import get_current_user
+from services.reference_data.data_versions import has_pending_versions, read_versions
+from services.reference_data.reference_cache import reference_cache
+
+ETAG_SALT = os.getenv("ETAG_SALT", "1")
+
+CACHE_CONTROL = "private, no-cache"
+
+
+def _matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    opaque = etag.removeprefix("W/")
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == opaque:
+            return True
+    return False
+
+
+def etag_for(*tables: str):
+    def check_etag(
+        request: Request,
+        response: Response,
+        current_user: Annotated[UserOut, Depends(get_current_user)],
+    ) -> str | None:
+        if has_pending_versions(tables):
+            # A commit made here is not counted yet; the ETag would still
+            # match the data from before it
+            response.headers["Cache-Control"] = CACHE_CONTROL
+            return None
+        if use_read_replica(request):
+            SessionLocal = get_read_session_factory()
+        else:
+            SessionLocal = create_session_factory()
+        with SessionLocal() as db:
+            versions = read_versions(db, tables)
+        # The route must not serve a cached snapshot older than this ETag
+        reference_cache.catch_up(versions)
+
+        fingerprint = repr(
+            (
+                ETAG_SALT,
+                request.url.path,
+                sorted(request.query_params.multi_items()),
+                current_user.id,
+                current_user.role,
+                [versions.get(table, 0) for table in tables],
+            )
+        )
+        # Weak: the same data may go out compressed or not
+        etag = f'W/"{hashlib.sha256(fingerprint.encode()).hexdigest()[:32]}"'
+        headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+
+        if _matches(request.headers.get("if-none-match"), etag):
+            raise HTTPException(
+                status_code=status.HTTP_304_NOT_MODIFIED, headers=headers
+            )
+        response.headers.update(headers)
+        return etag
+
+    return check_etag
@@ -0,0 +1,220 @@
+"""
+Per-worker cache of stores, cities, regions, vendors and utility files,
+reloaded when its reference_data_versions row is bumped.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from dotenv import load_dotenv
+from pydantic import ValidationError
+from sqlalchemy import event, select
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session, selectinload
+
+from db.connection import create_session_factory
+from models import City, Region, Store, UtilityFile
+from models.schemas.region_schemas import RegionOutSchema
+from models.schemas.store_schemas import StoreItemOut
+from models.schemas.utility_file_schemas import UtilityFileOut
+from models.schemas.vendor_schemas import VendorItem
+from services.reference_data.data_versions import increment_versions, read_versions
+from models.vendors import Vendor
+from utils.log_config import logger
+
+load_dotenv()
+
+# How stale another worker's write may look here, at most
+REFERENCE_CACHE_CHECK_SECONDS = float(os.getenv("REFERENCE_CACHE_CHECK_SECONDS", "5"))
+
+_PENDING_KEY = "reference_data_bumped"
+
+
+def _each_valid(kind: str, rows, build: Callable[[Any], Any]):
+    """Build every row, leaving out (and logging) those that don't validate."""
+    for row in rows:
+        try:
+            yield build(row)
+        except ValidationError as e:
+            logger.error(f"Reference cache: skipped a row of {kind} - {e}")
+
+
+def _store_out(store: Store) -> StoreItemOut:
+    return StoreItemOut(
+        id=store.id,
+        name=store.name,
+        city=store.city,
+        # Nullable in the table; stores imported with a blank Count have none
+        count=store.count or 0,
+        address=store.address,
+        email=store.email,
+        mobile_number=store.mobile_number,
+    )
+
+
+def _load_stores(db: Session) -> dict[str, StoreItemOut]:
+    stores = db.scalars(
+        select(Store).options(selectinload(Store.city)).order_by(Store.name, Store.id)
+    ).all()
+    return {store.id: store for store in _each_valid("stores", stores, _store_out)}
+
+
+def _load_cities(db: Session) -> list[dict]:
+    return [city.to_dict() for city in db.scalars(select(City).order_by(City.name))]
+
+
+def _load_regions(db: Session) -> dict[str, RegionOutSchema]:
+    regions = db.scalars(select(Region).order_by(Region.name)).all()
+    return {
+        region.id: region
+        for region in _each_valid("regions", regions, RegionOutSchema.model_validate)
+    }
+
+
+def _load_vendors(db: Session) -> dict[str, VendorItem]:
+    vendors = db.scalars(select(Vendor)).all()
+    return {
+        vendor.id: vendor
+        for vendor in _each_valid("vendors", vendors, VendorItem.model_validate)
+    }
+
+
+def _load_utility_files(db: Session) -> dict[str, UtilityFileOut]:
+    files = db.scalars(select(UtilityFile)).all()
+    return {
+        file.type: file
+        for file in _each_valid("utility_files", files, UtilityFileOut.model_validate)
+    }
+
+
+@dataclass(frozen=True)
+class _Kind:
+    load: Callable[[Session], Any]
+    # Versions the snapshot depends on (a store carries its city names)
+    sources: tuple[str, ...]
+
+
+_KINDS = {
+    "stores": _Kind(_load_stores, ("stores", "cities")),
+    "cities": _Kind(_load_cities, ("cities",)),
+    "regions": _Kind(_load_regions, ("regions",)),
+    "vendors": _Kind(_load_vendors, ("vendors",)),
+    "utility_files": _Kind(_load_utility_files, ("utility_files",)),
+}
+
+
+class ReferenceCache:
+    def __init__(self, check_seconds: float):
+        self.check_seconds = check_seconds
+        self._versions: dict[str, int] = {}
+        self._checked_at = 0.0
+        self._snapshots: dict[str, tuple[tuple[int, ...], Any]] = {}
+        self._lock = threading.Lock()
+        self._session_factory = None
+
+    def _session(self) -> Session:
+        if self._session_factory is None:
+            self._session_factory = create_session_factory()
+        return self._session_factory()
+
+    def _tag(self, kind: str) -> tuple[int, ...]:
+        return tuple(self._versions.get(name, 0) for name in _KINDS[kind].sources)
+
+    def _current(self, kind: str):
+        """The snapshot, if it is known to be current without touching the DB."""
+        if time.monotonic() - self._checked_at >= self.check_seconds:
+            return None
+        snapshot = self._snapshots.get(kind)
+        if snapshot is None or snapshot[0] != self._tag(kind):
+            return None
+        return snapshot
+
+    def get(self, kind: str):
+        snapshot = self._current(kind)
+        if snapshot is not None:
+            return snapshot[1]
+        with self._lock:
+            with self._session() as db:
+                if time.monotonic() - self._checked_at >= self.check_seconds:
+                    self._versions = read_versions(db)
+                    self._checked_at = time.monotonic()
+                tag = self._tag(kind)
+                snapshot = self._snapshots.get(kind)
+                if snapshot is None or snapshot[0] != tag:
+                    started = time.perf_counter()
+                    snapshot = (tag, _KINDS[kind].load(db))
+                    self._snapshots[kind] = snapshot
+                    logger.info(
+                        f"Reference cache: loaded {kind} at {tag} in "
+                        f"{(time.perf_counter() - started) * 1000:.1f} ms"
+                    )
+            return snapshot[1]
+
+    def load_all(self) -> None:
+        """Load every kind now instead of on first read."""
+        for kind in _KINDS:
+            self.get(kind)
+
+    async def aget(self, kind: str):
+        """get() for async routes; only a reload leaves the event loop."""
+        snapshot = self._current(kind)
+        if snapshot is not None:
+            return snapshot[1]
+        return await asyncio.to_thread(self.get, kind)
+
+    def invalidate(self) -> None:
+        """Re-check versions on the next read."""
+        self._checked_at = 0.0
+
+    def catch_up(self, versions: dict[str, int]) -> None:
+        """Re-check on the next read if `versions` are ahead of this worker's."""
+        if any(
+            version > self._versions.get(name, 0)
+            for name, version in versions.items()
+            if name in _KINDS
+        ):
+            self.invalidate()
+
+    def store(self, store_id: str | None) -> StoreItemOut | None:
+        return self.get("stores").get(store_id) if store_id else None
+
+    def region(self, region_id: str | None) -> RegionOutSchema | None:
+        return self.get("regions").get(region_id) if region_id else None
+
+    def store_name(self, store_id: str | None) -> str | None:
+        store = self.store(store_id)
+        return store.name if store else None
+
+    def region_name(self, region_id: str | None) -> str | None:
+        region = self.region(region_id)
+        return region.name if region else None
+
+
+reference_cache = ReferenceCache(REFERENCE_CACHE_CHECK_SECONDS)
+
+
+def bump_reference_versions(db: Session | Connection, *kinds: str) -> None:
+    """
+    Mark reference data as changed, inside the caller's transaction: the new
+    version becomes visible to other workers exactly when the change does.
+    """
+    for kind in kinds:
+        if kind not in _KINDS:
+            raise ValueError(f"Unknown reference data: {kind}")
+    increment_versions(db, kinds)
+    db.info.setdefault(_PENDING_KEY, set()).update(kinds)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session: Session) -> None:
+    if session.info.pop(_PENDING_KEY, None):
+        reference_cache.invalidate()
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,353 @@
+"""
+Resumable chunked uploads: <id>.json + <id>.part under uploads/upload_sessions,
+changed only under an flock on <id>.lock.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager, suppress
+from dataclasses import asdict, dataclass
+
+try:
+    import fcntl
+except ImportError:  # Windows dev machines run a single process
+    fcntl = None
+
+from fastapi import HTTPException, status
+
+from utils.helpers import (
+    BASE_UPLOAD_DIR,
+    IMAGE_MIME_TYPES,
+    get_relative_upload_path,
+    image_upload_dir,
+    image_upload_filename,
+    normalize_path,
+)
+from utils.storage import UPLOAD_FSYNC, run_io
+
+UPLOAD_SESSION_DIR = os.path.join(BASE_UPLOAD_DIR, "upload_sessions")
+UPLOAD_SESSION_MAX_BYTES = int(os.getenv("UPLOAD_SESSION_MAX_BYTES", str(25 << 20)))
+UPLOAD_SESSION_TTL_HOURS = float(os.getenv("UPLOAD_SESSION_TTL_HOURS", "24"))
+# Suggested to clients; any chunk up to UPLOAD_CHUNK_MAX_BYTES is accepted
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", str(256 << 10)))
+UPLOAD_CHUNK_MAX_BYTES = int(os.getenv("UPLOAD_CHUNK_MAX_BYTES", str(8 << 20)))
+
+os.makedirs(UPLOAD_SESSION_DIR, exist_ok=True)
+
+
+@dataclass
+class UploadSession:
+    upload_id: str
+    user_id: str
+    filename: str
+    content_type: str
+    size: int
+    sha256: str
+    created_at: float
+    completed: bool = False
+
+    @property
+    def meta_path(self) -> str:
+        return _meta_path(self.upload_id)
+
+    @property
+    def data_path(self) -> str:
+        return os.path.join(UPLOAD_SESSION_DIR, f"{self.upload_id}.part")
+
+    @property
+    def lock_path(self) -> str:
+        return _lock_path(self.upload_id)
+
+    @property
+    def expires_at(self) -> float:
+        return self.created_at + UPLOAD_SESSION_TTL_HOURS * 3600
+
+    @property
+    def offset(self) -> int:
+        try:
+            return os.path.getsize(self.data_path)
+        except FileNotFoundError:
+            return 0
+
+    def out(self) -> dict:
+        return {
+            "upload_id": self.upload_id,
+            "filename": self.filename,
+            "content_type": self.content_type,
+            "size": self.size,
+            "offset": self.offset,
+            "completed": self.completed,
+            "chunk_size": UPLOAD_CHUNK_SIZE,
+            "expires_at": self.expires_at,
+        }
+
+    def save(self) -> None:
+        tmp_path = f"{self.meta_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(asdict(self), f)
+        os.replace(tmp_path, self.meta_path)
+
+    def remove(self) -> None:
+        for path in (self.data_path, self.meta_path, self.lock_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+
+def _meta_path(upload_id: str) -> str:
+    return os.path.join(UPLOAD_SESSION_DIR, f"{upload_id}.json")
+
+
+def _lock_path(upload_id: str) -> str:
+    return os.path.join(UPLOAD_SESSION_DIR, f"{upload_id}.lock")
+
+
+def _session_not_found() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND, detail="Upload session not found"
+    )
+
+
+_process_lock = threading.Lock()
+
+
+@contextmanager
+def _session_lock(upload_id: str, wait: bool = True):
+    """
+    Exclusive access to one existing session across threads and workers.
+    With wait=False a session someone else holds raises BlockingIOError.
+    """
+    try:
+        # Only ids we generated; also keeps the id from escaping the directory
+        upload_id = str(uuid.UUID(upload_id))
+    except ValueError:
+        raise _session_not_found()
+    # No lock file for ids that aren't (or are no longer) sessions
+    if not os.path.exists(_meta_path(upload_id)):
+        raise _session_not_found()
+    if fcntl is None:
+        if not _process_lock.acquire(blocking=wait):
+            raise BlockingIOError(upload_id)
+        try:
+            yield
+        finally:
+            _process_lock.release()
+        return
+    with open(_lock_path(upload_id), "a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX if wait else fcntl.LOCK_EX | fcntl.LOCK_NB)
+        try:
+            if not os.path.exists(_meta_path(upload_id)):
+                # Removed while we waited, and its lock file with it
+                with suppress(FileNotFoundError):
+                    os.remove(f.name)
+                raise _session_not_found()
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _sweep_expired() -> None:
+    now = time.time()
+    for name in os.listdir(UPLOAD_SESSION_DIR):
+        upload_id, ext = os.path.splitext(name)
+        if ext == ".lock":
+            # Left behind by a request racing the session's removal
+            if not os.path.exists(_meta_path(upload_id)):
+                with suppress(FileNotFoundError):
+                    os.remove(os.path.join(UPLOAD_SESSION_DIR, name))
+            continue
+        if ext != ".json":
+            continue
+        try:
+            # A session a request is working on right now has not been abandoned
+            with _session_lock(upload_id, wait=False):
+                with open(_meta_path(upload_id)) as f:
+                    session = UploadSession(**json.load(f))
+                if session.expires_at < now:
+                    session.remove()
+        except (BlockingIOError, HTTPException, OSError, ValueError, TypeError):
+            continue
+
+
+def _create_session_sync(
+    user_id: str, filename: str, content_type: str, size: int, sha256: str
+) -> UploadSession:
+    _sweep_expired()
+    session = UploadSession(
+        upload_id=str(uuid.uuid4()),
+        user_id=user_id,
+        filename=os.path.basename(filename),
+        content_type=content_type,
+        size=size,
+        sha256=sha256.lower(),
+        created_at=time.time(),
+    )
+    open(session.data_path, "wb").close()
+    session.save()
+    return session
+
+
+async def create_upload_session(
+    user_id: str, filename: str, content_type: str, size: int, sha256: str
+) -> UploadSession:
+    if content_type not in IMAGE_MIME_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid image format. Allowed formats: JPEG, PNG, GIF, WEBP.",
+        )
+    if size > UPLOAD_SESSION_MAX_BYTES:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"File larger than {UPLOAD_SESSION_MAX_BYTES} bytes.",
+        )
+    return await run_io(
+        _create_session_sync, user_id, filename, content_type, size, sha256
+    )
+
+
+def _load_session_sync(upload_id: str, user_id: str) -> UploadSession:
+    try:
+        # Only ids we generated; also keeps the id from escaping the directory
+        upload_id = str(uuid.UUID(upload_id))
+        with open(_meta_path(upload_id)) as f:
+            session = UploadSession(**json.load(f))
+    except (ValueError, OSError):
+        session = None
+    if session is None or session.user_id != user_id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Upload session not found"
+        )
+    if session.expires_at < time.time():
+        session.remove()
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE, detail="Upload session expired"
+        )
+    return session
+
+
+def _get_sync(upload_id: str, user_id: str) -> UploadSession:
+    with _session_lock(upload_id):
+        return _load_session_sync(upload_id, user_id)
+
+
+async def get_upload_session(upload_id: str, user_id: str) -> UploadSession:
+    return await run_io(_get_sync, upload_id, user_id)
+
+
+def _file_sha256(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def _append_chunk_sync(
+    upload_id: str, user_id: str, offset: int, chunk: bytes, chunk_sha256: str | None
+) -> UploadSession:
+    with _session_lock(upload_id):
+        return _append_chunk_locked(upload_id, user_id, offset, chunk, chunk_sha256)
+
+
+def _append_chunk_locked(
+    upload_id: str, user_id: str, offset: int, chunk: bytes, chunk_sha256: str | None
+) -> UploadSession:
+    session = _load_session_sync(upload_id, user_id)
+    if session.completed:
+        return session
+
+    current = session.offset
+    if offset > current:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={"msg": "Offset mismatch. Resume from offset.", "offset": current},
+        )
+    if offset + len(chunk) > session.size:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Chunk goes past the declared file size.",
+        )
+    if chunk_sha256 and hashlib.sha256(chunk).hexdigest() != chunk_sha256.lower():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"msg": "Chunk checksum mismatch. Resend it.", "offset": current},
+        )
+
+    with open(session.data_path, "r+b") as f:
+        f.seek(offset)
+        f.write(chunk)
+        if UPLOAD_FSYNC != "none":
+            # An acknowledged chunk must still be there after a crash
+            f.flush()
+            os.fsync(f.fileno())
+
+    if session.offset == session.size:
+        if _file_sha256(session.data_path) != session.sha256:
+            # Per-chunk checksums catch this earlier; without them start over
+            open(session.data_path, "wb").close()
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail={"msg": "File checksum mismatch. Upload again.", "offset": 0},
+            )
+        session.completed = True
+        session.save()
+    return session
+
+
+async def append_upload_chunk(
+    upload_id: str,
+    user_id: str,
+    offset: int,
+    chunk: bytes,
+    chunk_sha256: str | None = None,
+) -> UploadSession:
+    return await run_io(
+        _append_chunk_sync, upload_id, user_id, offset, chunk, chunk_sha256
+    )
+
+
+def _delete_sync(upload_id: str, user_id: str) -> None:
+    with _session_lock(upload_id):
+        _load_session_sync(upload_id, user_id).remove()
+
+
+async def delete_upload_session(upload_id: str, user_id: str) -> None:
+    await run_io(_delete_sync, upload_id, user_id)
+
+
+def _claim_sync(upload_id: str, user_id: str, dest_dir: str, candidate_id, prefix):
+    with _session_lock(upload_id):
+        return _claim_locked(upload_id, user_id, dest_dir, candidate_id, prefix)
+
+
+def _claim_locked(upload_id: str, user_id: str, dest_dir: str, candidate_id, prefix):
+    session = _load_session_sync(upload_id, user_id)
+    if not session.completed:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "msg": f"Upload {upload_id} is not complete.",
+                "offset": session.offset,
+            },
+        )
+    os.makedirs(dest_dir, exist_ok=True)
+    filename = image_upload_filename(session.filename, candidate_id, prefix)
+    dest_path = normalize_path(os.path.join(dest_dir, filename))
+    # Same filesystem as the rest of uploads/, so this is a rename, not a copy
+    os.replace(session.data_path, dest_path)
+    session.remove()
+    return get_relative_upload_path(dest_path)
+
+
+async def save_image_from_upload_session(
+    store_id: str,
+    upload_id: str,
+    user_id: str,
+    candidate_id: str | None = None,
+    isVerify: bool = False,
+    isLaptopIssuance: bool = False,
+    prefix: str | None = None,
+) -> str:
+    """save_image_file() for a completed upload session; returns the same path."""
+    dest_dir = image_upload_dir(store_id, isVerify, isLaptopIssuance)
+    return await run_io(_claim_sync, upload_id, user_id, dest_dir, candidate_id, prefix)
@@ -0,0 +1,173 @@
+import base64
+import html
+import mimetypes
+import os
+import re
+from collections.abc import Iterable, Mapping
+from threading import Lock
+from typing import Any
+
+from pydantic import BaseModel
+
+from models.schemas.otp_schemas import AdminOTPPayload, CandidateInOtp
+from utils.log_config import logger
+
+SERVICE_DIR = os.path.dirname(os.path.abspath(__file__))
+TEMPLATES_DIR = os.path.join(SERVICE_DIR, "templates")
+SERVER_DIR = os.path.dirname(os.path.dirname(SERVICE_DIR))
+
+# Static files that templates may embed as data URIs via {{ asset.<name> }}.
+EMAIL_ASSETS = {
+    "qr": os.path.join(SERVER_DIR, "qr.png"),
+}
+
+# Payload model of each typed template; every field a template uses must exist
+# on it, checked when the templates are loaded.
+TEMPLATE_PAYLOADS: dict[str, type[BaseModel]] = {
+    "candidate_otp": CandidateInOtp,
+    "admin_otp": AdminOTPPayload,
+}
+
+_PLACEHOLDER = re.compile(r"\{\{\s*([a-zA-Z_][a-zA-Z0-9_.]*)\s*\}\}")
+
+
+class CompiledTemplate:
+    """
+    A template split once into static chunks and field names.
+    Rendering only escapes the field values and joins the parts.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        source: str,
+        assets: Mapping[str, str] | None = None,
+        autoescape: bool = True,
+    ):
+        self.name = name
+        self.autoescape = autoescape
+        assets = assets or {}
+        self.parts: list[str] = []
+        self.fields: list[str] = []
+
+        static: list[str] = []
+        last = 0
+        for match in _PLACEHOLDER.finditer(source):
+            static.append(source[last : match.start()])
+            key = match.group(1)
+            if key.startswith("asset."):
+                asset_name = key.split(".", 1)[1]
+                if asset_name not in assets:
+                    raise KeyError(f"Unknown email asset '{asset_name}' in {name}")
+                # Assets are constant, fold them into the static text.
+                static.append(assets[asset_name])
+            else:
+                self.parts.append("".join(static))
+                self.fields.append(key)
+                static = []
+            last = match.end()
+        static.append(source[last:])
+        self.parts.append("".join(static))
+
+    def render(self, context: Mapping[str, Any]) -> str:
+        out = [self.parts[0]]
+        for field, static in zip(self.fields, self.parts[1:]):
+            if field not in context:
+                raise KeyError(f"No value for '{field}' in email template {self.name}")
+            value = context[field]
+            value = "" if value is None else str(value)
+            out.append(html.escape(value) if self.autoescape else value)
+            out.append(static)
+        return "".join(out)
+
+
+class EmailTemplateRegistry:
+    def __init__(
+        self,
+        templates_dir: str,
+        assets: Mapping[str, str],
+        payloads: Mapping[str, type[BaseModel]] | None = None,
+    ):
+        self.templates_dir = templates_dir
+        self.asset_paths = dict(assets)
+        self.payloads = dict(payloads or {})
+        self._templates: dict[str, CompiledTemplate] = {}
+        self._lock = Lock()
+
+    @property
+    def is_loaded(self) -> bool:
+        return bool(self._templates)
+
+    def _load_assets(self) -> dict[str, str]:
+        assets = {}
+        for name, path in self.asset_paths.items():
+            if not os.path.exists(path):
+                logger.warning(f"Email asset '{name}' not found at {path}")
+                continue
+            mime = mimetypes.guess_type(path)[0] or "application/octet-stream"
+            with open(path, "rb") as f:
+                b64 = base64.b64encode(f.read()).decode()
+            assets[name] = f"data:{mime};base64,{b64}"
+        return assets
+
+    def load(self) -> None:
+        """Read and compile every template in the directory. Safe to call again."""
+        with self._lock:
+            assets = self._load_assets()
+            templates = {}
+            for filename in sorted(os.listdir(self.templates_dir)):
+                if not filename.endswith(".html"):
+                    continue
+                name = filename.rsplit(".", 1)[0]
+                with open(
+                    os.path.join(self.templates_dir, filename), encoding="utf-8"
+                ) as f:
+                    templates[name] = CompiledTemplate(name, f.read(), assets)
+            for name, model in self.payloads.items():
+                if name not in templates:
+                    raise KeyError(f"Email template '{name}' not found")
+                missing = set(templates[name].fields) - set(model.model_fields)
+                if missing:
+                    raise KeyError(
+                        f"Email template {name} uses {sorted(missing)}, "
+                        f"which {model.__name__} does not have"
+                    )
+            self._templates = templates
+
+    def get(self, name: str) -> CompiledTemplate:
+        if not self._templates:
+            self.load()
+        template = self._templates.get(name)
+        if template is None:
+            raise KeyError(f"Email template '{name}' not found")
+        return template
+
+    def render(self, name: str, payload: BaseModel | Mapping[str, Any]) -> str:
+        context = payload.model_dump() if isinstance(payload, BaseModel) else payload
+        return self.get(name).render(context)
+
+    def render_batch(
+        self, name: str, payloads: Iterable[BaseModel | Mapping[str, Any]]
+    ) -> list[str]:
+        template = self.get(name)
+        return [
+            template.render(p.model_dump() if isinstance(p, BaseModel) else p)
+            for p in payloads
+        ]
+
+
+email_templates = EmailTemplateRegistry(TEMPLATES_DIR, EMAIL_ASSETS, TEMPLATE_PAYLOADS)
+
+
+def render_candidate_otp(payload: CandidateInOtp) -> str:
+    return email_templates.render("candidate_otp", payload)
+
+
+def render_admin_otp(payload: AdminOTPPayload) -> str:
+    return email_templates.render("admin_otp", payload)
+
+
+def render_password_reset(full_name: str, otp: str) -> str:
+    return email_templates.render(
+        "password_reset", {"full_name": full_name, "otp": otp}
+    )
@@ -0,0 +1,77 @@
+"""Cascaded face detection, cheapest detector first."""
+
+import os
+import time
+
+import numpy as np
+
+from services.verification_service.face_metrics import face_metrics
+from services.verification_service.face_runtime import (
+    FACE_DETECTOR_BACKEND,
+    get_cv2,
+    get_deepface,
+)
+
+FACE_DETECTOR_CASCADE = tuple(
+    backend.strip()
+    for backend in os.getenv(
+        "FACE_DETECTOR_CASCADE", f"{FACE_DETECTOR_BACKEND},retinaface"
+    ).split(",")
+    if backend.strip()
+)
+
+
+def run_detector(detector_backend: str, image: np.ndarray) -> list[dict]:
+    try:
+        face_objs = get_deepface().extract_faces(
+            img_path=image,
+            detector_backend=detector_backend,
+            enforce_detection=True,
+            align=True,
+        )
+    except ValueError:
+        # DeepFace signals "no face" with ValueError
+        return []
+    return face_objs
+
+
+def detect_faces_in_image(
+    image: np.ndarray, cascade: tuple[str, ...] | None = None
+) -> list[dict]:
+    """
+    DeepFace face objects ("face": aligned RGB in [0, 1], "facial_area") from
+    a decoded BGR image.
+    Raises ValueError when no stage finds a face. When every stage that found
+    faces found several, the last (most accurate) of them wins.
+    """
+    start = time.perf_counter()
+    best: list[dict] = []
+    for detector_backend in cascade or FACE_DETECTOR_CASCADE:
+        stage_start = time.perf_counter()
+        faces = run_detector(detector_backend, image)
+        outcome = "none" if not faces else "single" if len(faces) == 1 else "multiple"
+        face_metrics.record(
+            f"detect.{detector_backend}", time.perf_counter() - stage_start, outcome
+        )
+        if len(faces) == 1:
+            face_metrics.record(
+                "detect", time.perf_counter() - start, f"resolved_by_{detector_backend}"
+            )
+            return faces
+        if faces:
+            best = faces
+
+    face_metrics.record(
+        "detect", time.perf_counter() - start, "multiple" if best else "no_face"
+    )
+    if not best:
+        raise ValueError("Face could not be detected")
+    return best
+
+
+def detect_faces(img_path: str, cascade: tuple[str, ...] | None = None) -> list[dict]:
+    """Decode once, then run the cascade on the pixels."""
+    image = get_cv2().imread(img_path)
+    if image is None:
+        raise ValueError(f"Could not decode image {img_path}")
+    return detect_faces_in_image(image, cascade)
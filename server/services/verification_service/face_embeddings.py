@@ -0,0 +1,146 @@
+"""ArcFace embedding backends: deepface, onnx and onnx-int8."""
+
+import os
+import threading
+import time
+
+import numpy as np
+
+from services.verification_service.face_detection import detect_faces
+from services.verification_service.face_runtime import (
+    get_deepface,
+    get_face_model,
+    load_timings,
+)
+from utils.log_config import logger
+
+FACE_EMBEDDING_BACKEND = os.getenv("FACE_EMBEDDING_BACKEND", "deepface")
+# 0 lets ONNX Runtime use every physical core
+FACE_ONNX_THREADS = int(os.getenv("FACE_ONNX_THREADS", "0"))
+
+EMBEDDING_BACKENDS = ("deepface", "onnx", "onnx-int8")
+ONNX_MODEL_FILES = {"onnx": "arcface.onnx", "onnx-int8": "arcface.int8.onnx"}
+ARCFACE_INPUT_SIZE = (112, 112)
+
+
+def onnx_model_path(backend_name: str) -> str:
+    """Exported models sit next to DeepFace's own weights (honours DEEPFACE_HOME)."""
+    home = os.getenv("DEEPFACE_HOME", os.path.expanduser("~"))
+    return os.path.join(home, ".deepface", "weights", ONNX_MODEL_FILES[backend_name])
+
+
+class EmbeddingBackend:
+    name = "base"
+
+    def embed(self, faces: np.ndarray) -> np.ndarray:
+        """(N, 112, 112, 3) float32 BGR faces in [0, 1] -> (N, 512) embeddings."""
+        raise NotImplementedError
+
+
+class DeepFaceEmbeddingBackend(EmbeddingBackend):
+    name = "deepface"
+
+    def __init__(self):
+        self.model = get_face_model().model
+
+    def embed(self, faces: np.ndarray) -> np.ndarray:
+        return self.model(faces, training=False).numpy()
+
+
+class OnnxEmbeddingBackend(EmbeddingBackend):
+    def __init__(self, name: str, model_path: str):
+        import onnxruntime as ort
+
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(
+                f"{model_path} not found - run `python arcface_onnx.py export"
+                f"{' --quantize' if name == 'onnx-int8' else ''}` first"
+            )
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if FACE_ONNX_THREADS:
+            options.intra_op_num_threads = FACE_ONNX_THREADS
+        self.name = name
+        self.session = ort.InferenceSession(
+            model_path, sess_options=options, providers=["CPUExecutionProvider"]
+        )
+        self.input_name = self.session.get_inputs()[0].name
+
+    def embed(self, faces: np.ndarray) -> np.ndarray:
+        return self.session.run(
+            None, {self.input_name: faces.astype(np.float32, copy=False)}
+        )[0]
+
+
+_backends: dict[str, EmbeddingBackend] = {}
+_lock = threading.Lock()
+
+
+def get_embedding_backend(name: str | None = None) -> EmbeddingBackend:
+    name = name or FACE_EMBEDDING_BACKEND
+    if name not in EMBEDDING_BACKENDS:
+        raise ValueError(
+            f"Unknown embedding backend '{name}', expected one of {EMBEDDING_BACKENDS}"
+        )
+    backend = _backends.get(name)
+    if backend is None:
+        with _lock:
+            backend = _backends.get(name)
+            if backend is None:
+                start = time.perf_counter()
+                if name == "deepface":
+                    backend = DeepFaceEmbeddingBackend()
+                else:
+                    backend = OnnxEmbeddingBackend(name, onnx_model_path(name))
+                load_timings[f"embedding_backend_{name}"] = time.perf_counter() - start
+                logger.info(
+                    f"Embedding backend {name} ready in "
+                    f"{load_timings[f'embedding_backend_{name}']:.2f}s"
+                )
+                _backends[name] = backend
+    return backend
+
+
+def preprocess_faces(faces: list[np.ndarray]) -> np.ndarray:
+    """Same steps as DeepFace.represent: RGB->BGR, pad-resize to 112x112."""
+    get_deepface()
+    from deepface.modules import preprocessing
+
+    batch = [
+        preprocessing.resize_image(
+            img=face[:, :, ::-1], target_size=ARCFACE_INPUT_SIZE
+        )[0]
+        for face in faces
+    ]
+    return np.stack(batch).astype(np.float32)
+
+
+def cosine_distances(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    a = a / np.linalg.norm(a, axis=1, keepdims=True)
+    b = b / np.linalg.norm(b, axis=1, keepdims=True)
+    return 1.0 - a @ b.T
+
+
+def face_distance(
+    faces1: list[np.ndarray], faces2: list[np.ndarray], backend_name: str | None = None
+) -> float:
+    """
+    Smallest cosine distance between any face of the first image and any face
+    of the second, as DeepFace.verify computes it. All faces go in one batch.
+    """
+    embeddings = get_embedding_backend(backend_name).embed(
+        preprocess_faces(faces1 + faces2)
+    )
+    distances = cosine_distances(embeddings[: len(faces1)], embeddings[len(faces1) :])
+    return float(distances.min())
+
+
+def face_pair_distance(
+    img1_path: str,
+    img2_path: str,
+    backend_name: str | None = None,
+    cascade: tuple[str, ...] | None = None,
+) -> float:
+    faces1 = [f["face"] for f in detect_faces(img1_path, cascade)]
+    faces2 = [f["face"] for f in detect_faces(img2_path, cascade)]
+    return face_distance(faces1, faces2, backend_name)
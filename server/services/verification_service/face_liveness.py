@@ -0,0 +1,127 @@
+"""Liveness (anti-spoofing) check, run alongside the face match."""
+
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass
+
+import numpy as np
+
+from services.verification_service.face_metrics import face_metrics
+from services.verification_service.face_runtime import get_spoof_model
+from utils.log_config import logger
+
+FACE_LIVENESS_ENABLED = os.getenv("FACE_LIVENESS_ENABLED", "true").lower() == "true"
+FACE_LIVENESS_BUDGET_MS = float(os.getenv("FACE_LIVENESS_BUDGET_MS", "1500"))
+# Whether a timed-out or failed check rejects the match ("reject") or not ("allow")
+FACE_LIVENESS_ON_UNAVAILABLE = os.getenv("FACE_LIVENESS_ON_UNAVAILABLE", "reject")
+FACE_LIVENESS_WORKERS = int(os.getenv("FACE_LIVENESS_WORKERS", "2"))
+# Checks past this many queued or running count as a timeout
+FACE_LIVENESS_MAX_PENDING = int(
+    os.getenv("FACE_LIVENESS_MAX_PENDING", str(max(1, FACE_LIVENESS_WORKERS) * 2))
+)
+
+SPOOF_REASON = (
+    "Spoof detected with beneficiary photo. Photo is not captured in realtime."
+)
+
+_pool = ThreadPoolExecutor(
+    max_workers=max(1, FACE_LIVENESS_WORKERS), thread_name_prefix="liveness"
+)
+_pending = 0
+_pending_lock = threading.Lock()
+
+
+def _release(_future: Future) -> None:
+    global _pending
+    with _pending_lock:
+        _pending -= 1
+
+
+@dataclass
+class LivenessResult:
+    outcome: str  # real | spoof | timeout | error
+    score: float | None = None
+
+    @property
+    def rejected(self) -> bool:
+        if self.outcome == "spoof":
+            return True
+        if self.outcome in ("timeout", "error"):
+            return FACE_LIVENESS_ON_UNAVAILABLE == "reject"
+        return False
+
+    def as_dict(self) -> dict:
+        return {"outcome": self.outcome, "score": self.score}
+
+
+def check_liveness(image: np.ndarray, facial_area: dict) -> LivenessResult:
+    start = time.perf_counter()
+    try:
+        is_real, score = get_spoof_model().analyze(
+            img=image,
+            facial_area=(
+                facial_area["x"],
+                facial_area["y"],
+                facial_area["w"],
+                facial_area["h"],
+            ),
+        )
+        result = LivenessResult("real" if is_real else "spoof", float(score))
+    except Exception as e:
+        logger.error(f"Liveness check failed - {e}")
+        result = LivenessResult("error")
+    face_metrics.record("liveness.model", time.perf_counter() - start, result.outcome)
+    return result
+
+
+def start_liveness_check(
+    image: np.ndarray, face_objs: list[dict]
+) -> tuple[Future, float] | None:
+    """Submit the check for the largest face; returns (future, submitted_at)."""
+    if not FACE_LIVENESS_ENABLED:
+        return None
+    global _pending
+    area = max((f["facial_area"] for f in face_objs), key=lambda a: a["w"] * a["h"])
+    with _pending_lock:
+        full = _pending >= FACE_LIVENESS_MAX_PENDING
+        if not full:
+            _pending += 1
+    if full:
+        # Queueing behind checks that will miss their budget anyway only makes
+        # every later check miss it too
+        logger.warning(
+            f"Liveness queue full ({FACE_LIVENESS_MAX_PENDING} pending), not checking"
+        )
+        face_metrics.record("liveness.shed", 0.0, "timeout")
+        future: Future = Future()
+        future.set_result(LivenessResult("timeout"))
+        return future, time.perf_counter()
+    future = _pool.submit(check_liveness, image, area)
+    future.add_done_callback(_release)
+    return future, time.perf_counter()
+
+
+def wait_for_liveness(pending: tuple[Future, float] | None) -> LivenessResult | None:
+    """
+    Wait for the rest of the budget. The time recorded here is the latency
+    liveness adds on top of detection + embedding.
+    """
+    if pending is None:
+        return None
+    future, submitted_at = pending
+    remaining = FACE_LIVENESS_BUDGET_MS / 1000 - (time.perf_counter() - submitted_at)
+    wait_start = time.perf_counter()
+    try:
+        result = future.result(timeout=max(0.0, remaining))
+    except FutureTimeoutError:
+        # The check keeps running in its thread; only its verdict is dropped
+        result = LivenessResult("timeout")
+    # "liveness" counts verdicts as the pipeline saw them, timeouts included
+    face_metrics.record("liveness", time.perf_counter() - wait_start, result.outcome)
+    if result.outcome in ("timeout", "error") and not result.rejected:
+        logger.warning(f"Liveness {result.outcome}, match allowed without a verdict")
+        face_metrics.record("liveness.fail_open", 0.0, result.outcome)
+    return result
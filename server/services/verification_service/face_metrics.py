@@ -0,0 +1,49 @@
+"""Per-stage face pipeline timings, served by GET /metrics/face."""
+
+import threading
+from collections import Counter
+from typing import Any
+
+
+class StageStats:
+    __slots__ = ("count", "total", "max", "outcomes")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.outcomes: Counter[str] = Counter()
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total / self.count * 1000, 2) if self.count else 0.0,
+            "max_ms": round(self.max * 1000, 2),
+            "outcomes": dict(self.outcomes),
+            "rates": {
+                outcome: round(n / self.count, 4)
+                for outcome, n in self.outcomes.items()
+            },
+        }
+
+
+class FaceStageMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stages: dict[str, StageStats] = {}
+
+    def record(self, stage: str, seconds: float, outcome: str = "ok") -> None:
+        with self._lock:
+            stats = self._stages.setdefault(stage, StageStats())
+            stats.count += 1
+            stats.total += seconds
+            if seconds > stats.max:
+                stats.max = seconds
+            stats.outcomes[outcome] += 1
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        with self._lock:
+            return {name: s.as_dict() for name, s in sorted(self._stages.items())}
+
+
+face_metrics = FaceStageMetrics()
@@ -0,0 +1,136 @@
+"""Image-quality checks that give a retake reason before the face match."""
+
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+import numpy as np
+
+from services.verification_service.face_detection import run_detector
+from services.verification_service.face_metrics import face_metrics
+from services.verification_service.face_runtime import get_cv2
+
+FACE_QUALITY_GATE = os.getenv("FACE_QUALITY_GATE", "true").lower() == "true"
+MIN_IMAGE_SIDE_PX = int(os.getenv("FACE_QUALITY_MIN_IMAGE_SIDE_PX", "240"))
+MIN_FACE_SIDE_PX = int(os.getenv("FACE_QUALITY_MIN_FACE_SIDE_PX", "80"))
+MIN_FACE_SHARPNESS = float(os.getenv("FACE_QUALITY_MIN_SHARPNESS", "25"))
+MIN_MEAN_BRIGHTNESS = float(os.getenv("FACE_QUALITY_MIN_BRIGHTNESS", "50"))
+MAX_MEAN_BRIGHTNESS = float(os.getenv("FACE_QUALITY_MAX_BRIGHTNESS", "210"))
+MAX_CLIPPED_FRACTION = float(os.getenv("FACE_QUALITY_MAX_CLIPPED_FRACTION", "0.4"))
+
+# Frames are measured at this width so thresholds don't depend on the camera
+ANALYSIS_WIDTH = 640
+FACE_ANALYSIS_SIZE = (160, 160)
+
+RETAKE_REASONS = {
+    "low_resolution": "IMAGE RESOLUTION TOO LOW. RETAKE",
+    "too_dark": "IMAGE TOO DARK. IMPROVE LIGHTING AND RETAKE",
+    "too_bright": "IMAGE TOO BRIGHT OR GLARE ON FACE. RETAKE",
+    "face_too_small": "FACE TOO SMALL. MOVE CLOSER AND RETAKE",
+    "blurry": "IMAGE TOO BLURRY. HOLD STILL AND RETAKE",
+    "sideways": "PHOTO IS SIDEWAYS. HOLD THE CAMERA UPRIGHT AND RETAKE",
+}
+
+
+@dataclass
+class QualityReport:
+    code: str = "pass"
+    measurements: dict[str, float] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return self.code == "pass"
+
+    @property
+    def reason(self) -> str | None:
+        return RETAKE_REASONS.get(self.code)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {"code": self.code, "reason": self.reason, **self.measurements}
+
+
+def decode_image(path: str) -> np.ndarray:
+    """BGR pixels with EXIF orientation applied; PIL covers what OpenCV can't read."""
+    image = get_cv2().imread(path)
+    if image is not None:
+        return image
+    from PIL import Image, ImageOps
+
+    with Image.open(path) as img:
+        rgb = ImageOps.exif_transpose(img).convert("RGB")
+    return np.ascontiguousarray(np.asarray(rgb)[:, :, ::-1])
+
+
+def _gray(image: np.ndarray) -> np.ndarray:
+    cv2 = get_cv2()
+    return cv2.cvtColor(np.ascontiguousarray(image), cv2.COLOR_BGR2GRAY)
+
+
+def check_frame_quality(image: np.ndarray) -> QualityReport:
+    """Resolution and exposure of the whole frame."""
+    start = time.perf_counter()
+    report = QualityReport()
+    if not FACE_QUALITY_GATE:
+        return report
+    height, width = image.shape[:2]
+    report.measurements["min_side_px"] = min(height, width)
+
+    if min(height, width) < MIN_IMAGE_SIDE_PX:
+        report.code = "low_resolution"
+    else:
+        # A strided view is plenty for a histogram and skips a full-size resize
+        step = max(1, width // ANALYSIS_WIDTH)
+        hist = np.bincount(_gray(image[::step, ::step]).ravel(), minlength=256)
+        total = int(hist.sum())
+        mean = float(hist @ np.arange(256)) / total
+        dark = float(hist[:16].sum()) / total
+        bright = float(hist[240:].sum()) / total
+        report.measurements.update(
+            mean_brightness=round(mean, 1),
+            dark_fraction=round(dark, 3),
+            bright_fraction=round(bright, 3),
+        )
+        if mean < MIN_MEAN_BRIGHTNESS or dark > MAX_CLIPPED_FRACTION:
+            report.code = "too_dark"
+        elif mean > MAX_MEAN_BRIGHTNESS or bright > MAX_CLIPPED_FRACTION:
+            report.code = "too_bright"
+
+    face_metrics.record("quality.frame", time.perf_counter() - start, report.code)
+    return report
+
+
+def check_face_quality(image: np.ndarray, face_objs: list[dict]) -> QualityReport:
+    """Size and sharpness (Laplacian variance) of the largest detected face."""
+    start = time.perf_counter()
+    report = QualityReport()
+    if not FACE_QUALITY_GATE:
+        return report
+    area = max((f["facial_area"] for f in face_objs), key=lambda a: a["w"] * a["h"])
+    report.measurements["face_side_px"] = min(area["w"], area["h"])
+
+    if min(area["w"], area["h"]) < MIN_FACE_SIDE_PX:
+        report.code = "face_too_small"
+    else:
+        cv2 = get_cv2()
+        x, y, w, h = area["x"], area["y"], area["w"], area["h"]
+        crop = cv2.resize(
+            _gray(image[y : y + h, x : x + w]),
+            FACE_ANALYSIS_SIZE,
+            interpolation=cv2.INTER_AREA,
+        )
+        sharpness = float(cv2.Laplacian(crop, cv2.CV_64F).var())
+        report.measurements["sharpness"] = round(sharpness, 1)
+        if sharpness < MIN_FACE_SHARPNESS:
+            report.code = "blurry"
+
+    face_metrics.record("quality.face", time.perf_counter() - start, report.code)
+    return report
+
+
+def is_sideways(image: np.ndarray, detector_backend: str) -> bool:
+    """After an upright miss: does the cheap detector find a face at +/-90 degrees?"""
+    return any(
+        run_detector(detector_backend, np.ascontiguousarray(np.rot90(image, k)))
+        for k in (1, 3)
+    )
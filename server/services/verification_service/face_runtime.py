@@ -0,0 +1,110 @@
+"""Deferred imports of deepface / cv2, loaded on first use."""
+
+import os
+import threading
+import time
+from typing import Any
+
+from utils.log_config import logger
+
+FACE_MODEL_NAME = "ArcFace"
+FACE_SPOOF_MODEL_NAME = "Fasnet"
+FACE_DETECTOR_BACKEND = "opencv"
+# Max cosine distance between ArcFace embeddings still accepted as a match
+FACE_MATCH_THRESHOLD = float(os.getenv("FACE_MATCH_THRESHOLD", "0.53"))
+
+# Modules that must not be imported just by loading the API (see check_import_time.py)
+HEAVY_MODULES = ("deepface", "tensorflow", "tf_keras", "torch", "cv2")
+
+_lock = threading.RLock()
+_deepface: Any = None
+_cv2: Any = None
+_face_model: Any = None
+_spoof_model: Any = None
+
+# Seconds spent in each loading step, reported by the readiness checks
+load_timings: dict[str, float] = {}
+
+
+def get_cv2():
+    global _cv2
+    if _cv2 is None:
+        with _lock:
+            if _cv2 is None:
+                start = time.perf_counter()
+                import cv2
+
+                load_timings["import_cv2"] = time.perf_counter() - start
+                _cv2 = cv2
+    return _cv2
+
+
+def get_deepface():
+    global _deepface
+    if _deepface is None:
+        with _lock:
+            if _deepface is None:
+                start = time.perf_counter()
+                from deepface import DeepFace
+
+                load_timings["import_deepface"] = time.perf_counter() - start
+                logger.info(
+                    f"DeepFace imported in {load_timings['import_deepface']:.2f}s"
+                )
+                _deepface = DeepFace
+    return _deepface
+
+
+def get_face_model():
+    global _face_model
+    if _face_model is None:
+        DeepFace = get_deepface()
+        with _lock:
+            if _face_model is None:
+                start = time.perf_counter()
+                _face_model = DeepFace.build_model(FACE_MODEL_NAME)
+                load_timings["build_face_model"] = time.perf_counter() - start
+                logger.info(
+                    f"{FACE_MODEL_NAME} built in {load_timings['build_face_model']:.2f}s"
+                )
+    return _face_model
+
+
+def get_spoof_model():
+    """DeepFace's Fasnet anti-spoofing model (PyTorch)."""
+    global _spoof_model
+    if _spoof_model is None:
+        get_deepface()
+        with _lock:
+            if _spoof_model is None:
+                from deepface.modules import modeling
+
+                start = time.perf_counter()
+                _spoof_model = modeling.build_model(
+                    task="spoofing", model_name=FACE_SPOOF_MODEL_NAME
+                )
+                load_timings["build_spoof_model"] = time.perf_counter() - start
+                logger.info(
+                    f"{FACE_SPOOF_MODEL_NAME} built in "
+                    f"{load_timings['build_spoof_model']:.2f}s"
+                )
+    return _spoof_model
+
+
+def is_face_runtime_loaded() -> bool:
+    from services.verification_service.face_embeddings import _backends
+
+    return _deepface is not None and bool(_backends)
+
+
+def load_face_runtime() -> dict[str, float]:
+    """Import the ML stack and build the embedding backend now instead of on first request."""
+    from services.verification_service.face_embeddings import get_embedding_backend
+    from services.verification_service.face_liveness import FACE_LIVENESS_ENABLED
+
+    get_cv2()
+    get_deepface()
+    get_embedding_backend()
+    if FACE_LIVENESS_ENABLED:
+        get_spoof_model()
+    return dict(load_timings)
@@ -0,0 +1,100 @@
+"""
+Face match pipeline for store verification.
+
+    decode -> frame quality -> detection cascade -> face quality
+           -> [liveness || reference detection + embed] -> distance
+
+Each image is decoded once and passed along as pixels. Only the uploaded
+capture goes through the quality gate and the liveness check (the registered
+photo is what it is), and a capture that fails the gate returns a retake
+reason without reaching ArcFace.
+"""
+
+import time
+from typing import Any
+
+from services.verification_service.face_detection import (
+    FACE_DETECTOR_CASCADE,
+    detect_faces_in_image,
+)
+from services.verification_service.face_embeddings import face_distance
+from services.verification_service.face_liveness import (
+    SPOOF_REASON,
+    start_liveness_check,
+    wait_for_liveness,
+)
+from services.verification_service.face_metrics import face_metrics
+from services.verification_service.face_quality import (
+    QualityReport,
+    check_face_quality,
+    check_frame_quality,
+    decode_image,
+    is_sideways,
+)
+from services.verification_service.face_runtime import FACE_MATCH_THRESHOLD
+
+
+def _rejected(report: QualityReport) -> dict[str, Any]:
+    return {
+        "verified": False,
+        "distance": None,
+        "reason": report.reason,
+        "quality": report.as_dict(),
+    }
+
+
+def verify_face_pair(uploaded_path: str, reference_path: str) -> dict[str, Any]:
+    """
+    Returns {"verified", "distance", "reason", "quality", "liveness"}.
+    Raises ValueError when no face can be found in either image.
+    """
+    start = time.perf_counter()
+    uploaded = decode_image(uploaded_path)
+
+    report = check_frame_quality(uploaded)
+    if not report.ok:
+        return _rejected(report)
+
+    try:
+        uploaded_faces = detect_faces_in_image(uploaded)
+    except ValueError:
+        if is_sideways(uploaded, FACE_DETECTOR_CASCADE[0]):
+            return _rejected(QualityReport(code="sideways"))
+        raise
+
+    report = check_face_quality(uploaded, uploaded_faces)
+    if not report.ok:
+        return _rejected(report)
+
+    liveness_pending = start_liveness_check(uploaded, uploaded_faces)
+    try:
+        reference_faces = detect_faces_in_image(decode_image(reference_path))
+
+        embed_start = time.perf_counter()
+        distance = face_distance(
+            [f["face"] for f in uploaded_faces], [f["face"] for f in reference_faces]
+        )
+        face_metrics.record("embed", time.perf_counter() - embed_start)
+    except Exception:
+        if liveness_pending:
+            liveness_pending[0].cancel()
+        raise
+    liveness = wait_for_liveness(liveness_pending)
+
+    matched = distance <= FACE_MATCH_THRESHOLD
+    spoofed = liveness is not None and liveness.rejected
+    verified = matched and not spoofed
+    face_metrics.record(
+        "match",
+        time.perf_counter() - start,
+        "spoof" if spoofed else "match" if matched else "no_match",
+    )
+    return {
+        "verified": verified,
+        "distance": distance,
+        "reason": (
+            None if verified else SPOOF_REASON if spoofed else "Face did not match"
+        ),
+        "quality": report.as_dict(),
+        "liveness": liveness.as_dict() if liveness else None,
+    }
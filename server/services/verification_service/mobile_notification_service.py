@@ -1,6 +1,7 @@
 import httpx
 import time
 import os
+from typing import Any
 from models.schemas.otp_schemas import SmsOtpPayload
 from fastapi import HTTPException, status
 from utils.log_config import logger
@@ -13,53 +14,92 @@ auth_payload = {
     "account_id": os.getenv("SMS_ACCOUNT_ID"),
 }
 auth_headers = {"Content-Type": "application/json"}
+sms_base_url = "https://mcg6x3ltbxc45628qg689txfg4dm.rest.marketingcloudapis.com/messaging/v1/sms/messages"
+sms_definition_key = "MD_LAPDIST"
+
+
+async def fetch_sms_access_token(client: httpx.AsyncClient) -> str:
+    auth_res = await client.post(auth_url, headers=auth_headers, json=auth_payload)
+    auth_res.raise_for_status()
+    return auth_res.json()["access_token"]
+
+
+# OTP sends reuse one client (kept-alive TLS connections) and one token until
+# shortly before it expires, instead of a fresh handshake + token per message.
+_sms_client: httpx.AsyncClient | None = None
+_sms_token: tuple[str, float] | None = None
+TOKEN_EXPIRY_MARGIN_SECONDS = 60
+
+
+def get_sms_client() -> httpx.AsyncClient:
+    global _sms_client
+    if _sms_client is None or _sms_client.is_closed:
+        _sms_client = httpx.AsyncClient(timeout=20)
+    return _sms_client
+
+
+async def get_sms_access_token() -> str:
+    global _sms_token
+    now = time.monotonic()
+    if _sms_token and _sms_token[1] > now:
+        return _sms_token[0]
+    auth_res = await get_sms_client().post(
+        auth_url, headers=auth_headers, json=auth_payload
+    )
+    auth_res.raise_for_status()
+    data = auth_res.json()
+    expires_in = int(data.get("expires_in", 0)) - TOKEN_EXPIRY_MARGIN_SECONDS
+    _sms_token = (data["access_token"], now + max(0, expires_in))
+    return _sms_token[0]
+
+
+async def close_sms_client():
+    global _sms_client, _sms_token
+    if _sms_client is not None:
+        await _sms_client.aclose()
+    _sms_client = None
+    _sms_token = None
 
 
 async def send_beneficiary_sms_otp(payload: SmsOtpPayload):
     try:
-        async with httpx.AsyncClient(timeout=20) as client:
-            auth_res = await client.post(
-                auth_url, headers=auth_headers, json=auth_payload
-            )
-            auth_res.raise_for_status()
-            access_token = auth_res.json()["access_token"]
-            message_key = f"otp_{int(time.time())}"
-            sms_url = f"https://mcg6x3ltbxc45628qg689txfg4dm.rest.marketingcloudapis.com/messaging/v1/sms/messages/{message_key}"
-
-            sms_headers = {
-                "Content-Type": "application/json",
-                "Authorization": f"Bearer {access_token}",
-            }
-            sms_payload = {
-                "definitionKey": "MD_LAPDIST",
-                "recipient": {
-                    "to": f"91{payload.mobile_number}",
-                    "contactKey": f"91{payload.mobile_number}",
-                    "attributes": {
-                        "message": f"Your OTP is {payload.otp} for receiving the laptop. Please do not share it with anyone, other than croma store person. Titan Company Ltd.",
-                        "FromName": "TITAN",
-                    },
+        client = get_sms_client()
+        access_token = await get_sms_access_token()
+        message_key = f"otp_{int(time.time())}"
+        sms_url = f"{sms_base_url}/{message_key}"
+
+        sms_headers = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {access_token}",
+        }
+        sms_payload = {
+            "definitionKey": sms_definition_key,
+            "recipient": {
+                "to": f"91{payload.mobile_number}",
+                "contactKey": f"91{payload.mobile_number}",
+                "attributes": {
+                    "message": f"Your OTP is {payload.otp} for receiving the laptop. Please do not share it with anyone, other than croma store person. Titan Company Ltd.",
+                    "FromName": "TITAN",
                 },
-                "subscriptions": {"resubscribe": True},
-                "content": {"message": "%%message%%"},
-            }
+            },
+            "subscriptions": {"resubscribe": True},
+            "content": {"message": "%%message%%"},
+        }
 
-            sms_response = await client.post(
-                sms_url, headers=sms_headers, json=sms_payload
-            )
+        sms_response = await client.post(sms_url, headers=sms_headers, json=sms_payload)
 
-            print("sms data", sms_response.json())
+        print("sms data", sms_response.json())
 
-            if sms_response.status_code not in (200, 202):
-                raise ValueError(
-                    f"SMS send failed: {sms_response.status_code}, {sms_response.text}"
-                )
+        if sms_response.status_code not in (200, 202):
+            raise ValueError(
+                f"SMS send failed: {sms_response.status_code}, {sms_response.text}"
+            )
 
-            return {
-                "status": sms_response.status_code,
-                "messageKey": message_key,
-                "response": sms_response.json(),
-            }
+        return {
+            "status": sms_response.status_code,
+            "messageKey": message_key,
+            "response": sms_response.json(),
+        }
 
     except Exception as e:
         # optionally wrap into your custom error
@@ -72,49 +112,43 @@ async def send_beneficiary_sms_otp(payload: SmsOtpPayload):
 
 async def send_login_sms_otp(payload: SmsOtpPayload):
     try:
-        async with httpx.AsyncClient(timeout=20) as client:
-            auth_res = await client.post(
-                auth_url, headers=auth_headers, json=auth_payload
-            )
-            auth_res.raise_for_status()
-            access_token = auth_res.json()["access_token"]
-            message_key = f"otp_{int(time.time())}"
-            sms_url = f"https://mcg6x3ltbxc45628qg689txfg4dm.rest.marketingcloudapis.com/messaging/v1/sms/messages/{message_key}"
-
-            sms_headers = {
-                "Content-Type": "application/json",
-                "Authorization": f"Bearer {access_token}",
-            }
-            sms_payload = {
-                "definitionKey": "MD_LAPDIST",
-                "recipient": {
-                    "to": f"91{payload.mobile_number}",
-                    "contactKey": f"91{payload.mobile_number}",
-                    "attributes": {
-                        "message": f"Your OTP is {payload.otp} for receiving the laptop. Please do not share it with anyone, other than croma store person. Titan Company Ltd.",
-                        "FromName": "TITAN",
-                    },
+        client = get_sms_client()
+        access_token = await get_sms_access_token()
+        message_key = f"otp_{int(time.time())}"
+        sms_url = f"{sms_base_url}/{message_key}"
+
+        sms_headers = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {access_token}",
+        }
+        sms_payload = {
+            "definitionKey": sms_definition_key,
+            "recipient": {
+                "to": f"91{payload.mobile_number}",
+                "contactKey": f"91{payload.mobile_number}",
+                "attributes": {
+                    "message": f"Your OTP is {payload.otp} for receiving the laptop. Please do not share it with anyone, other than croma store person. Titan Company Ltd.",
+                    "FromName": "TITAN",
                 },
-                "subscriptions": {"resubscribe": True},
-                "content": {"message": "%%message%%"},
-            }
+            },
+            "subscriptions": {"resubscribe": True},
+            "content": {"message": "%%message%%"},
+        }
 
-            sms_response = await client.post(
-                sms_url, headers=sms_headers, json=sms_payload
-            )
+        sms_response = await client.post(sms_url, headers=sms_headers, json=sms_payload)
 
-            print("SMS RES", sms_response.json())
+        print("SMS RES", sms_response.json())
 
-            if sms_response.status_code not in (200, 202):
-                raise ValueError(
-                    f"SMS send failed: {sms_response.status_code}, {sms_response.text}"
-                )
+        if sms_response.status_code not in (200, 202):
+            raise ValueError(
+                f"SMS send failed: {sms_response.status_code}, {sms_response.text}"
+            )
 
-            return {
-                "status": sms_response.status_code,
-                "messageKey": message_key,
-                "response": sms_response.json(),
-            }
+        return {
+            "status": sms_response.status_code,
+            "messageKey": message_key,
+            "response": sms_response.json(),
+        }
 
     except Exception as e:
         # optionally wrap into your custom error
@@ -124,3 +158,63 @@ async def send_login_sms_otp(payload: SmsOtpPayload):
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail={"msg": "OTP sending failed", "err_stack": str(e)},
         )
+
+
+async def send_bulk_sms(
+    client: httpx.AsyncClient,
+    access_token: str,
+    recipients: list[dict[str, str]],
+) -> list[dict[str, Any]]:
+    """
+    Send one request to the multi-recipient endpoint.
+    Each recipient dict needs "mobile_number", "message" and "message_key".
+    Returns one {"message_key", "success", "error"} entry per recipient.
+    """
+    sms_headers = {
+        "Content-Type": "application/json",
+        "Authorization": f"Bearer {access_token}",
+    }
+    sms_payload = {
+        "definitionKey": sms_definition_key,
+        "recipients": [
+            {
+                "to": f"91{r['mobile_number']}",
+                "contactKey": f"91{r['mobile_number']}",
+                "messageKey": r["message_key"],
+                "attributes": {"message": r["message"], "FromName": "TITAN"},
+            }
+            for r in recipients
+        ],
+        "subscriptions": {"resubscribe": True},
+        "content": {"message": "%%message%%"},
+    }
+
+    sms_response = await client.post(
+        f"{sms_base_url}/", headers=sms_headers, json=sms_payload
+    )
+    if sms_response.status_code == 401:
+        raise PermissionError("SMS access token expired")
+
+    if sms_response.status_code not in (200, 202):
+        err = f"SMS batch failed: {sms_response.status_code}, {sms_response.text}"
+        return [
+            {"message_key": r["message_key"], "success": False, "error": err}
+            for r in recipients
+        ]
+
+    # Per-recipient errors come back keyed by messageKey
+    failures = {}
+    for item in sms_response.json().get("responses", []):
+        if item.get("errorcode") or item.get("errorMessages"):
+            failures[item.get("messageKey")] = str(
+                item.get("errorMessages") or item.get("errorcode")
+            )
+
+    return [
+        {
+            "message_key": r["message_key"],
+            "success": r["message_key"] not in failures,
+            "error": failures.get(r["message_key"]),
+        }
+        for r in recipients
+    ]
@@ -0,0 +1,147 @@
+"""Single-flight result cache for the store face match and Aadhaar check."""
+
+import asyncio
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Hashable
+
+from services.verification_service.face_detection import FACE_DETECTOR_CASCADE
+from services.verification_service.face_embeddings import FACE_EMBEDDING_BACKEND
+from services.verification_service.face_liveness import FACE_LIVENESS_ENABLED
+from services.verification_service.face_metrics import face_metrics
+from services.verification_service.face_quality import FACE_QUALITY_GATE
+from services.verification_service.face_runtime import (
+    FACE_MATCH_THRESHOLD,
+    FACE_MODEL_NAME,
+)
+
+VERIFICATION_CACHE_SIZE = int(os.getenv("VERIFICATION_CACHE_SIZE", "2048"))
+VERIFICATION_CACHE_TTL_SECONDS = float(
+    os.getenv("VERIFICATION_CACHE_TTL_SECONDS", "900")
+)
+
+# Anything that can change a verdict for the same pair of images
+FACE_PIPELINE_VERSION = "|".join(
+    [
+        FACE_MODEL_NAME,
+        FACE_EMBEDDING_BACKEND,
+        ",".join(FACE_DETECTOR_CASCADE),
+        str(FACE_MATCH_THRESHOLD),
+        f"quality={FACE_QUALITY_GATE}",
+        f"liveness={FACE_LIVENESS_ENABLED}",
+    ]
+)
+
+
+class SingleFlightCache:
+    """Bounded LRU with TTL; concurrent misses for one key share one computation."""
+
+    def __init__(self, name: str, max_size: int, ttl_seconds: float):
+        self.name = name
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._in_flight: dict[Hashable, asyncio.Future] = {}
+
+    def _get(self, key: Hashable) -> tuple[bool, Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        stored_at, value = entry
+        if time.monotonic() - stored_at > self.ttl_seconds:
+            del self._entries[key]
+            return False, None
+        self._entries.move_to_end(key)
+        return True, value
+
+    def _put(self, key: Hashable, value: Any) -> None:
+        self._entries[key] = (time.monotonic(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    async def get_or_compute(
+        self,
+        key: Hashable,
+        compute: Callable[[], Awaitable[Any]],
+        cacheable: Callable[[Any], bool] = lambda value: True,
+    ) -> Any:
+        start = time.perf_counter()
+        found, value = self._get(key)
+        if found:
+            face_metrics.record(self.name, time.perf_counter() - start, "hit")
+            return value
+
+        while (pending := self._in_flight.get(key)) is not None:
+            try:
+                # shield: a cancelled duplicate must not cancel the first request
+                value = await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                # The first request was cancelled (e.g. early exit), not this one
+                if pending.cancelled() and not asyncio.current_task().cancelling():
+                    continue
+                raise
+            face_metrics.record(self.name, time.perf_counter() - start, "shared")
+            return value
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            value = await compute()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Nobody may be waiting; don't log "exception never retrieved"
+            future.exception()
+            raise
+        else:
+            future.set_result(value)
+            if cacheable(value):
+                self._put(key, value)
+        finally:
+            del self._in_flight[key]
+        face_metrics.record(self.name, time.perf_counter() - start, "miss")
+        return value
+
+
+face_result_cache = SingleFlightCache(
+    "cache.face", VERIFICATION_CACHE_SIZE, VERIFICATION_CACHE_TTL_SECONDS
+)
+aadhar_result_cache = SingleFlightCache(
+    "cache.aadhar", VERIFICATION_CACHE_SIZE, VERIFICATION_CACHE_TTL_SECONDS
+)
+
+
+@lru_cache(maxsize=4096)
+def _file_digest(path: str, size: int, mtime_ns: int) -> str:
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def file_digest(path: str) -> str:
+    """sha256 of the file; re-read only when its size or mtime changes."""
+    stat = os.stat(path)
+    return _file_digest(path, stat.st_size, stat.st_mtime_ns)
+
+
+async def face_result_key(
+    candidate_id: str, live_img_path: str, registered_img_path: str
+) -> tuple[str, str, str, str]:
+    live_digest, registered_digest = await asyncio.gather(
+        asyncio.to_thread(file_digest, live_img_path),
+        asyncio.to_thread(file_digest, registered_img_path),
+    )
+    return candidate_id, live_digest, registered_digest, FACE_PIPELINE_VERSION
+
+
+def aadhar_result_key(
+    candidate_id: str, aadhar_hash: str | None, entered_aadhar: str
+) -> tuple[str, str | None, str]:
+    # Only a digest of the entered number is kept in memory
+    entered_digest = hashlib.sha256(entered_aadhar.encode()).hexdigest()
+    return candidate_id, aadhar_hash, entered_digest
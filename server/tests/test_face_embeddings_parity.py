@@ -0,0 +1,101 @@
+"""
+ONNX embedding backends against DeepFace.verify. Fixture faces are public
+domain (scikit-image's astronaut, matplotlib's grace_hopper).
+"""
+
+import os
+
+import pytest
+
+pytest.importorskip("deepface")
+pytest.importorskip("onnxruntime")
+
+from PIL import Image, ImageEnhance, ImageOps
+
+from services.verification_service.face_embeddings import (
+    face_pair_distance,
+    onnx_model_path,
+)
+from services.verification_service.face_runtime import (
+    FACE_DETECTOR_BACKEND,
+    FACE_MATCH_THRESHOLD,
+    FACE_MODEL_NAME,
+    get_deepface,
+)
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "faces")
+PEOPLE = ("astronaut", "grace_hopper")
+VARIANTS = {
+    "original": lambda img: img,
+    "mirrored": ImageOps.mirror,
+    "brighter": lambda img: ImageEnhance.Brightness(img).enhance(1.3),
+    "darker": lambda img: ImageEnhance.Brightness(img).enhance(0.75),
+    "contrast": lambda img: ImageEnhance.Contrast(img).enhance(1.3),
+}
+# Largest |distance - DeepFace distance| each backend may show on the fixtures
+MAX_DISTANCE_DELTA = {"onnx": 0.001, "onnx-int8": 0.02}
+
+
+def arcface_weights_path() -> str:
+    home = os.getenv("DEEPFACE_HOME", os.path.expanduser("~"))
+    return os.path.join(home, ".deepface", "weights", "arcface_weights.h5")
+
+
+@pytest.fixture(scope="module")
+def pairs(tmp_path_factory) -> list[tuple[str, str]]:
+    """Every variant against the original of the same person, and across people."""
+    out_dir = tmp_path_factory.mktemp("faces")
+    paths = {}
+    for person in PEOPLE:
+        with Image.open(os.path.join(FIXTURES_DIR, f"{person}.jpg")) as img:
+            for variant, transform in VARIANTS.items():
+                path = str(out_dir / f"{person}_{variant}.jpg")
+                transform(img.convert("RGB")).save(path, quality=95)
+                paths[person, variant] = path
+
+    same = [
+        (paths[person, "original"], paths[person, variant])
+        for person in PEOPLE
+        for variant in VARIANTS
+        if variant != "original"
+    ]
+    different = [
+        (paths[PEOPLE[0], variant], paths[PEOPLE[1], variant]) for variant in VARIANTS
+    ]
+    return same + different
+
+
+@pytest.fixture(scope="module")
+def reference_distances(pairs) -> list[float]:
+    if not os.path.exists(arcface_weights_path()):
+        pytest.skip(f"{arcface_weights_path()} not downloaded")
+    DeepFace = get_deepface()
+    return [
+        DeepFace.verify(
+            img1_path=img1,
+            img2_path=img2,
+            model_name=FACE_MODEL_NAME,
+            detector_backend=FACE_DETECTOR_BACKEND,
+        )["distance"]
+        for img1, img2 in pairs
+    ]
+
+
+@pytest.mark.parametrize("backend_name", sorted(MAX_DISTANCE_DELTA))
+def test_backend_matches_deepface(backend_name, pairs, reference_distances):
+    if not os.path.exists(onnx_model_path(backend_name)):
+        pytest.skip(f"{onnx_model_path(backend_name)} not exported")
+
+    flips = []
+    max_delta = 0.0
+    for (img1, img2), reference in zip(pairs, reference_distances):
+        # Same single detector as the reference, so only the embeddings differ
+        distance = face_pair_distance(
+            img1, img2, backend_name=backend_name, cascade=(FACE_DETECTOR_BACKEND,)
+        )
+        max_delta = max(max_delta, abs(distance - reference))
+        if (distance <= FACE_MATCH_THRESHOLD) != (reference <= FACE_MATCH_THRESHOLD):
+            flips.append((img1, img2, reference, distance))
+
+    assert max_delta <= MAX_DISTANCE_DELTA[backend_name]
+    assert flips == []
@@ -6,9 +6,10 @@ from pathlib import Path
 from fastapi import HTTPException, status, UploadFile
 from dotenv import load_dotenv
 import random
-import shutil
 from time import time
 
+from utils.storage import copy_stream, write_bytes
+
 load_dotenv()
 
 BASE_SERVER_DIR = os.getenv("BASE_SERVER_DIR", "")
@@ -48,6 +49,38 @@ def norm_to_uploads_dir(path: str):
         return normalize_path(dir_path)
 
 
+IMAGE_MIME_TYPES = [
+    "image/jpeg",
+    "image/jpg",
+    "image/png",
+    "image/gif",
+    "image/webp",
+]
+
+
+def image_upload_dir(
+    store_id: str | None, isVerify: bool = False, isLaptopIssuance: bool = False
+) -> str:
+    store_name = store_id if store_id else "no_store"
+    if isLaptopIssuance:
+        return os.path.join(BASE_SERVER_DIR, "uploads", "laptop_issuance", store_name)
+    return (
+        os.path.join(BASE_STORE_CANDIDATE_UPLOADS, store_name)
+        if isVerify
+        else os.path.join(BASE_CANDIDATE_IMG_PATH, store_name)
+    )
+
+
+def image_upload_filename(
+    original_filename: str, candidate_id: str | None = None, prefix: str | None = None
+) -> str:
+    ext = original_filename.split(".")[-1].lower()
+    filename = (
+        f"{candidate_id}_{int(time())}.{ext}" if candidate_id else original_filename
+    )
+    return f"{prefix}_{int(time())}_{filename}" if prefix else filename
+
+
 async def save_image_file(
     store_id: str,
     photo: UploadFile,
@@ -56,28 +89,11 @@ async def save_image_file(
     isLaptopIssuance: bool = False,
     prefix: str | None = None,
 ):
-    store_name = store_id if store_id else "no_store"
     try:
-        if isLaptopIssuance:
-            upload_img_dir = os.path.join(
-                BASE_SERVER_DIR, "uploads", "laptop_issuance", store_name
-            )
-        else:
-            upload_img_dir = (
-                os.path.join(BASE_STORE_CANDIDATE_UPLOADS, store_name)
-                if isVerify
-                else os.path.join(BASE_CANDIDATE_IMG_PATH, store_name)
-            )
+        upload_img_dir = image_upload_dir(store_id, isVerify, isLaptopIssuance)
         os.makedirs(upload_img_dir, exist_ok=True)
 
-        valid_mime_types = [
-            "image/jpeg",
-            "image/jpg",
-            "image/png",
-            "image/gif",
-            "image/webp",
-        ]
-        if photo.content_type not in valid_mime_types:
+        if photo.content_type not in IMAGE_MIME_TYPES:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid image format. Allowed formats: JPEG, PNG, GIF, WEBP.",
@@ -91,17 +107,11 @@ async def save_image_file(
                 detail="Uploaded file must have a filename.",
             )
 
-        ext = photo.filename.split(".")[-1].lower()
-
-        filename = (
-            f"{candidate_id}_{int(time())}.{ext}" if candidate_id else photo.filename
-        )
-        filename = f"{prefix}_{int(time())}_{filename}" if prefix else filename
+        filename = image_upload_filename(photo.filename, candidate_id, prefix)
         uploaded_img_path = os.path.join(upload_img_dir, filename)
         norm_uploaded_img_path = normalize_path(uploaded_img_path)
 
-        with open(norm_uploaded_img_path, "wb") as f:
-            f.write(contents)
+        await write_bytes(norm_uploaded_img_path, contents)
 
         print(
             f"RELATIVE PATH OF VERIFY PIC - {get_relative_upload_path(norm_uploaded_img_path)}"
@@ -150,8 +160,7 @@ async def save_vendor_spoc_img(photo: UploadFile):
         uploaded_img_path = os.path.join(upload_img_dir, filename)
         norm_uploaded_img_path = normalize_path(uploaded_img_path)
 
-        with open(norm_uploaded_img_path, "wb") as f:
-            f.write(contents)
+        await write_bytes(norm_uploaded_img_path, contents)
 
         return get_relative_upload_path(norm_uploaded_img_path)
 
@@ -197,8 +206,7 @@ async def save_aadhar_photo(photo: UploadFile, candidate_id: str):
         uploaded_img_path = os.path.join(upload_img_dir, filename)
         norm_uploaded_img_path = normalize_path(uploaded_img_path)
 
-        with open(norm_uploaded_img_path, "wb") as f:
-            f.write(contents)
+        await write_bytes(norm_uploaded_img_path, contents)
 
         return get_relative_upload_path(norm_uploaded_img_path)
 
@@ -233,8 +241,7 @@ async def save_offline_uploaded_file(file: UploadFile, store_name: str) -> str:
     norm_uploaded_img_path = normalize_path(uploaded_img_path)
 
     # Save file to disk
-    with open(norm_uploaded_img_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+    await copy_stream(norm_uploaded_img_path, file.file)
 
     return get_relative_upload_path(norm_uploaded_img_path)
 
@@ -274,8 +281,7 @@ async def save_utility_pdf(file: UploadFile, file_name: str) -> str:
         norm_path = normalize_path(saved_path)
 
         # Save file
-        with open(norm_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        await copy_stream(norm_path, file.file)
 
         # Return relative path (your existing function)
         return get_relative_upload_path(norm_path)
@@ -310,6 +316,16 @@ def get_relative_upload_path(full_path: str) -> str:
     return full_path
 
 
+def remove_uploaded_files(relative_paths: list[str]) -> None:
+    """Delete files saved by save_image_file (paths as it returned them)."""
+    for relative_path in relative_paths:
+        path = os.path.join(BASE_SERVER_DIR, relative_path)
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
 def generate_coupon() -> str:
     chars = "ABCDEFGHIJKLMNOPQRSTUVWXYZ1234567890"
     return "".join(random.choices(chars, k=8))
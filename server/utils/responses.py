@@ -0,0 +1,28 @@
+"""JSON responses rendered with orjson."""
+
+from typing import Any
+
+import orjson
+from fastapi import Response
+from fastapi.responses import JSONResponse
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+def json_response(content: Any, response: Response | None = None) -> FastJSONResponse:
+    """
+    Render `content` directly. `response` is the route's injected Response:
+    headers and cookies dependencies set on it (ETag, refreshed tokens) are
+    carried over, as FastAPI only does that for content it renders itself.
+    """
+    out = FastJSONResponse(content)
+    if response is not None:
+        out.raw_headers.extend(
+            (name, value)
+            for name, value in response.raw_headers
+            if name != b"content-length"
+        )
+    return out
@@ -0,0 +1,78 @@
+"""Upload writes on a dedicated thread pool, renamed into place once written."""
+
+import asyncio
+import os
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+UPLOAD_IO_WORKERS = int(os.getenv("UPLOAD_IO_WORKERS", "4"))
+# none: leave flushing to the OS; file: fsync before the rename; full: also
+# fsync the directory so the rename survives a crash
+UPLOAD_FSYNC = os.getenv("UPLOAD_FSYNC", "file").lower()
+FSYNC_POLICIES = ("none", "file", "full")
+
+if UPLOAD_FSYNC not in FSYNC_POLICIES:
+    raise ValueError(f"UPLOAD_FSYNC must be one of {FSYNC_POLICIES}")
+
+_io_pool = ThreadPoolExecutor(
+    max_workers=max(1, UPLOAD_IO_WORKERS), thread_name_prefix="upload-io"
+)
+
+
+def _fsync_dir(directory: str) -> None:
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _write_atomic(path: str, write) -> None:
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    # Unique per write: two saves to the same name must not share a temp file
+    fd, tmp_path = tempfile.mkstemp(
+        dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".part"
+    )
+    try:
+        # mkstemp creates it 0600; uploads are read by other processes
+        os.fchmod(fd, 0o644)
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+            if UPLOAD_FSYNC != "none":
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    if UPLOAD_FSYNC == "full":
+        _fsync_dir(directory)
+
+
+async def write_bytes(path: str, contents: bytes) -> None:
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(
+        _io_pool, _write_atomic, path, lambda f: f.write(contents)
+    )
+
+
+async def copy_stream(path: str, source: BinaryIO) -> None:
+    """Copy a (spooled) upload stream to disk without reading it into memory."""
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(
+        _io_pool, _write_atomic, path, lambda f: shutil.copyfileobj(source, f)
+    )
+
+
+async def run_io(fn, *args):
+    """Run other blocking file work (chunk appends, hashing, moves) on the pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_io_pool, fn, *args)